@@ -0,0 +1,146 @@
+"""
+Christmas Trading 사용자 액션 작업 큐
+user_actions.json 전체를 매 주기 재탐색하지 않는 대기 액션 인덱스
+
+동작 방식:
+1. 시작 시 한 번만 파일을 읽어 대기(pending) 액션 복구
+2. API로 들어온 액션은 즉시 큐에 추가
+3. 다른 서비스(오케스트레이터)가 파일을 바꾼 경우에만 재동기화
+4. 완료된 액션은 아카이브(JSONL)로 이동 → 라이브 파일은 대기 액션만 유지
+5. 최근 완료 액션 ID 기억 → 늦게 도착한 이벤트 / 재동기화로 같은 주문을 다시 실행하지 않음
+"""
+
+import os
+import logging
+from collections import deque
+from typing import Dict, List, Any, Optional, Deque, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 더 이상 처리하지 않는 상태
+TERMINAL_STATUSES = ("processed", "rejected", "failed")
+
+
+class ActionQueue:
+    """대기 액션 FIFO 큐 + 아카이브"""
+
+    def __init__(self, json_manager, filename: str = "user_actions.json",
+                 collection: str = "actions", completed_limit: int = 10000):
+        self.json_manager = json_manager
+        self.filename = filename
+        self.collection = collection
+        self.completed_limit = completed_limit
+
+        self._order: Deque[str] = deque()
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        # 꺼내간 뒤 완료 전인 액션 (재동기화 시 중복 투입 방지, 실행 전 거부 반영)
+        self._inflight: Dict[str, Dict[str, Any]] = {}
+        # 완료된 액션 ID (최근 completed_limit 개, 오래된 순)
+        self._completed: Deque[str] = deque()
+        self._completed_ids: set = set()
+        self._signature: Optional[Tuple[int, int]] = None
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.json_manager.data_path / self.filename)
+            return (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return None
+
+    def enqueue(self, action: Dict[str, Any]):
+        """새 액션 추가 (파일 재탐색 없음)"""
+        action_id = action.get('id')
+        if (action_id is None or action_id in self._pending or action_id in self._inflight
+                or action_id in self._completed_ids):
+            return
+        self._pending[action_id] = action
+        self._order.append(action_id)
+
+    def sync(self) -> List[Dict[str, Any]]:
+        """파일이 바뀐 경우에만 재동기화, 외부에서 종료 처리된 액션 반환"""
+        signature = self._file_signature()
+        if signature == self._signature:
+            return []
+        self._signature = signature
+
+        data = self.json_manager.load_json_data(self.filename)
+        finished = []
+        for action in data.get(self.collection, []):
+            if action.get('id') in self._pending or action.get('id') in self._inflight:
+                done = self.apply(action)
+                if done is not None:
+                    finished.append(done)
+            elif action.get('status') == 'pending':
+                # 다른 서비스가 추가한 새 액션 (완료 / 실행 중인 액션은 enqueue 에서 제외)
+                self.enqueue(action)
+        return finished
+
+    def apply(self, action: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """대기 중인 액션에 외부 변경 필드 반영 (거부 등), 종료된 액션이면 반환
+
+        변경 이벤트는 새 액션을 만들지 않음 - 이미 실행 / 완료된 액션의 늦은 이벤트는 무시
+        """
+        action_id = action.get('id')
+        inflight = self._inflight.get(action_id)
+        if inflight is not None:
+            # 파이프라인에 넘긴 같은 객체에 반영 → 실행 전이면 run_user_action 이 거부를 확인하고 건너뜀
+            if inflight.get('status') == 'pending':
+                inflight.update(action)
+            return None
+        if action_id not in self._pending:
+            return None
+        self._pending[action_id].update(action)
+        if self._pending[action_id].get('status') in TERMINAL_STATUSES:
+            return self._pending.pop(action_id)
+        return None
+
+    def drain(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """대기 액션을 FIFO 순서로 꺼냄"""
+        batch = []
+        while self._order and (limit is None or len(batch) < limit):
+            action_id = self._order.popleft()
+            action = self._pending.pop(action_id, None)
+            if action is not None:
+                self._inflight[action_id] = action
+                batch.append(action)
+        return batch
+
+    async def complete(self, actions: List[Dict[str, Any]]):
+        """완료 액션을 라이브 파일에서 제거하고 아카이브로 이동"""
+        if not actions:
+            return
+        for action in actions:
+            self._inflight.pop(action['id'], None)
+            self._remember_completed(action['id'])
+
+        if self.json_manager.is_log_backed(self.filename):
+            # 로그 모드: 상태 갱신만 기록, 아카이브는 컴팩션 시 수행
+            for action in actions:
+                fields = {k: action[k] for k in ('status', 'processed_at', 'order_result', 'error') if k in action}
+                self.json_manager.update_record(self.filename, self.collection, action['id'], fields)
+            if self.json_manager.needs_compaction(self.filename):
+                await self.json_manager.compact(self.filename, retain=is_active_action)
+            return
+
+        done = {action['id'] for action in actions}
+        
+        def remove_done(data: Dict[str, Any]):
+            data[self.collection] = [a for a in data.get(self.collection, []) if a.get('id') not in done]
+        
+        await self.json_manager.update_json_data(self.filename, remove_done)
+        await self.json_manager.archive_records(self.filename, actions)
+
+    def _remember_completed(self, action_id: str):
+        if action_id in self._completed_ids:
+            return
+        self._completed.append(action_id)
+        self._completed_ids.add(action_id)
+        while len(self._completed) > self.completed_limit:
+            self._completed_ids.discard(self._completed.popleft())
+
+
+def is_active_action(action: Dict[str, Any]) -> bool:
+    return action.get('status') not in TERMINAL_STATUSES
@@ -0,0 +1,293 @@
+"""
+Christmas Trading WebSocket 브로드캐스터
+메시지를 한 번만 직렬화하고 연결별 큐 / 전송 태스크로 분산
+
+주요 기능:
+1. 연결별 제한 크기 송신 큐 + 전용 writer 태스크 (head-of-line blocking 없음)
+2. 느린 소비자 정책: drop_oldest / coalesce / disconnect
+3. 연결별 지연(lag) / 큐 깊이 / 드롭 메트릭
+4. 토픽 구독 인덱스 (심볼 / 메시지 타입 / 사용자) 및 delta 전송 모드
+
+토픽 형식: "symbol:BTCUSDT", "type:ai_signals", "user:<user_id>", "*" (전체)
+"""
+
+import time
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, List, Any, Optional, Deque, Tuple, Set, Iterable, Callable
+
+from fastapi import WebSocket
+
+from codec import dumps_text
+
+logger = logging.getLogger(__name__)
+
+SLOW_CONSUMER_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+SUBSCRIPTION_MODES = ("full", "delta")
+ALL_TOPICS = "*"
+
+
+class ClientConnection:
+    """WebSocket 연결 하나의 송신 큐와 writer 태스크"""
+
+    def __init__(self, websocket: WebSocket, connection_id: int, queue_size: int,
+                 policy: str, send_timeout: float,
+                 on_sent: Optional[Callable[[float], None]] = None):
+        self.websocket = websocket
+        self.connection_id = connection_id
+        self.queue_size = queue_size
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.on_sent = on_sent
+
+        # (coalesce 키, 직렬화된 메시지, 큐 투입 시각, delta 여부)
+        self.queue: Deque[Tuple[Optional[str], str, float, bool]] = deque()
+        self._wakeup = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self.closed = False
+
+        # 구독 전까지는 전체 메시지 수신 (기존 클라이언트 호환)
+        self.topics: Set[str] = {ALL_TOPICS}
+        self.mode = "full"
+        # delta 모드에서 메시지가 드롭된 키 (해당 키의 전체 메시지가 전송될 때까지 delta 대신 전체 값 전송)
+        self.resync_keys: Set[str] = set()
+
+        self.connected_at = time.time()
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def start(self, on_close):
+        self._writer = asyncio.create_task(self._write_loop(on_close))
+
+    def enqueue(self, payload: str, key: Optional[str] = None, delta: bool = False) -> bool:
+        """메시지 투입 (반환값: 연결 유지 여부)"""
+        if self.closed:
+            return False
+
+        if len(self.queue) >= self.queue_size:
+            if self.policy == "disconnect":
+                logger.warning(f"WebSocket #{self.connection_id} too slow, disconnecting")
+                self.closed = True
+                self._wakeup.set()
+                return False
+            if self.policy == "coalesce" and key is not None and not delta and self._coalesce(key, payload):
+                self._wakeup.set()
+                return True
+            dropped_key, _, _, _ = self.queue.popleft()
+            self.dropped += 1
+            if self.mode == "delta" and dropped_key is not None:
+                self.resync_keys.add(dropped_key)
+
+        self.queue.append((key, payload, time.monotonic(), delta))
+        self._wakeup.set()
+        return True
+
+    def _coalesce(self, key: str, payload: str) -> bool:
+        """같은 키의 대기 메시지를 최신 스냅샷으로 교체"""
+        for i, (queued_key, _, enqueued_at, queued_delta) in enumerate(self.queue):
+            if queued_key == key and not queued_delta:
+                # 대기 시작 시각은 유지하여 지연 메트릭 보존
+                del self.queue[i]
+                self.queue.append((key, payload, enqueued_at, False))
+                self.coalesced += 1
+                return True
+        return False
+
+    async def _write_loop(self, on_close):
+        try:
+            while not self.closed:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+
+                while self.queue and not self.closed:
+                    key, payload, enqueued_at, delta = self.queue.popleft()
+                    await asyncio.wait_for(self.websocket.send_text(payload), timeout=self.send_timeout)
+                    # 큐는 FIFO 이므로 이 전체 메시지는 앞서 드롭된 같은 키의 메시지보다 최신 상태
+                    if key is not None and not delta:
+                        self.resync_keys.discard(key)
+
+                    self.sent += 1
+                    self.last_lag = time.monotonic() - enqueued_at
+                    self.max_lag = max(self.max_lag, self.last_lag)
+                    if self.on_sent is not None:
+                        self.on_sent(self.last_lag)
+            # 느린 소비자 정책으로 종료된 경우 소켓도 닫아 수신 루프 종료
+            await self.websocket.close()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"WebSocket #{self.connection_id} send error: {e}")
+        finally:
+            self.closed = True
+            on_close(self)
+
+    async def close(self):
+        self.closed = True
+        if self._writer is not None and self._writer is not asyncio.current_task():
+            self._writer.cancel()
+            try:
+                await self._writer
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    def metrics(self) -> Dict[str, Any]:
+        oldest_age = time.monotonic() - self.queue[0][2] if self.queue else 0.0
+        return {
+            "id": self.connection_id,
+            "connected_at": self.connected_at,
+            "queue_depth": len(self.queue),
+            "oldest_queued_age": round(oldest_age, 4),
+            "last_lag": round(self.last_lag, 4),
+            "max_lag": round(self.max_lag, 4),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "mode": self.mode,
+            "resync_keys": sorted(self.resync_keys),
+            "topics": sorted(self.topics),
+        }
+
+
+class WebSocketBroadcaster:
+    """연결별 큐 기반 팬아웃 브로드캐스터"""
+
+    def __init__(self, queue_size: int = 256, policy: str = "drop_oldest",
+                 send_timeout: float = 5.0, serializer=None,
+                 on_sent: Optional[Callable[[float], None]] = None):
+        if policy not in SLOW_CONSUMER_POLICIES:
+            raise ValueError(f"Unknown slow consumer policy: {policy}")
+
+        self.queue_size = queue_size
+        self.policy = policy
+        self.send_timeout = send_timeout
+        self.serializer = serializer or dumps_text
+        # 메시지 전송 시 큐 대기 시간 전달 (히스토그램 등)
+        self.on_sent = on_sent
+
+        self.connections: Dict[WebSocket, ClientConnection] = {}
+        # 토픽 → 구독 연결 인덱스
+        self.subscribers: Dict[str, Set[ClientConnection]] = {}
+        self._next_id = 1
+        self.disconnected_slow = 0
+        # 종료된 연결의 누적 카운터 (전체 합계가 줄어들지 않도록)
+        self.retired = {"sent": 0, "dropped": 0, "coalesced": 0}
+
+    def register(self, websocket: WebSocket) -> ClientConnection:
+        connection = ClientConnection(
+            websocket, self._next_id, self.queue_size, self.policy, self.send_timeout,
+            on_sent=self.on_sent
+        )
+        self._next_id += 1
+        self.connections[websocket] = connection
+        self._index(connection, connection.topics)
+        connection.start(self._on_writer_closed)
+        return connection
+
+    def _on_writer_closed(self, connection: ClientConnection):
+        if self.connections.pop(connection.websocket, None) is not None:
+            self._retire(connection)
+        self._unindex(connection, connection.topics)
+
+    async def unregister(self, websocket: WebSocket):
+        connection = self.connections.pop(websocket, None)
+        if connection is not None:
+            self._unindex(connection, connection.topics)
+            await connection.close()
+            self._retire(connection)
+
+    def _retire(self, connection: ClientConnection):
+        self.retired["sent"] += connection.sent
+        self.retired["dropped"] += connection.dropped
+        self.retired["coalesced"] += connection.coalesced
+
+    def totals(self) -> Dict[str, int]:
+        """종료된 연결을 포함한 누적 전송 / 드롭 / 병합 수 및 현재 큐 깊이"""
+        totals = dict(self.retired)
+        totals["queue_depth"] = 0
+        for connection in list(self.connections.values()):
+            totals["sent"] += connection.sent
+            totals["dropped"] += connection.dropped
+            totals["coalesced"] += connection.coalesced
+            totals["queue_depth"] += len(connection.queue)
+        return totals
+
+    def _index(self, connection: ClientConnection, topics: Iterable[str]):
+        for topic in topics:
+            self.subscribers.setdefault(topic, set()).add(connection)
+
+    def _unindex(self, connection: ClientConnection, topics: Iterable[str]):
+        for topic in list(topics):
+            subscribers = self.subscribers.get(topic)
+            if subscribers is not None:
+                subscribers.discard(connection)
+                if not subscribers:
+                    del self.subscribers[topic]
+
+    def subscribe(self, connection: ClientConnection, topics: List[str], mode: Optional[str] = None):
+        """토픽 구독 (첫 명시적 구독 시 전체 수신 해제)"""
+        if mode is not None:
+            if mode not in SUBSCRIPTION_MODES:
+                raise ValueError(f"Unknown subscription mode: {mode}")
+            connection.mode = mode
+
+        if ALL_TOPICS in connection.topics and ALL_TOPICS not in topics:
+            self._unindex(connection, [ALL_TOPICS])
+            connection.topics.discard(ALL_TOPICS)
+
+        connection.topics.update(topics)
+        self._index(connection, topics)
+
+    def unsubscribe(self, connection: ClientConnection, topics: List[str]):
+        self._unindex(connection, topics)
+        connection.topics.difference_update(topics)
+
+    def publish(self, message: Dict[str, Any], topics: List[str],
+                delta_message: Optional[Dict[str, Any]] = None,
+                coalesce_key: Optional[str] = None):
+        """토픽 구독자에게만 전송 (구독자가 없으면 직렬화하지 않음)
+
+        delta_message가 있으면 delta 모드 연결은 변경 필드만 받고,
+        full 모드 또는 해당 coalesce_key 보정이 필요한 연결은 전체 메시지를 받음
+        (드롭된 delta 를 키별로 추적하므로 delta 전송에는 coalesce_key 필요)
+        """
+        targets: Set[ClientConnection] = set(self.subscribers.get(ALL_TOPICS, ()))
+        for topic in topics:
+            targets.update(self.subscribers.get(topic, ()))
+        if not targets:
+            return
+
+        full_payload: Optional[str] = None
+        delta_payload: Optional[str] = None
+        for connection in targets:
+            if connection.closed:
+                continue
+
+            delta = (
+                delta_message is not None and coalesce_key is not None
+                and connection.mode == "delta" and coalesce_key not in connection.resync_keys
+            )
+            if delta:
+                if delta_payload is None:
+                    delta_payload = self.serializer(delta_message)
+                payload = delta_payload
+            else:
+                if full_payload is None:
+                    full_payload = self.serializer(message)
+                payload = full_payload
+
+            if not connection.enqueue(payload, coalesce_key, delta):
+                self.disconnected_slow += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "connections": len(self.connections),
+            "topics": {topic: len(subs) for topic, subs in self.subscribers.items()},
+            "policy": self.policy,
+            "queue_size": self.queue_size,
+            "disconnected_slow": self.disconnected_slow,
+            "clients": [c.metrics() for c in self.connections.values()],
+        }
@@ -0,0 +1,144 @@
+"""
+Christmas Trading 세그먼트 이벤트 로그
+JSON 문서 전체를 다시 쓰지 않고 레코드 단위로 추가 기록하는 저장소
+
+구조:
+1. <name>.log.d/segment-000001.jsonl 형태의 세그먼트 파일
+2. 한 줄 = 하나의 레코드 (append / update)
+3. 세그먼트 크기 초과 시 다음 세그먼트로 롤오버
+4. 컴팩션 시 체크포인트 문서로 병합 후 봉인된 세그먼트 삭제
+"""
+
+import os
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator
+
+from codec import dumps_text, loads
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+
+
+class SegmentedEventLog:
+    """추가 전용(append-only) 세그먼트 로그"""
+
+    def __init__(self, log_dir: Path, max_segment_bytes: int = 4 * 1024 * 1024):
+        self.log_dir = Path(log_dir)
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.max_segment_bytes = max_segment_bytes
+
+        self._active_index = self._last_segment_index() or 1
+        self._active_file = None
+        self._active_size = 0
+
+    def _segment_path(self, index: int) -> Path:
+        return self.log_dir / f"{SEGMENT_PREFIX}{index:06d}{SEGMENT_SUFFIX}"
+
+    def _segment_indexes(self) -> List[int]:
+        indexes = []
+        for path in self.log_dir.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"):
+            try:
+                indexes.append(int(path.stem[len(SEGMENT_PREFIX):]))
+            except ValueError:
+                continue
+        return sorted(indexes)
+
+    def _last_segment_index(self) -> Optional[int]:
+        indexes = self._segment_indexes()
+        return indexes[-1] if indexes else None
+
+    def _open_active(self):
+        if self._active_file is None:
+            path = self._segment_path(self._active_index)
+            self._active_file = open(path, 'a', encoding='utf-8')
+            self._active_size = os.path.getsize(path)
+
+    def _roll(self):
+        """활성 세그먼트 봉인 후 다음 세그먼트로 전환"""
+        self.close()
+        self._active_index += 1
+        logger.info(f"Event log segment rolled: {self.log_dir.name} -> {self._active_index:06d}")
+
+    def append(self, entry: Dict[str, Any]):
+        """레코드 한 줄 추가 (기록량과 무관하게 O(1))"""
+        line = dumps_text(entry) + "\n"
+        line_size = len(line.encode('utf-8'))
+
+        self._open_active()
+        if self._active_size > 0 and self._active_size + line_size > self.max_segment_bytes:
+            self._roll()
+            self._open_active()
+
+        self._active_file.write(line)
+        self._active_file.flush()
+        self._active_size += line_size
+
+    def replay(self, through: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """세그먼트의 레코드를 기록 순서대로 반환 (through: 해당 인덱스까지만)"""
+        if self._active_file is not None:
+            self._active_file.flush()
+
+        for index in self._segment_indexes():
+            if through is not None and index > through:
+                break
+            with open(self._segment_path(index), 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield loads(line)
+                    except ValueError:
+                        # 비정상 종료로 잘린 마지막 줄은 건너뜀
+                        logger.warning(f"Skipping corrupt event log line in {self.log_dir.name}/{index:06d}")
+
+    def segment_count(self) -> int:
+        return len(self._segment_indexes())
+
+    def seal(self) -> int:
+        """현재 세그먼트를 봉인하고 봉인된 마지막 인덱스 반환"""
+        sealed_index = self._active_index
+        self._roll()
+        return sealed_index
+
+    def truncate_through(self, index: int):
+        """지정 인덱스까지의 봉인된 세그먼트 삭제"""
+        for segment_index in self._segment_indexes():
+            if segment_index <= index and segment_index != self._active_index:
+                self._segment_path(segment_index).unlink(missing_ok=True)
+
+    def close(self):
+        if self._active_file is not None:
+            self._active_file.close()
+            self._active_file = None
+            self._active_size = 0
+
+
+def apply_entry(document: Dict[str, Any], entry: Dict[str, Any],
+                index: Optional[Dict[str, Dict[str, Any]]] = None):
+    """로그 레코드 하나를 문서에 반영"""
+    collection = entry.get("collection")
+    op = entry.get("op")
+
+    if op == "append":
+        record = entry.get("record", {})
+        document.setdefault(collection, []).append(record)
+        if index is not None and record.get("id") is not None:
+            index[record["id"]] = record
+    elif op == "update":
+        record = index.get(entry.get("id")) if index is not None else None
+        if record is None:
+            record = next(
+                (r for r in document.get(collection, []) if r.get("id") == entry.get("id")),
+                None
+            )
+        if record is not None:
+            record.update(entry.get("fields", {}))
+    elif op == "set":
+        document.update(entry.get("fields", {}))
+
+    if entry.get("timestamp"):
+        document["timestamp"] = entry["timestamp"]
@@ -0,0 +1,188 @@
+"""
+Christmas Trading 거래소 게이트웨이
+이벤트 루프를 막지 않는 바이낸스 REST 접근 계층
+
+주요 기능:
+1. httpx 기반 비동기 전송 (keep-alive 커넥션 풀)
+2. 엔드포인트별 동시 요청 제한 (세마포어)
+3. 비동기 전송 불가 시 제한된 스레드 풀 + 동기 클라이언트로 대체
+"""
+
+import hmac
+import json
+import time
+import asyncio
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Callable
+from urllib.parse import urlencode
+
+try:
+    import httpx
+except ImportError:  # 비동기 전송 불가 → 스레드 풀 대체
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+# 엔드포인트별 기본 동시 요청 한도
+DEFAULT_ENDPOINT_LIMITS = {
+    "ticker": 4,
+    "klines": 4,
+    "order": 2,
+    "account": 1,
+}
+
+
+class ExchangeError(Exception):
+    """거래소 API 오류"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(f"Exchange API error {status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+
+
+class ExchangeGateway:
+    """바이낸스 비동기 게이트웨이"""
+
+    def __init__(self, api_key: str, api_secret: str,
+                 base_url: str = "https://api.binance.com",
+                 max_connections: int = 20,
+                 max_keepalive_connections: int = 10,
+                 timeout: float = 10.0,
+                 endpoint_limits: Optional[Dict[str, int]] = None,
+                 executor_workers: int = 4,
+                 on_request: Optional[Callable[[str, float, bool], None]] = None):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.base_url = base_url.rstrip("/")
+        self.max_connections = max_connections
+        self.max_keepalive_connections = max_keepalive_connections
+        self.timeout = timeout
+        self.executor_workers = executor_workers
+        # 요청 완료 시 (엔드포인트, 소요 시간, 성공 여부) 전달
+        self.on_request = on_request
+
+        limits = {**DEFAULT_ENDPOINT_LIMITS, **(endpoint_limits or {})}
+        self._semaphores = {name: asyncio.Semaphore(limit) for name, limit in limits.items()}
+
+        self._http: Optional["httpx.AsyncClient"] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._sync_client = None
+
+    @property
+    def transport(self) -> str:
+        return "httpx" if self._http is not None else "thread_pool"
+
+    async def start(self):
+        """전송 계층 초기화"""
+        if httpx is not None:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={"X-MBX-APIKEY": self.api_key},
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive_connections
+                ),
+                timeout=self.timeout
+            )
+        else:
+            from binance.client import Client as BinanceClient
+
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.executor_workers,
+                thread_name_prefix="exchange"
+            )
+            self._sync_client = await self._run_in_executor(
+                BinanceClient, self.api_key, self.api_secret
+            )
+
+        logger.info(f"Exchange gateway started (transport: {self.transport})")
+
+    async def close(self):
+        """커넥션 풀 및 스레드 풀 정리"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    async def _run_in_executor(self, func, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, lambda: func(*args, **kwargs))
+
+    async def _call_sync(self, endpoint: str, func, *args, **kwargs) -> Any:
+        """스레드 풀 대체 경로 호출 (엔드포인트 동시 요청 제한 적용)"""
+        started = time.monotonic()
+        ok = False
+        try:
+            async with self._semaphores[endpoint]:
+                result = await self._run_in_executor(func, *args, **kwargs)
+            ok = True
+            return result
+        finally:
+            if self.on_request is not None:
+                self.on_request(endpoint, time.monotonic() - started, ok)
+
+    def _sign(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        signed = dict(params)
+        signed["timestamp"] = int(time.time() * 1000)
+        query = urlencode(signed)
+        signed["signature"] = hmac.new(
+            self.api_secret.encode("utf-8"), query.encode("utf-8"), hashlib.sha256
+        ).hexdigest()
+        return signed
+
+    async def _request(self, endpoint: str, method: str, path: str,
+                       params: Optional[Dict[str, Any]] = None, signed: bool = False) -> Any:
+        params = self._sign(params or {}) if signed else (params or {})
+        started = time.monotonic()
+        ok = False
+        try:
+            async with self._semaphores[endpoint]:
+                response = await self._http.request(method, path, params=params)
+            if response.status_code != 200:
+                raise ExchangeError(response.status_code, response.text)
+            ok = True
+            return response.json()
+        finally:
+            if self.on_request is not None:
+                self.on_request(endpoint, time.monotonic() - started, ok)
+
+    async def get_ticker(self, symbols: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """24시간 티커 조회 (symbols 지정 시 해당 심볼만 요청)"""
+        if self._http is not None:
+            params = {}
+            if symbols:
+                params["symbols"] = json.dumps(list(symbols), separators=(",", ":"))
+            return await self._request("ticker", "GET", "/api/v3/ticker/24hr", params)
+
+        tickers = await self._call_sync("ticker", self._sync_client.get_ticker)
+        if symbols:
+            wanted = set(symbols)
+            tickers = [t for t in tickers if t['symbol'] in wanted]
+        return tickers
+
+    async def get_klines(self, symbol: str, interval: str = "1m", limit: int = 100) -> List[List[Any]]:
+        """캔들(kline) 조회"""
+        params = {"symbol": symbol, "interval": interval, "limit": limit}
+        if self._http is not None:
+            return await self._request("klines", "GET", "/api/v3/klines", params)
+
+        return await self._call_sync("klines", self._sync_client.get_klines, **params)
+
+    async def create_order(self, **params) -> Dict[str, Any]:
+        """주문 생성"""
+        if self._http is not None:
+            return await self._request("order", "POST", "/api/v3/order", params, signed=True)
+
+        return await self._call_sync("order", self._sync_client.create_order, **params)
+
+    async def get_account(self) -> Dict[str, Any]:
+        """계정 정보 조회"""
+        if self._http is not None:
+            return await self._request("account", "GET", "/api/v3/account", signed=True)
+
+        return await self._call_sync("account", self._sync_client.get_account)
@@ -0,0 +1,271 @@
+"""
+Christmas Trading 기술적 지표 엔진
+심볼별 OHLCV 롤링 윈도우를 NumPy 배열로 관리하고 전체 심볼을 한 번에 계산
+
+지표:
+1. RSI (Wilder)
+2. MACD / 시그널 / 히스토그램
+3. 볼린저 밴드 (%B 포함)
+4. Stochastic RSI
+5. 거래량 z-score
+
+모든 지표는 새 봉이 들어올 때 상태(EMA, 롤링 합계)만 갱신하는 증분 방식
+"""
+
+import logging
+from collections import deque
+from typing import Dict, List, Any, Deque
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class IndicatorEngine:
+    """심볼 배치 단위 증분 지표 계산기"""
+
+    def __init__(self, rsi_period: int = 14, macd_fast: int = 12, macd_slow: int = 26,
+                 macd_signal: int = 9, bb_period: int = 20, bb_std: float = 2.0,
+                 stoch_period: int = 14, volume_period: int = 20, capacity: int = 64):
+        self.rsi_period = rsi_period
+        self.macd_fast = macd_fast
+        self.macd_slow = macd_slow
+        self.macd_signal = macd_signal
+        self.bb_period = bb_period
+        self.bb_std = bb_std
+        self.stoch_period = stoch_period
+        self.volume_period = volume_period
+
+        # 롤링 윈도우 길이 (가장 긴 기간 + 1: 빠져나가는 값 참조용)
+        self.window = max(bb_period, volume_period) + 1
+
+        self.symbols: Dict[str, int] = {}
+        self._pending: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        self.capacity = capacity
+        self.ohlcv = np.full((len(OHLCV_FIELDS), capacity, self.window), np.nan)
+        self.rsi_window = np.full((capacity, self.stoch_period), np.nan)
+
+        self.count = np.zeros(capacity, dtype=np.int64)
+        self.rsi_count = np.zeros(capacity, dtype=np.int64)
+        self.last_close = np.full(capacity, np.nan)
+
+        self.avg_gain = np.zeros(capacity)
+        self.avg_loss = np.zeros(capacity)
+        self.rsi = np.full(capacity, np.nan)
+
+        self.ema_fast = np.zeros(capacity)
+        self.ema_slow = np.zeros(capacity)
+        self.macd = np.full(capacity, np.nan)
+        self.macd_signal_line = np.zeros(capacity)
+
+        self.close_sum = np.zeros(capacity)
+        self.close_sumsq = np.zeros(capacity)
+        self.volume_sum = np.zeros(capacity)
+        self.volume_sumsq = np.zeros(capacity)
+
+    def _grow(self):
+        """심볼 수가 용량을 넘으면 모든 상태 배열을 두 배로 확장"""
+        old_capacity = self.capacity
+        new_capacity = old_capacity * 2
+        for name, value in list(vars(self).items()):
+            if not isinstance(value, np.ndarray):
+                continue
+            # 새 행은 _row()에서 초기화
+            axis = 1 if name == "ohlcv" else 0
+            pad_shape = list(value.shape)
+            pad_shape[axis] = new_capacity - old_capacity
+            setattr(self, name, np.concatenate([value, np.zeros(pad_shape, dtype=value.dtype)], axis=axis))
+        self.capacity = new_capacity
+
+    def _row(self, symbol: str) -> int:
+        row = self.symbols.get(symbol)
+        if row is None:
+            row = len(self.symbols)
+            if row >= self.capacity:
+                self._grow()
+            self.symbols[symbol] = row
+            # 새 행은 NaN 윈도우로 초기화
+            self.ohlcv[:, row, :] = np.nan
+            self.rsi_window[row, :] = np.nan
+            self.last_close[row] = np.nan
+            self.rsi[row] = np.nan
+            self.macd[row] = np.nan
+        return row
+
+    def push(self, symbol: str, bar: Dict[str, Any]):
+        """마감된 봉을 대기열에 추가 (flush 시 배치 계산)"""
+        self._pending.setdefault(symbol, deque()).append(bar)
+
+    def flush(self) -> int:
+        """대기 봉을 심볼당 1개씩 묶어 배치 단위로 반영, 반영된 봉 수 반환"""
+        applied = 0
+        while self._pending:
+            batch = {symbol: bars.popleft() for symbol, bars in self._pending.items()}
+            self._pending = {s: b for s, b in self._pending.items() if b}
+            self.update(batch)
+            applied += len(batch)
+        return applied
+
+    def seed(self, symbol: str, bars: List[Dict[str, Any]]):
+        """과거 봉으로 초기 상태 구성"""
+        for bar in bars:
+            self.update({symbol: bar})
+
+    @staticmethod
+    def _smoothing(n: np.ndarray, period: int, alpha: float) -> np.ndarray:
+        # 기간 이전에는 누적 평균, 이후에는 고정 계수
+        return np.where(n <= period, 1.0 / np.maximum(n, 1), alpha)
+
+    def update(self, bars: Dict[str, Dict[str, Any]]):
+        """심볼별 새 봉 하나씩을 한 번에 반영"""
+        if not bars:
+            return
+
+        rows = np.array([self._row(symbol) for symbol in bars], dtype=np.int64)
+        values = np.array(
+            [[float(bar.get(field, bar.get("close", 0.0))) for field in OHLCV_FIELDS] for bar in bars.values()]
+        ).T
+        close = values[3]
+        volume = values[4]
+
+        self.count[rows] += 1
+        n = self.count[rows]
+        position = (n - 1) % self.window
+        self.ohlcv[:, rows, position] = values
+
+        # RSI (Wilder 평활)
+        previous = self.last_close[rows]
+        has_previous = ~np.isnan(previous)
+        change = np.where(has_previous, close - np.nan_to_num(previous), 0.0)
+        changes = n - 1
+        alpha = self._smoothing(changes, self.rsi_period, 1.0 / self.rsi_period)
+        gain_rows, loss_rows = self.avg_gain[rows], self.avg_loss[rows]
+        gain_rows = np.where(has_previous, gain_rows + alpha * (np.maximum(change, 0) - gain_rows), gain_rows)
+        loss_rows = np.where(has_previous, loss_rows + alpha * (np.maximum(-change, 0) - loss_rows), loss_rows)
+        self.avg_gain[rows], self.avg_loss[rows] = gain_rows, loss_rows
+        self.last_close[rows] = close
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = np.where(loss_rows > 0, 100.0 - 100.0 / (1.0 + gain_rows / loss_rows), 100.0)
+        rsi_ready = changes >= self.rsi_period
+        self.rsi[rows] = np.where(rsi_ready, rsi, np.nan)
+
+        # Stochastic RSI 용 RSI 윈도우
+        ready_rows = rows[rsi_ready]
+        self.rsi_window[ready_rows, self.rsi_count[ready_rows] % self.stoch_period] = rsi[rsi_ready]
+        self.rsi_count[ready_rows] += 1
+
+        # MACD (EMA 증분)
+        alpha_fast = self._smoothing(n, self.macd_fast, 2.0 / (self.macd_fast + 1))
+        alpha_slow = self._smoothing(n, self.macd_slow, 2.0 / (self.macd_slow + 1))
+        self.ema_fast[rows] += alpha_fast * (close - self.ema_fast[rows])
+        self.ema_slow[rows] += alpha_slow * (close - self.ema_slow[rows])
+        macd_ready = n >= self.macd_slow
+        macd = self.ema_fast[rows] - self.ema_slow[rows]
+        self.macd[rows] = np.where(macd_ready, macd, np.nan)
+        signal_n = n - self.macd_slow + 1
+        alpha_signal = self._smoothing(signal_n, self.macd_signal, 2.0 / (self.macd_signal + 1))
+        signal_rows = self.macd_signal_line[rows]
+        self.macd_signal_line[rows] = np.where(macd_ready, signal_rows + alpha_signal * (macd - signal_rows), 0.0)
+
+        # 볼린저 밴드 / 거래량 롤링 합계 (윈도우에서 빠지는 값 차감)
+        self._roll_sums(rows, n, close, 3, self.bb_period, self.close_sum, self.close_sumsq)
+        self._roll_sums(rows, n, volume, 4, self.volume_period, self.volume_sum, self.volume_sumsq)
+
+    def _roll_sums(self, rows: np.ndarray, n: np.ndarray, value: np.ndarray, field: int,
+                   period: int, total: np.ndarray, total_sq: np.ndarray):
+        leaving = n > period
+        old = self.ohlcv[field, rows, (n - 1 - period) % self.window]
+        old = np.where(leaving, old, 0.0)
+        total[rows] += value - old
+        total_sq[rows] += value * value - old * old
+
+    def snapshot(self) -> pd.DataFrame:
+        """전체 심볼의 최신 지표를 한 번에 계산"""
+        if not self.symbols:
+            return pd.DataFrame()
+
+        symbols = list(self.symbols)
+        rows = np.array([self.symbols[s] for s in symbols], dtype=np.int64)
+        n = self.count[rows]
+        close = self.last_close[rows]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            bb_mid = self.close_sum[rows] / self.bb_period
+            bb_sd = np.sqrt(np.maximum(self.close_sumsq[rows] / self.bb_period - bb_mid ** 2, 0.0))
+            bb_ready = n >= self.bb_period
+            bb_upper = np.where(bb_ready, bb_mid + self.bb_std * bb_sd, np.nan)
+            bb_lower = np.where(bb_ready, bb_mid - self.bb_std * bb_sd, np.nan)
+            bb_mid = np.where(bb_ready, bb_mid, np.nan)
+            percent_b = np.where(bb_upper > bb_lower, (close - bb_lower) / (bb_upper - bb_lower), 0.5)
+
+            rsi_window = self.rsi_window[rows]
+            stoch_ready = self.rsi_count[rows] >= self.stoch_period
+            rsi_min = np.nanmin(np.where(stoch_ready[:, None], rsi_window, 0.0), axis=1)
+            rsi_max = np.nanmax(np.where(stoch_ready[:, None], rsi_window, 0.0), axis=1)
+            stoch_rsi = np.where(
+                stoch_ready,
+                np.where(rsi_max > rsi_min, (self.rsi[rows] - rsi_min) / (rsi_max - rsi_min), 0.5),
+                np.nan
+            )
+
+            volume = self.ohlcv[4, rows, (n - 1) % self.window]
+            vol_mean = self.volume_sum[rows] / self.volume_period
+            vol_sd = np.sqrt(np.maximum(self.volume_sumsq[rows] / self.volume_period - vol_mean ** 2, 0.0))
+            volume_z = np.where(
+                n >= self.volume_period,
+                np.where(vol_sd > 0, (volume - vol_mean) / vol_sd, 0.0),
+                np.nan
+            )
+
+        macd = self.macd[rows]
+        macd_signal = np.where(np.isnan(macd), np.nan, self.macd_signal_line[rows])
+
+        return pd.DataFrame({
+            "close": close,
+            "bars": n,
+            "rsi": self.rsi[rows],
+            "macd": macd,
+            "macd_signal": macd_signal,
+            "macd_hist": macd - macd_signal,
+            "bb_upper": bb_upper,
+            "bb_middle": bb_mid,
+            "bb_lower": bb_lower,
+            "bb_percent_b": np.where(bb_ready, percent_b, np.nan),
+            "stoch_rsi": stoch_rsi,
+            "volume_zscore": volume_z,
+        }, index=pd.Index(symbols, name="symbol"))
+
+
+def classify_signals(indicators: pd.DataFrame) -> pd.DataFrame:
+    """지표 스냅샷을 매수/매도 신호로 일괄 분류"""
+    if indicators.empty:
+        return indicators
+
+    # 각 지표를 -1 ~ +1 점수로 환산 후 합산
+    rsi_score = np.select([indicators["rsi"] < 30, indicators["rsi"] > 70], [1.0, -1.0], 0.0)
+    macd_score = np.sign(indicators["macd_hist"].fillna(0.0))
+    bb_score = np.select([indicators["bb_percent_b"] < 0, indicators["bb_percent_b"] > 1], [1.0, -1.0], 0.0)
+    stoch_score = np.select([indicators["stoch_rsi"] < 0.2, indicators["stoch_rsi"] > 0.8], [0.5, -0.5], 0.0)
+    # 거래량 급증은 현재 방향성에 가중
+    volume_weight = np.where(indicators["volume_zscore"].fillna(0.0).abs() > 2, 1.5, 1.0)
+
+    score = (rsi_score + macd_score + bb_score + stoch_score) * volume_weight
+    signal = np.select(
+        [score >= 2.5, score >= 1.5, score <= -2.5, score <= -1.5],
+        ["STRONG_BUY", "BUY", "STRONG_SELL", "SELL"],
+        "HOLD"
+    )
+    confidence = np.clip(0.5 + np.abs(score) * 0.1, 0.5, 0.95)
+
+    result = indicators.copy()
+    result["score"] = score
+    result["signal"] = signal
+    result["confidence"] = confidence.round(2)
+    return result
@@ -11,30 +11,87 @@ Christmas Trading Backend API
 """
 
 import os
-import json
+import re
 import asyncio
 import logging
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Callable
 from pathlib import Path
 
 import uvicorn
-from fastapi import FastAPI, WebSocket, HTTPException, BackgroundTasks
+from fastapi import FastAPI, WebSocket, HTTPException, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 import aioredis
 import asyncpg
-from binance.client import Client as BinanceClient
-from binance.websockets import BinanceSocketManager
+import numpy as np
 import pandas as pd
 
+from event_log import SegmentedEventLog, apply_entry
+from exchange_gateway import ExchangeGateway, ExchangeError
+from market_stream import MarketStream
+from snapshot_cache import MarketSnapshotCache, etag_matches
+from broadcaster import WebSocketBroadcaster
+from indicators import IndicatorEngine, classify_signals
+from action_queue import ActionQueue, TERMINAL_STATUSES
+from order_pipeline import OrderPipeline, BinanceRateLimiter, ORDER_ACTION_TYPES
+from persistence import PersistenceWriter
+from event_bus import EventBus
+from atomic_json import read_json, write_json, update_json, file_lock
+from codec import dumps_text, loads, CODEC_NAME
+from metrics import (
+    WS_PUBLISH_SECONDS, ORDER_EXECUTION_SECONDS, SIGNAL_GENERATION_SECONDS, CONTENT_TYPE_LATEST,
+    observe_exchange_request, observe_ws_send_lag, register_collector, render_latest
+)
+
 # 환경 설정
 ENV = os.getenv("ENV", "development")
 DATABASE_URL = os.getenv("DATABASE_URL")
 REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
 BINANCE_API_KEY = os.getenv("BINANCE_API_KEY")
 BINANCE_SECRET_KEY = os.getenv("BINANCE_SECRET_KEY")
+BINANCE_BASE_URL = os.getenv("BINANCE_BASE_URL", "https://api.binance.com")
+EXCHANGE_MAX_CONNECTIONS = int(os.getenv("EXCHANGE_MAX_CONNECTIONS", "20"))
+EXCHANGE_EXECUTOR_WORKERS = int(os.getenv("EXCHANGE_EXECUTOR_WORKERS", "4"))
+# 실시간 스트림 설정
+MARKET_SYMBOLS = [s.strip().upper() for s in os.getenv("MARKET_SYMBOLS", "BTCUSDT,ETHUSDT,BNBUSDT").split(",") if s.strip()]
+MARKET_STREAM_ENABLED = os.getenv("MARKET_STREAM_ENABLED", "true").lower() == "true"
+MARKET_STREAM_URL = os.getenv("MARKET_STREAM_URL", "wss://stream.binance.com:9443")
+MARKET_KLINE_INTERVAL = os.getenv("MARKET_KLINE_INTERVAL", "1m")
+# /api/market-data 스냅샷 캐시 설정
+MARKET_CACHE_TTL = float(os.getenv("MARKET_CACHE_TTL", "2.0"))
+# 업스트림에 없는 심볼을 기억하는 시간 (반복 요청이 매번 업스트림으로 가지 않도록)
+MARKET_CACHE_NEGATIVE_TTL = float(os.getenv("MARKET_CACHE_NEGATIVE_TTL", "60.0"))
+MARKET_SYMBOL_PATTERN = re.compile(r"^[A-Z0-9]{2,20}$")
+API_MARKET_SYMBOLS = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'ADAUSDT', 'DOTUSDT']
+# WebSocket 브로드캐스트 설정 (느린 소비자 정책: drop_oldest / coalesce / disconnect)
+WS_QUEUE_SIZE = int(os.getenv("WS_QUEUE_SIZE", "256"))
+WS_SLOW_CONSUMER_POLICY = os.getenv("WS_SLOW_CONSUMER_POLICY", "drop_oldest")
+WS_SEND_TIMEOUT = float(os.getenv("WS_SEND_TIMEOUT", "5.0"))
+# 지표 엔진 초기 캔들 수
+INDICATOR_SEED_BARS = int(os.getenv("INDICATOR_SEED_BARS", "100"))
+# 주문 실행 파이프라인 (바이낸스 기본 한도: 가중치 1200/분, 주문 50/10초)
+ORDER_WORKERS = int(os.getenv("ORDER_WORKERS", "8"))
+BINANCE_REQUEST_WEIGHT_PER_MIN = int(os.getenv("BINANCE_REQUEST_WEIGHT_PER_MIN", "1200"))
+BINANCE_ORDERS_PER_10S = int(os.getenv("BINANCE_ORDERS_PER_10S", "50"))
+# PostgreSQL 배치 저장 (건수 또는 주기 기준 flush, 버퍼 상한 초과 시 대기/드롭)
+PERSIST_BATCH_SIZE = int(os.getenv("PERSIST_BATCH_SIZE", "500"))
+PERSIST_FLUSH_INTERVAL = float(os.getenv("PERSIST_FLUSH_INTERVAL", "1.0"))
+PERSIST_MAX_BUFFER = int(os.getenv("PERSIST_MAX_BUFFER", "10000"))
+# 연결 오류 재시도 한도 (초과 시 배치를 dead-letter 파일로 격리하고 생산자 대기 해제)
+PERSIST_MAX_ATTEMPTS = int(os.getenv("PERSIST_MAX_ATTEMPTS", "5"))
+# 서비스 간 이벤트 전달: file (JSON 파일 + 감시) / redis (Redis Streams, 파일은 감사 기록용)
+EVENT_TRANSPORT = os.getenv("EVENT_TRANSPORT", "file")
+EVENT_BUS_AUDIT = os.getenv("EVENT_BUS_AUDIT", "false").lower() == "true"
+EVENT_STREAM_MAXLEN = int(os.getenv("EVENT_STREAM_MAXLEN", "10000"))
 JSON_DATA_PATH = os.getenv("JSON_DATA_PATH", "/app/data")
+# JSON 저장 모드: json (전체 파일 재작성) / log (추가 전용 세그먼트 로그)
+JSON_STORAGE_MODE = os.getenv("JSON_STORAGE_MODE", "json")
+JSON_LOG_FILES = [f.strip() for f in os.getenv("JSON_LOG_FILES", "user_actions.json").split(",") if f.strip()]
+JSON_LOG_SEGMENT_BYTES = int(os.getenv("JSON_LOG_SEGMENT_BYTES", str(4 * 1024 * 1024)))
+JSON_LOG_COMPACT_SEGMENTS = int(os.getenv("JSON_LOG_COMPACT_SEGMENTS", "4"))
+# 오케스트레이터와 공유하는 JSON 파일의 읽기-수정-쓰기 잠금 (<파일>.lock)
+JSON_FILE_LOCKING = os.getenv("JSON_FILE_LOCKING", "true").lower() == "true"
 
 # 로깅 설정
 logging.basicConfig(
@@ -68,14 +125,24 @@ app.add_middleware(
 # 전역 변수
 redis_client: Optional[aioredis.Redis] = None
 db_pool: Optional[asyncpg.Pool] = None
-binance_client: Optional[BinanceClient] = None
-websocket_connections: List[WebSocket] = []
+persistence: Optional[PersistenceWriter] = None
+event_bus: Optional[EventBus] = None
+exchange_gateway: Optional[ExchangeGateway] = None
+market_stream: Optional[MarketStream] = None
+indicator_engine = IndicatorEngine()
+broadcaster = WebSocketBroadcaster(
+    queue_size=WS_QUEUE_SIZE,
+    policy=WS_SLOW_CONSUMER_POLICY,
+    send_timeout=WS_SEND_TIMEOUT,
+    on_sent=observe_ws_send_lag
+)
 
 # JSON 데이터 저장소
 class JSONDataManager:
     """JSON 기반 데이터 흐름 관리자"""
     
-    def __init__(self, data_path: str):
+    def __init__(self, data_path: str, storage_mode: str = "json",
+                 log_files: Optional[List[str]] = None):
         self.data_path = Path(data_path)
         self.data_path.mkdir(exist_ok=True)
         
@@ -85,6 +152,15 @@ class JSONDataManager:
         self.user_actions_file = self.data_path / "user_actions.json"
         self.ai_recommendations_file = self.data_path / "ai_recommendations.json"
         
+        # 로그 모드: 파일별 세그먼트 로그 (체크포인트 = 기존 JSON 파일)
+        self.event_logs: Dict[str, SegmentedEventLog] = {}
+        if storage_mode == "log":
+            for filename in (log_files or []):
+                self.event_logs[filename] = SegmentedEventLog(
+                    self.data_path / f"{Path(filename).stem}.log.d",
+                    max_segment_bytes=JSON_LOG_SEGMENT_BYTES
+                )
+        
         # 초기 JSON 파일 생성
         self._initialize_json_files()
     
@@ -119,38 +195,176 @@ class JSONDataManager:
         for filename, data in initial_data.items():
             file_path = self.data_path / filename
             if not file_path.exists():
-                self.save_json_data(filename, data)
+                try:
+                    write_json(file_path, data, lock=JSON_FILE_LOCKING)
+                except Exception as e:
+                    logger.error(f"Error saving JSON data {filename}: {e}")
     
-    def save_json_data(self, filename: str, data: Dict[str, Any]):
-        """JSON 데이터 저장"""
+    # 쓰기 경로는 잠금(flock) 대기 / fsync 가 이벤트 루프를 막지 않도록 스레드에서 실행
+    async def save_json_data(self, filename: str, data: Dict[str, Any]):
+        """JSON 데이터 저장 (임시 파일 → fsync → rename)"""
         file_path = self.data_path / filename
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            await asyncio.to_thread(write_json, file_path, data, JSON_FILE_LOCKING)
             logger.info(f"JSON data saved: {filename}")
         except Exception as e:
             logger.error(f"Error saving JSON data {filename}: {e}")
     
+    async def update_json_data(self, filename: str, mutate: Callable[[Dict[str, Any]], Optional[bool]]):
+        """잠금 안에서 최신 파일을 읽어 변경 후 저장 (다른 서비스의 동시 변경 유실 방지)"""
+        file_path = self.data_path / filename
+        try:
+            await asyncio.to_thread(update_json, file_path, mutate, JSON_FILE_LOCKING)
+        except Exception as e:
+            logger.error(f"Error updating JSON data {filename}: {e}")
+    
     def load_json_data(self, filename: str) -> Dict[str, Any]:
-        """JSON 데이터 로드"""
+        """JSON 데이터 로드 (로그 모드에서는 체크포인트 + 로그 재생)"""
+        data = self._load_checkpoint(filename)
+        
+        event_log = self.event_logs.get(filename)
+        if event_log is not None:
+            try:
+                index = _record_index(data)
+                for entry in event_log.replay():
+                    apply_entry(data, entry, index)
+            except Exception as e:
+                logger.error(f"Error replaying event log {filename}: {e}")
+        
+        return data
+    
+    def _load_checkpoint(self, filename: str) -> Dict[str, Any]:
         file_path = self.data_path / filename
         try:
-            if file_path.exists():
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                return {}
+            return read_json(file_path)
         except Exception as e:
             logger.error(f"Error loading JSON data {filename}: {e}")
             return {}
+    
+    async def append_record(self, filename: str, collection: str, record: Dict[str, Any]):
+        """컬렉션에 레코드 추가 (로그 모드: 한 줄 추가, json 모드: 전체 재작성)"""
+        timestamp = datetime.now().isoformat()
+        event_log = self.event_logs.get(filename)
+        if event_log is not None:
+            try:
+                event_log.append({
+                    "op": "append",
+                    "collection": collection,
+                    "record": record,
+                    "timestamp": timestamp
+                })
+            except Exception as e:
+                logger.error(f"Error appending event log {filename}: {e}")
+            return
+        
+        def append(data: Dict[str, Any]):
+            data.setdefault(collection, []).append(record)
+            data['timestamp'] = timestamp
+        
+        await self.update_json_data(filename, append)
+    
+    def is_log_backed(self, filename: str) -> bool:
+        return filename in self.event_logs
+    
+    def update_record(self, filename: str, collection: str, record_id: str, fields: Dict[str, Any]):
+        """레코드 필드 갱신 기록 (로그 모드 전용)"""
+        event_log = self.event_logs.get(filename)
+        if event_log is None:
+            return
+        try:
+            event_log.append({
+                "op": "update",
+                "collection": collection,
+                "id": record_id,
+                "fields": fields,
+                "timestamp": datetime.now().isoformat()
+            })
+        except Exception as e:
+            logger.error(f"Error appending event log {filename}: {e}")
+    
+    def needs_compaction(self, filename: str) -> bool:
+        event_log = self.event_logs.get(filename)
+        return event_log is not None and event_log.segment_count() > JSON_LOG_COMPACT_SEGMENTS
+    
+    async def compact(self, filename: str, retain: Optional[Callable[[Dict[str, Any]], bool]] = None):
+        """로그를 체크포인트로 병합 (처리된 레코드의 update 이력을 한 건으로 축약)
+        
+        retain이 주어지면 조건을 만족하지 않는 레코드는 아카이브로 이동
+        """
+        event_log = self.event_logs.get(filename)
+        if event_log is None:
+            return
+        try:
+            sealed_index = event_log.seal()
+            archived = []
+            
+            def merge(data: Dict[str, Any]):
+                # 잠금 안에서 최신 체크포인트에 봉인된 세그먼트만 반영 (오케스트레이터 갱신 유지)
+                index = _record_index(data)
+                for entry in event_log.replay(through=sealed_index):
+                    apply_entry(data, entry, index)
+                if retain is not None:
+                    for key, records in data.items():
+                        if isinstance(records, list):
+                            archived.extend(r for r in records if isinstance(r, dict) and not retain(r))
+                            data[key] = [r for r in records if not isinstance(r, dict) or retain(r)]
+            
+            # 봉인된 세그먼트만 읽으므로 이후 추가(활성 세그먼트)와 겹치지 않음
+            await asyncio.to_thread(update_json, self.data_path / filename, merge, JSON_FILE_LOCKING)
+            
+            event_log.truncate_through(sealed_index)
+            await self.archive_records(filename, archived)
+            logger.info(f"Event log compacted: {filename}")
+        except Exception as e:
+            logger.error(f"Error compacting event log {filename}: {e}")
+    
+    async def archive_records(self, filename: str, records: List[Dict[str, Any]]):
+        """완료 레코드를 <name>_archive.jsonl 에 추가"""
+        if not records:
+            return
+        archive_path = self.data_path / f"{Path(filename).stem}_archive.jsonl"
+        lines = "".join(dumps_text(record) + "\n" for record in records)
+        
+        def append_lines():
+            # 오케스트레이터의 아카이브 회전(rename)과 같은 잠금 사용
+            with file_lock(archive_path, JSON_FILE_LOCKING), open(archive_path, 'a', encoding='utf-8') as f:
+                f.write(lines)
+        
+        try:
+            await asyncio.to_thread(append_lines)
+            logger.info(f"Archived {len(records)} records from {filename}")
+        except Exception as e:
+            logger.error(f"Error archiving records {filename}: {e}")
+    
+    def close(self):
+        for event_log in self.event_logs.values():
+            event_log.close()
+
+def _record_index(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """문서 내 id → 레코드 인덱스 (로그 재생용)"""
+    index: Dict[str, Dict[str, Any]] = {}
+    for records in data.values():
+        if isinstance(records, list):
+            index.update({r["id"]: r for r in records if isinstance(r, dict) and "id" in r})
+    return index
+
+# 파일 전송에서는 오케스트레이터가 JSON 파일(체크포인트)만 감시 → 로그에만 기록하면 컴팩션 전까지 변경을 보지 못함
+if JSON_STORAGE_MODE == "log" and EVENT_TRANSPORT != "redis":
+    logger.warning("JSON_STORAGE_MODE=log requires EVENT_TRANSPORT=redis, falling back to json")
+    JSON_STORAGE_MODE = "json"
 
 # JSON 데이터 매니저 초기화
-json_manager = JSONDataManager(JSON_DATA_PATH)
+json_manager = JSONDataManager(JSON_DATA_PATH, JSON_STORAGE_MODE, JSON_LOG_FILES)
+
+# 대기 사용자 액션 큐 (첫 동기화 시 기존 대기 액션 복구)
+action_queue = ActionQueue(json_manager)
+# 파이프라인에서 완료된 액션 (다음 주기에 아카이브)
+completed_actions: List[Dict[str, Any]] = []
 
 @app.on_event("startup")
 async def startup_event():
     """서버 시작 시 초기화"""
-    global redis_client, db_pool, binance_client
+    global redis_client, db_pool, persistence, event_bus, exchange_gateway, market_stream
     
     logger.info("🎄 Christmas Trading Backend 시작 중...")
     
@@ -161,27 +375,85 @@ async def startup_event():
         logger.info("✅ Redis 연결 성공")
     except Exception as e:
         logger.error(f"❌ Redis 연결 실패: {e}")
+        redis_client = None
+    
+    # Redis Streams 이벤트 버스 (오케스트레이터와 액션 주고받기)
+    if EVENT_TRANSPORT == "redis" and redis_client:
+        try:
+            bus = EventBus(
+                redis_client,
+                source="backend",
+                maxlen=EVENT_STREAM_MAXLEN,
+                audit_dir=str(Path(JSON_DATA_PATH) / "audit") if EVENT_BUS_AUDIT else None
+            )
+            bus.subscribe("user_actions", on_user_action_event)
+            await bus.start()
+            event_bus = bus
+            logger.info("✅ Event bus 시작 (Redis Streams)")
+        except Exception as e:
+            logger.error(f"❌ Event bus 시작 실패: {e}")
     
     # 데이터베이스 연결
     try:
         if DATABASE_URL:
             db_pool = await asyncpg.create_pool(DATABASE_URL)
+            persistence = PersistenceWriter(
+                db_pool,
+                batch_size=PERSIST_BATCH_SIZE,
+                flush_interval=PERSIST_FLUSH_INTERVAL,
+                max_buffer=PERSIST_MAX_BUFFER,
+                max_attempts=PERSIST_MAX_ATTEMPTS,
+                dead_letter_dir=JSON_DATA_PATH
+            )
+            persistence.start()
             logger.info("✅ PostgreSQL 연결 성공")
     except Exception as e:
         logger.error(f"❌ PostgreSQL 연결 실패: {e}")
     
-    # 바이낸스 클라이언트 초기화
+    # 바이낸스 게이트웨이 초기화 (이벤트 루프 비차단)
     try:
         if BINANCE_API_KEY and BINANCE_SECRET_KEY:
-            binance_client = BinanceClient(BINANCE_API_KEY, BINANCE_SECRET_KEY)
+            gateway = ExchangeGateway(
+                BINANCE_API_KEY,
+                BINANCE_SECRET_KEY,
+                base_url=BINANCE_BASE_URL,
+                max_connections=EXCHANGE_MAX_CONNECTIONS,
+                executor_workers=EXCHANGE_EXECUTOR_WORKERS,
+                on_request=on_exchange_request
+            )
+            await gateway.start()
             # 계정 정보 확인으로 연결 테스트
-            account_info = binance_client.get_account()
+            try:
+                account_info = await gateway.get_account()
+            except Exception:
+                await gateway.close()
+                raise
+            exchange_gateway = gateway
             logger.info("✅ Binance API 연결 성공")
         else:
             logger.warning("⚠️ Binance API 키가 설정되지 않음")
     except Exception as e:
         logger.error(f"❌ Binance API 연결 실패: {e}")
     
+    # 지표 엔진 초기 상태 구성 (과거 캔들)
+    await seed_indicator_engine()
+    
+    # 실시간 시장 데이터 스트림 시작 (공개 스트림 - API 키 불필요)
+    if MARKET_STREAM_ENABLED:
+        market_stream = MarketStream(
+            MARKET_SYMBOLS,
+            base_url=MARKET_STREAM_URL,
+            kline_interval=MARKET_KLINE_INTERVAL,
+            on_tick=on_market_tick,
+            on_kline=on_market_kline,
+            resync=resync_market_data
+        )
+        market_stream.start()
+        logger.info(f"📡 Market stream 시작: {', '.join(MARKET_SYMBOLS)}")
+    
+    # 주문 실행 파이프라인 시작
+    order_pipeline.start()
+    
     # 백그라운드 작업 시작
     asyncio.create_task(background_data_processing())
     
@@ -192,12 +464,29 @@ async def shutdown_event():
     """서버 종료 시 정리"""
     logger.info("🔄 Christmas Trading Backend 종료 중...")
     
+    if market_stream:
+        await market_stream.stop()
+    
+    await order_pipeline.stop()
+    
+    if event_bus:
+        await event_bus.stop()
+    
     if redis_client:
         await redis_client.close()
     
+    # 버퍼에 남은 레코드 저장 후 풀 종료
+    if persistence:
+        await persistence.stop()
+    
     if db_pool:
         await db_pool.close()
     
+    if exchange_gateway:
+        await exchange_gateway.close()
+    
+    json_manager.close()
+    
     logger.info("✅ Christmas Trading Backend 종료 완료")
 
 # API 엔드포인트
@@ -211,35 +500,107 @@ async def health_check():
         "services": {
             "redis": redis_client is not None,
             "database": db_pool is not None,
-            "binance": binance_client is not None
-        }
+            "event_bus": event_bus is not None,
+            "binance": exchange_gateway is not None
+        },
+        "json_codec": CODEC_NAME,
+        "websocket_clients": len(broadcaster.connections)
+    }
+
+@app.get("/metrics")
+async def prometheus_metrics():
+    """Prometheus 텍스트 형식 메트릭"""
+    return Response(content=render_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.get("/api/order-metrics")
+async def get_order_metrics():
+    """주문 파이프라인 큐 깊이 / 실행 지연 조회"""
+    return {
+        "pending_actions": len(action_queue),
+        **order_pipeline.metrics()
     }
 
+@app.get("/api/persistence-metrics")
+async def get_persistence_metrics():
+    """테이블별 배치 저장 버퍼 / flush 통계 조회"""
+    if not persistence:
+        return {"enabled": False}
+    return {"enabled": True, "tables": persistence.metrics()}
+
+@app.get("/api/event-bus-metrics")
+async def get_event_bus_metrics():
+    """이벤트 버스 발행 / 소비 / 미확인 메시지 조회"""
+    if not event_bus:
+        return {"enabled": False, "transport": EVENT_TRANSPORT}
+    return {"enabled": True, **event_bus.metrics(), "pending": await event_bus.lag()}
+
+@app.get("/api/websocket-metrics")
+async def get_websocket_metrics():
+    """WebSocket 연결별 지연 / 큐 메트릭 조회"""
+    return broadcaster.metrics()
+
 @app.get("/api/market-data")
-async def get_market_data():
-    """실시간 시장 데이터 조회"""
+async def get_market_data(request: Request, symbols: Optional[str] = None):
+    """실시간 시장 데이터 조회 (공유 스냅샷 캐시 + ETag)"""
+    requested = [s.strip().upper() for s in symbols.split(",") if s.strip()] if symbols else API_MARKET_SYMBOLS
+    invalid = [s for s in requested if not MARKET_SYMBOL_PATTERN.match(s)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid symbol: {', '.join(invalid)}")
+    
     try:
-        # JSON 파일에서 데이터 로드
-        market_data = json_manager.load_json_data("market_data.json")
+        crypto_pairs = await market_snapshot_cache.get(requested)
+        # 명시적으로 요청한 심볼이 업스트림에 없으면 400 (기본 목록은 있는 것만 반환)
+        unknown = market_snapshot_cache.unknown(requested) if symbols else []
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown symbol: {', '.join(unknown)}")
         
-        # 바이낸스에서 실시간 데이터 가져오기
-        if binance_client:
-            tickers = binance_client.get_ticker()
-            # 주요 암호화폐만 필터링
-            major_cryptos = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT', 'ADAUSDT', 'DOTUSDT']
-            filtered_tickers = [t for t in tickers if t['symbol'] in major_cryptos]
-            
-            market_data['crypto_pairs'] = filtered_tickers
-            market_data['timestamp'] = datetime.now().isoformat()
-            
-            # JSON 파일에 저장
-            json_manager.save_json_data("market_data.json", market_data)
+        etag = market_snapshot_cache.etag(requested)
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"max-age={int(MARKET_CACHE_TTL)}"
+        }
         
-        return market_data
+        # 변경 없음 → 본문 없이 304
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+        
+        market_data = {
+            "timestamp": datetime.now().isoformat(),
+            "crypto_pairs": crypto_pairs,
+            "market_status": "active"
+        }
+        return JSONResponse(content=market_data, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Market data error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def fetch_market_snapshot(symbols: List[str]) -> List[Dict[str, Any]]:
+    """스냅샷 캐시 갱신용 업스트림 조회 (스트림에 있는 심볼은 스트림, 나머지만 REST → JSON 파일)"""
+    latest = market_stream.latest_ticks if market_stream else {}
+    tickers = [dict(latest[s]) for s in symbols if s in latest]
+    missing = [s for s in symbols if s not in latest]
+    if not missing:
+        return tickers
+    
+    wanted = set(missing)
+    if exchange_gateway:
+        try:
+            return tickers + await exchange_gateway.get_ticker(missing)
+        except ExchangeError as e:
+            if e.status_code != 400:
+                raise
+            # 잘못된 심볼이 하나라도 섞이면 요청 전체가 400 → 전체 티커에서 골라 없는 심볼은 캐시가 기억
+            return tickers + [t for t in await exchange_gateway.get_ticker() if t.get('symbol') in wanted]
+    
+    market_data = json_manager.load_json_data("market_data.json")
+    return tickers + [t for t in market_data.get('crypto_pairs', []) if t.get('symbol') in wanted]
+
+market_snapshot_cache = MarketSnapshotCache(
+    fetch_market_snapshot, ttl=MARKET_CACHE_TTL, negative_ttl=MARKET_CACHE_NEGATIVE_TTL
+)
+
 @app.get("/api/trading-signals")
 async def get_trading_signals():
     """AI 트레이딩 신호 조회"""
@@ -250,27 +611,49 @@ async def get_trading_signals():
         logger.error(f"Trading signals error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/trading-signals/batch")
+async def receive_trading_signals(payload: Dict[str, Any]):
+    """오케스트레이터 신호 일괄 수신 (파일 변경 1회 = 요청 1회)"""
+    signals = payload.get('signals', [])
+    if not isinstance(signals, list):
+        raise HTTPException(status_code=400, detail="signals must be a list")
+    
+    try:
+        if signals:
+            await broadcast_to_websockets({
+                "type": "trading_signals",
+                "data": signals
+            }, topics=message_topics("trading_signals", [s.get('symbol') for s in signals]))
+            
+            if persistence:
+                await persistence.record_signals(signals)
+        
+        return {"status": "success", "received": len(signals)}
+        
+    except Exception as e:
+        logger.error(f"Trading signal batch error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 @app.post("/api/user-action")
 async def process_user_action(action_data: Dict[str, Any]):
     """사용자 액션 처리 (JSON 저장 → 오케스트레이션)"""
     try:
         # 사용자 액션을 JSON 파일에 저장
-        user_actions = json_manager.load_json_data("user_actions.json")
-        
         action_data['timestamp'] = datetime.now().isoformat()
         action_data['status'] = 'pending'
         action_data['id'] = f"action_{datetime.now().timestamp()}"
         
-        user_actions['actions'].append(action_data)
-        user_actions['timestamp'] = datetime.now().isoformat()
+        await json_manager.append_record("user_actions.json", "actions", action_data)
+        action_queue.enqueue(action_data)
         
-        json_manager.save_json_data("user_actions.json", user_actions)
+        if event_bus:
+            await event_bus.publish("user_actions", "created", action_data)
         
         # WebSocket으로 실시간 알림
         await broadcast_to_websockets({
             "type": "user_action",
             "data": action_data
-        })
+        }, topics=message_topics("user_action", user_id=action_data.get('user_id')))
         
         logger.info(f"User action processed: {action_data['id']}")
         return {"status": "success", "action_id": action_data['id']}
@@ -283,38 +666,79 @@ async def process_user_action(action_data: Dict[str, Any]):
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket 실시간 연결"""
     await websocket.accept()
-    websocket_connections.append(websocket)
+    connection = broadcaster.register(websocket)
     
     try:
         while True:
             # 클라이언트로부터 메시지 수신
             data = await websocket.receive_text()
-            message = json.loads(data)
+            message = loads(data)
             
             # 메시지 타입에 따른 처리
             if message.get("type") == "subscribe_market_data":
-                # 실시간 시장 데이터 구독
-                await websocket.send_text(json.dumps({
+                # 실시간 시장 데이터 구독 (송신은 연결별 writer 태스크가 담당)
+                connection.enqueue(dumps_text({
                     "type": "subscription_confirmed",
                     "data": {"subscription": "market_data"}
                 }))
             
+            elif message.get("type") in ("subscribe", "unsubscribe"):
+                # 토픽 구독: {"type": "subscribe", "topics": ["symbol:BTCUSDT"], "mode": "delta"}
+                topics = [str(t) for t in message.get("topics", [])]
+                try:
+                    if message["type"] == "subscribe":
+                        broadcaster.subscribe(connection, topics, message.get("mode"))
+                    else:
+                        broadcaster.unsubscribe(connection, topics)
+                except ValueError as e:
+                    connection.enqueue(dumps_text({"type": "error", "data": {"message": str(e)}}))
+                    continue
+                
+                connection.enqueue(dumps_text({
+                    "type": "subscription_confirmed",
+                    "data": {"topics": sorted(connection.topics), "mode": connection.mode}
+                }))
+                
+                # delta 모드는 스냅샷 1회 후 변경 필드만 수신
+                if message["type"] == "subscribe" and connection.mode == "delta":
+                    snapshot = market_snapshot_for(connection.topics)
+                    if snapshot:
+                        connection.enqueue(dumps_text({
+                            "type": "market_snapshot",
+                            "data": snapshot
+                        }))
+            
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
     finally:
-        if websocket in websocket_connections:
-            websocket_connections.remove(websocket)
-
-async def broadcast_to_websockets(message: Dict[str, Any]):
-    """모든 WebSocket 연결에 메시지 브로드캐스트"""
-    if websocket_connections:
-        message_str = json.dumps(message, default=str)
-        for websocket in websocket_connections[:]:  # 복사본으로 순회
-            try:
-                await websocket.send_text(message_str)
-            except Exception as e:
-                logger.error(f"WebSocket broadcast error: {e}")
-                websocket_connections.remove(websocket)
+        await broadcaster.unregister(websocket)
+
+def message_topics(message_type: str, symbols: Optional[List[str]] = None,
+                   user_id: Optional[str] = None) -> List[str]:
+    """메시지 타입 / 심볼 / 사용자 토픽 목록 생성"""
+    topics = [f"type:{message_type}"]
+    topics.extend(f"symbol:{symbol}" for symbol in (symbols or []) if symbol)
+    if user_id:
+        topics.append(f"user:{user_id}")
+    return topics
+
+def market_snapshot_for(topics) -> List[Dict[str, Any]]:
+    """구독 토픽에 해당하는 최신 틱 스냅샷"""
+    if not market_stream:
+        return []
+    if "*" in topics or "type:market_tick" in topics:
+        return market_stream.snapshot()
+    symbols = [t.split(":", 1)[1] for t in topics if t.startswith("symbol:")]
+    return [dict(market_stream.latest_ticks[s]) for s in symbols if s in market_stream.latest_ticks]
+
+async def broadcast_to_websockets(message: Dict[str, Any], topics: Optional[List[str]] = None,
+                                  delta_message: Optional[Dict[str, Any]] = None,
+                                  coalesce_key: Optional[str] = None):
+    """토픽 구독 WebSocket 연결에 메시지 브로드캐스트 (직렬화 1회, 연결별 큐 투입)"""
+    if topics is None:
+        topics = message_topics(message.get("type", ""))
+    with WS_PUBLISH_SECONDS.time():
+        broadcaster.publish(message, topics, delta_message, coalesce_key)
 
 async def background_data_processing():
     """백그라운드 데이터 처리 작업"""
@@ -337,26 +761,88 @@ async def background_data_processing():
             await asyncio.sleep(60)  # 에러 시 1분 대기
 
 async def process_json_changes():
-    """JSON 파일 변화 감지 및 오케스트레이션"""
+    """대기 사용자 액션을 주문 파이프라인에 투입 (새 작업이 없으면 파일을 건드리지 않음)"""
     try:
-        # 사용자 액션 처리
-        user_actions = json_manager.load_json_data("user_actions.json")
+        # 외부(오케스트레이터) 변경 반영 - 파일이 바뀐 경우에만 재탐색
+        finished = action_queue.sync()
         
-        for action in user_actions.get('actions', []):
-            if action.get('status') == 'pending':
-                # 액션 처리 로직
-                await execute_user_action(action)
-                
-                # 상태 업데이트
-                action['status'] = 'processed'
-                action['processed_at'] = datetime.now().isoformat()
+        # 심볼 간 병렬, 심볼 내 FIFO 실행
+        for action in action_queue.drain():
+            order_pipeline.submit(action)
         
-        # JSON 파일 업데이트
-        json_manager.save_json_data("user_actions.json", user_actions)
+        # 완료 액션은 라이브 파일에서 아카이브로 이동
+        done = completed_actions[:]
+        completed_actions.clear()
+        await action_queue.complete(finished + done)
         
     except Exception as e:
         logger.error(f"JSON processing error: {e}")
 
+async def on_user_action_event(event: Dict[str, Any], message_id: str):
+    """이벤트 버스 사용자 액션 수신 (오케스트레이터 추가 액션 / 리스크 체크 결과)"""
+    if event['source'] == "backend":
+        return
+    
+    action = event['data']
+    if event['type'] == "created":
+        await json_manager.append_record("user_actions.json", "actions", action)
+        # 파일 경로와 동일하게 pending 상태 액션만 실행 대상
+        if action.get('status') == 'pending':
+            action_queue.enqueue(action)
+    elif event['type'] == "updated":
+        finished = action_queue.apply(action)
+        if finished is not None:
+            completed_actions.append(finished)
+
+async def run_user_action(action: Dict[str, Any]):
+    """파이프라인 워커에서 액션 실행 후 상태 갱신"""
+    # 큐에서 꺼낸 뒤 도착한 리스크 체크 거부 등 → 거래소 호출 없이 종료
+    if action.get('status') in TERMINAL_STATUSES:
+        logger.info(f"Skipping {action.get('status')} action {action.get('id')}")
+        return
+    
+    try:
+        # 액션 처리 로직
+        with ORDER_EXECUTION_SECONDS.labels(action.get('type') or "unknown").time():
+            await execute_user_action(action)
+        action['status'] = 'processed'
+    except Exception:
+        # 실패 카운트 / 오류 기록은 파이프라인에서
+        action['status'] = 'failed'
+        raise
+    finally:
+        action['processed_at'] = datetime.now().isoformat()
+        
+        # 주문 결과 DB 기록 (배치 저장)
+        if persistence and action.get('type') in ORDER_ACTION_TYPES and ('order_result' in action or 'error' in action):
+            await persistence.record_trade(action)
+
+# 주문과 시세 / 계정 요청이 같은 IP 요청 가중치 예산 공유
+exchange_rate_limiter = BinanceRateLimiter(BINANCE_REQUEST_WEIGHT_PER_MIN, BINANCE_ORDERS_PER_10S)
+
+def on_exchange_request(endpoint: str, seconds: float, ok: bool):
+    """거래소 요청 지연 메트릭 기록 + 요청 가중치 차감"""
+    observe_exchange_request(endpoint, seconds, ok)
+    exchange_rate_limiter.charge(endpoint)
+
+order_pipeline = OrderPipeline(
+    run_user_action,
+    max_workers=ORDER_WORKERS,
+    rate_limiter=exchange_rate_limiter,
+    on_complete=completed_actions.append
+)
+
+# Prometheus 수집기 (스크레이프 시점에 컴포넌트 카운터 조회)
+register_collector(lambda: {
+    "broadcaster": broadcaster,
+    "order_pipeline": order_pipeline,
+    "action_queue": action_queue,
+    "persistence": persistence,
+    "event_bus": event_bus,
+    "market_stream": market_stream,
+    "market_snapshot_cache": market_snapshot_cache
+})
+
 async def execute_user_action(action: Dict[str, Any]):
     """사용자 액션 실행 (실제 거래 처리)"""
     try:
@@ -367,9 +853,9 @@ async def execute_user_action(action: Dict[str, Any]):
             symbol = action.get('symbol')
             quantity = action.get('quantity')
             
-            if binance_client and symbol and quantity:
+            if exchange_gateway and symbol and quantity:
                 # 실제 바이낸스 주문 (테스트넷에서만)
-                order = binance_client.create_order(
+                order = await exchange_gateway.create_order(
                     symbol=symbol,
                     side='BUY',
                     type='MARKET',
@@ -384,8 +870,8 @@ async def execute_user_action(action: Dict[str, Any]):
             symbol = action.get('symbol')
             quantity = action.get('quantity')
             
-            if binance_client and symbol and quantity:
-                order = binance_client.create_order(
+            if exchange_gateway and symbol and quantity:
+                order = await exchange_gateway.create_order(
                     symbol=symbol,
                     side='SELL',
                     type='MARKET',
@@ -399,22 +885,67 @@ async def execute_user_action(action: Dict[str, Any]):
         await broadcast_to_websockets({
             "type": "action_result",
             "data": action
-        })
+        }, topics=message_topics("action_result", [action.get('symbol')], action.get('user_id')))
         
     except Exception as e:
         logger.error(f"Action execution error: {e}")
         action['error'] = str(e)
+        # 파이프라인이 실패로 집계하도록 전파
+        raise
+
+async def on_market_tick(symbol: str, delta: Dict[str, Any]):
+    """스트림 틱 수신 시 구독자에게 즉시 전송 (delta 모드는 변경 필드만)"""
+    if persistence:
+        persistence.record_tick(market_stream.latest_ticks[symbol])
+    await broadcast_to_websockets(
+        {"type": "market_tick", "data": dict(market_stream.latest_ticks[symbol])},
+        topics=message_topics("market_tick", [symbol]),
+        delta_message={"type": "market_tick", "delta": True, "data": delta},
+        coalesce_key=f"market_tick:{symbol}"
+    )
+
+async def on_market_kline(symbol: str, bar: Dict[str, Any]):
+    """마감된 봉은 지표 엔진 대기열에 추가 (신호 생성 주기에 일괄 계산)"""
+    indicator_engine.push(symbol, bar)
+
+async def seed_indicator_engine():
+    """과거 캔들로 지표 엔진 워밍업"""
+    if not exchange_gateway:
+        return
+    
+    async def seed(symbol: str):
+        klines = await exchange_gateway.get_klines(symbol, MARKET_KLINE_INTERVAL, INDICATOR_SEED_BARS + 1)
+        # 마지막 캔들은 아직 마감 전
+        indicator_engine.seed(symbol, [
+            {"open": k[1], "high": k[2], "low": k[3], "close": k[4], "volume": k[5]}
+            for k in klines[:-1]
+        ])
+    
+    results = await asyncio.gather(*(seed(s) for s in MARKET_SYMBOLS), return_exceptions=True)
+    for symbol, result in zip(MARKET_SYMBOLS, results):
+        if isinstance(result, Exception):
+            logger.error(f"Indicator seed error {symbol}: {result}")
+    logger.info(f"📈 지표 엔진 워밍업 완료: {len(indicator_engine.symbols)} symbols")
+
+async def resync_market_data(symbols: List[str]) -> List[Dict[str, Any]]:
+    """스트림 재연결 후 REST 스냅샷 조회"""
+    if not exchange_gateway:
+        return []
+    return await exchange_gateway.get_ticker(symbols)
 
 async def update_market_data():
     """실시간 시장 데이터 업데이트"""
     try:
-        if binance_client:
+        if market_stream and market_stream.latest_ticks:
+            # 스트림 최신 틱 테이블 사용 (REST 폴링 불필요)
+            filtered_data = market_stream.snapshot()
+        elif exchange_gateway:
             # 주요 암호화폐 데이터 가져오기
-            tickers = binance_client.get_ticker()
-            major_cryptos = ['BTCUSDT', 'ETHUSDT', 'BNBUSDT']
-            
-            filtered_data = [t for t in tickers if t['symbol'] in major_cryptos]
-            
+            filtered_data = await exchange_gateway.get_ticker(MARKET_SYMBOLS)
+        else:
+            filtered_data = None
+        
+        if filtered_data is not None:
             # JSON 파일 업데이트
             market_data = {
                 "timestamp": datetime.now().isoformat(),
@@ -422,30 +953,67 @@ async def update_market_data():
                 "market_status": "active"
             }
             
-            json_manager.save_json_data("market_data.json", market_data)
+            await json_manager.save_json_data("market_data.json", market_data)
+            
+            if event_bus:
+                await event_bus.publish("market_data", "snapshot", market_data)
+            
+            if persistence:
+                await persistence.record_market_snapshot(filtered_data)
             
             # WebSocket으로 실시간 전송
             await broadcast_to_websockets({
                 "type": "market_update",
                 "data": market_data
-            })
+            }, coalesce_key="market_update")
             
     except Exception as e:
         logger.error(f"Market data update error: {e}")
 
+def indicator_signals() -> Dict[str, Dict[str, Any]]:
+    """지표 엔진 기반 신호 (전체 심볼 일괄 계산)"""
+    indicator_engine.flush()
+    classified = classify_signals(indicator_engine.snapshot())
+    if classified.empty:
+        return {}
+    
+    signals = {}
+    ready = classified[classified["rsi"].notna() & classified["macd"].notna()]
+    for symbol, row in ready.iterrows():
+        indicators = {
+            k: round(float(row[k]), 6)
+            for k in ("rsi", "macd", "macd_signal", "macd_hist", "bb_upper", "bb_middle",
+                      "bb_lower", "bb_percent_b", "stoch_rsi", "volume_zscore")
+            if not np.isnan(row[k])
+        }
+        signals[symbol] = {
+            "symbol": symbol,
+            "signal": row["signal"],
+            "confidence": float(row["confidence"]),
+            "reason": f"RSI {row['rsi']:.1f}, MACD hist {row['macd_hist']:+.4f}, score {row['score']:+.1f}",
+            "indicators": indicators
+        }
+    return signals
+
 async def generate_ai_signals():
-    """AI 트레이딩 신호 생성 (Mock)"""
+    """AI 트레이딩 신호 생성 (지표 엔진, 워밍업 전 심볼은 등락률 기반)"""
+    with SIGNAL_GENERATION_SECONDS.time():
+        await _generate_ai_signals()
+
+async def _generate_ai_signals():
     try:
-        # 간단한 AI 신호 생성 로직 (실제로는 ML 모델 사용)
         market_data = json_manager.load_json_data("market_data.json")
+        engine_signals = indicator_signals()
         
         signals = []
         for crypto in market_data.get('crypto_pairs', []):
             symbol = crypto.get('symbol')
             price_change = float(crypto.get('priceChangePercent', 0))
             
-            # 간단한 신호 생성 로직
-            if price_change > 5:
+            # 지표 엔진 신호 우선, 워밍업 전이면 간단한 등락률 로직
+            if symbol in engine_signals:
+                signal = engine_signals[symbol]
+            elif price_change > 5:
                 signal = {
                     "symbol": symbol,
                     "signal": "STRONG_BUY",
@@ -482,18 +1050,25 @@ async def generate_ai_signals():
             "timestamp": datetime.now().isoformat(),
             "signals": signals,
             "metadata": {
-                "model_version": "1.0",
-                "confidence_threshold": 0.6
+                "model_version": "1.1",
+                "confidence_threshold": 0.6,
+                "indicator_symbols": len(engine_signals)
             }
         }
         
-        json_manager.save_json_data("ai_recommendations.json", ai_data)
+        await json_manager.save_json_data("ai_recommendations.json", ai_data)
+        
+        if event_bus:
+            await event_bus.publish("ai_recommendations", "signals", ai_data)
+        
+        if persistence:
+            await persistence.record_signals(signals)
         
         # WebSocket으로 전송
         await broadcast_to_websockets({
             "type": "ai_signals",
             "data": ai_data
-        })
+        }, topics=message_topics("ai_signals", [s['symbol'] for s in signals]), coalesce_key="ai_signals")
         
     except Exception as e:
         logger.error(f"AI signal generation error: {e}")
@@ -0,0 +1,236 @@
+"""
+Christmas Trading 실시간 시장 데이터 스트림
+바이낸스 combined stream (ticker / kline) 구독 및 최신 틱 테이블 관리
+
+주요 기능:
+1. 설정된 심볼별 ticker / kline 스트림 구독
+2. 메모리 내 최신 틱 테이블 유지 및 변경 필드(delta) 콜백
+3. 끊김 / 무응답 감지 시 지수 백오프 재연결
+4. 재연결 후 REST 스냅샷으로 공백 구간 재동기화
+
+로컬 테스트:
+    python market_stream.py --replay frames.jsonl --port 9443
+    MARKET_STREAM_URL=ws://localhost:9443 python main.py
+"""
+
+import random
+import asyncio
+import logging
+from typing import Dict, List, Any, Optional, Callable, Awaitable
+
+import websockets
+
+from codec import loads
+
+logger = logging.getLogger(__name__)
+
+# 바이낸스 24hr ticker 이벤트 필드 → REST ticker 필드
+TICKER_FIELDS = {
+    "p": "priceChange",
+    "P": "priceChangePercent",
+    "w": "weightedAvgPrice",
+    "c": "lastPrice",
+    "Q": "lastQty",
+    "b": "bidPrice",
+    "a": "askPrice",
+    "o": "openPrice",
+    "h": "highPrice",
+    "l": "lowPrice",
+    "v": "volume",
+    "q": "quoteVolume",
+    "O": "openTime",
+    "C": "closeTime",
+    "n": "count",
+}
+
+KLINE_INTERVAL_MS = {
+    "1m": 60_000,
+    "3m": 180_000,
+    "5m": 300_000,
+    "15m": 900_000,
+    "30m": 1_800_000,
+    "1h": 3_600_000,
+}
+
+TickCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+KlineCallback = Callable[[str, Dict[str, Any]], Awaitable[None]]
+ResyncCallback = Callable[[List[str]], Awaitable[List[Dict[str, Any]]]]
+
+
+class MarketStream:
+    """바이낸스 실시간 스트림 수신기"""
+
+    def __init__(self, symbols: List[str],
+                 base_url: str = "wss://stream.binance.com:9443",
+                 kline_interval: str = "1m",
+                 on_tick: Optional[TickCallback] = None,
+                 on_kline: Optional[KlineCallback] = None,
+                 resync: Optional[ResyncCallback] = None,
+                 stale_timeout: float = 30.0,
+                 max_reconnect_delay: float = 60.0):
+        self.symbols = [s.upper() for s in symbols]
+        self.base_url = base_url.rstrip("/")
+        self.kline_interval = kline_interval
+        self.on_tick = on_tick
+        self.on_kline = on_kline
+        self.resync = resync
+        self.stale_timeout = stale_timeout
+        self.max_reconnect_delay = max_reconnect_delay
+
+        # 최신 틱 테이블 (심볼 → REST ticker 형식)
+        self.latest_ticks: Dict[str, Dict[str, Any]] = {}
+        self.latest_klines: Dict[str, Dict[str, Any]] = {}
+
+        self.connected = False
+        self.reconnects = 0
+        self.gaps_detected = 0
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def stream_url(self) -> str:
+        streams = []
+        for symbol in self.symbols:
+            streams.append(f"{symbol.lower()}@ticker")
+            streams.append(f"{symbol.lower()}@kline_{self.kline_interval}")
+        return f"{self.base_url}/stream?streams={'/'.join(streams)}"
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected = False
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """심볼 순서대로 최신 틱 목록 반환"""
+        return [dict(self.latest_ticks[s]) for s in self.symbols if s in self.latest_ticks]
+
+    async def _run(self):
+        delay = 1.0
+        while True:
+            try:
+                async with websockets.connect(self.stream_url, ping_interval=20) as ws:
+                    self.connected = True
+                    delay = 1.0
+                    logger.info(f"✅ Market stream 연결: {len(self.symbols)} symbols")
+
+                    if self.reconnects > 0:
+                        await self._resync()
+
+                    while True:
+                        # 무응답 연결은 끊긴 것으로 간주
+                        raw = await asyncio.wait_for(ws.recv(), timeout=self.stale_timeout)
+                        try:
+                            await self.handle_frame(raw)
+                        except (KeyError, ValueError) as e:
+                            logger.warning(f"⚠️ 잘못된 스트림 프레임 무시: {e}")
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Market stream 끊김: {e}")
+
+            self.connected = False
+            self.reconnects += 1
+            # 지수 백오프 + 지터
+            await asyncio.sleep(delay + random.uniform(0, delay / 2))
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _resync(self):
+        """재연결 후 REST 스냅샷으로 누락 구간 보정"""
+        if not self.resync:
+            return
+        try:
+            tickers = await self.resync(self.symbols)
+            for ticker in tickers:
+                await self._apply_tick(ticker['symbol'], ticker)
+            logger.info(f"🔄 Market stream 재동기화 완료: {len(tickers)} symbols")
+        except Exception as e:
+            logger.error(f"❌ Market stream 재동기화 실패: {e}")
+
+    async def handle_frame(self, raw: str):
+        """combined stream 프레임 처리"""
+        frame = loads(raw)
+        data = frame.get("data", frame)
+        event_type = data.get("e")
+
+        if event_type == "24hrTicker":
+            ticker = {"symbol": data["s"]}
+            for key, field in TICKER_FIELDS.items():
+                if key in data:
+                    ticker[field] = data[key]
+            await self._apply_tick(data["s"], ticker)
+        elif event_type == "kline":
+            await self._apply_kline(data["s"], data["k"])
+
+    async def _apply_tick(self, symbol: str, ticker: Dict[str, Any]):
+        previous = self.latest_ticks.get(symbol)
+        if previous is None:
+            delta = dict(ticker)
+            self.latest_ticks[symbol] = dict(ticker)
+        else:
+            delta = {k: v for k, v in ticker.items() if previous.get(k) != v}
+            previous.update(delta)
+
+        if delta and self.on_tick:
+            delta["symbol"] = symbol
+            await self.on_tick(symbol, delta)
+
+    async def _apply_kline(self, symbol: str, kline: Dict[str, Any]):
+        bar = {
+            "open_time": kline["t"],
+            "open": float(kline["o"]),
+            "high": float(kline["h"]),
+            "low": float(kline["l"]),
+            "close": float(kline["c"]),
+            "volume": float(kline["v"]),
+            "closed": kline.get("x", False),
+        }
+
+        previous = self.latest_klines.get(symbol)
+        interval_ms = KLINE_INTERVAL_MS.get(self.kline_interval)
+        if previous and interval_ms and bar["open_time"] > previous["open_time"] + interval_ms:
+            self.gaps_detected += 1
+            logger.warning(f"⚠️ Kline 공백 감지: {symbol} ({previous['open_time']} → {bar['open_time']})")
+
+        self.latest_klines[symbol] = bar
+        if bar["closed"] and self.on_kline:
+            await self.on_kline(symbol, bar)
+
+
+async def replay_frames(frames_path: str, host: str = "localhost", port: int = 9443,
+                        interval: float = 0.01):
+    """기록된 프레임(JSONL)을 재생하는 로컬 가짜 스트림 서버"""
+    with open(frames_path, 'r', encoding='utf-8') as f:
+        frames = [line.strip() for line in f if line.strip()]
+
+    async def handler(websocket, *args):
+        for frame in frames:
+            await websocket.send(frame)
+            await asyncio.sleep(interval)
+        await websocket.wait_closed()
+
+    async with websockets.serve(handler, host, port):
+        logger.info(f"🎞️ Replay server: ws://{host}:{port} ({len(frames)} frames)")
+        await asyncio.Future()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Market stream replay server")
+    parser.add_argument("--replay", required=True, help="recorded frames (JSONL)")
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", type=int, default=9443)
+    parser.add_argument("--interval", type=float, default=0.01)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(replay_frames(args.replay, args.host, args.port, args.interval))
@@ -0,0 +1,125 @@
+"""
+Christmas Trading 백엔드 Prometheus 메트릭
+
+핫 경로에서는 히스토그램 observe만 수행하고,
+카운터 / 게이지는 각 컴포넌트가 이미 유지하는 정수 카운터를
+스크레이프 시점에 읽어서 노출 (추가 잠금 / 갱신 비용 없음)
+"""
+
+from typing import Dict, Any, Callable, Iterator
+
+from prometheus_client import Histogram, REGISTRY, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+EXCHANGE_REQUEST_SECONDS = Histogram(
+    "christmas_exchange_request_seconds",
+    "Binance REST request latency",
+    ["endpoint", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+WS_PUBLISH_SECONDS = Histogram(
+    "christmas_ws_publish_seconds",
+    "Time to serialize and fan a message out to client queues",
+    buckets=LATENCY_BUCKETS
+)
+WS_SEND_LAG_SECONDS = Histogram(
+    "christmas_ws_send_lag_seconds",
+    "Time a message waited in a client queue before being sent",
+    buckets=LATENCY_BUCKETS
+)
+ORDER_EXECUTION_SECONDS = Histogram(
+    "christmas_order_execution_seconds",
+    "User action execution time in the order pipeline",
+    ["type"],
+    buckets=LATENCY_BUCKETS
+)
+SIGNAL_GENERATION_SECONDS = Histogram(
+    "christmas_signal_generation_seconds",
+    "AI signal generation pass duration",
+    buckets=LATENCY_BUCKETS
+)
+
+
+def observe_exchange_request(endpoint: str, seconds: float, ok: bool):
+    EXCHANGE_REQUEST_SECONDS.labels(endpoint, "ok" if ok else "error").observe(seconds)
+
+
+def observe_ws_send_lag(seconds: float):
+    WS_SEND_LAG_SECONDS.observe(seconds)
+
+
+class BackendCollector:
+    """컴포넌트 카운터 / 큐 깊이를 스크레이프 시점에 수집"""
+
+    def __init__(self, components: Callable[[], Dict[str, Any]]):
+        # 시작 전에는 None인 전역 컴포넌트가 있으므로 매 수집마다 조회
+        self.components = components
+
+    def collect(self) -> Iterator:
+        c = self.components()
+
+        broadcaster = c.get("broadcaster")
+        if broadcaster is not None:
+            totals = broadcaster.totals()
+            yield GaugeMetricFamily("christmas_ws_clients", "Connected WebSocket clients", value=len(broadcaster.connections))
+            yield GaugeMetricFamily("christmas_ws_queue_depth", "Messages waiting in client queues", value=totals["queue_depth"])
+            yield CounterMetricFamily("christmas_ws_messages_sent", "WebSocket messages sent", value=totals["sent"])
+            yield CounterMetricFamily("christmas_ws_messages_dropped", "WebSocket messages dropped by slow consumer policy", value=totals["dropped"])
+            yield CounterMetricFamily("christmas_ws_messages_coalesced", "WebSocket messages replaced by a newer snapshot", value=totals["coalesced"])
+            yield CounterMetricFamily("christmas_ws_slow_disconnects", "Clients disconnected for being too slow", value=broadcaster.disconnected_slow)
+
+        pipeline = c.get("order_pipeline")
+        if pipeline is not None:
+            yield GaugeMetricFamily("christmas_order_queue_depth", "Orders waiting in per-symbol queues", value=pipeline.queue_depth)
+            yield GaugeMetricFamily("christmas_order_in_flight", "Orders being executed", value=pipeline.in_flight)
+            yield CounterMetricFamily("christmas_orders_executed", "Orders executed", value=pipeline.executed)
+            yield CounterMetricFamily("christmas_orders_failed", "Orders failed", value=pipeline.failed)
+
+        action_queue = c.get("action_queue")
+        if action_queue is not None:
+            yield GaugeMetricFamily("christmas_pending_actions", "User actions waiting to be drained", value=len(action_queue))
+
+        persistence = c.get("persistence")
+        if persistence is not None:
+            buffered = GaugeMetricFamily("christmas_persist_buffered_rows", "Rows waiting for the next flush", labels=["table"])
+            rows = CounterMetricFamily("christmas_persist_rows", "Rows written to PostgreSQL", labels=["table"])
+            errors = CounterMetricFamily("christmas_persist_errors", "Failed flush attempts (retried)", labels=["table"])
+            dropped = CounterMetricFamily("christmas_persist_dropped_rows", "Rows dropped on a full buffer", labels=["table"])
+            rejected = CounterMetricFamily("christmas_persist_rejected_rows", "Invalid or unwritable rows sent to the dead-letter file", labels=["table"])
+            for table, m in persistence.metrics().items():
+                buffered.add_metric([table], m["buffered"])
+                rows.add_metric([table], m["rows_written"])
+                errors.add_metric([table], m["errors"])
+                dropped.add_metric([table], m["dropped"])
+                rejected.add_metric([table], m["rejected"])
+            yield from (buffered, rows, errors, dropped, rejected)
+
+        event_bus = c.get("event_bus")
+        if event_bus is not None:
+            events = CounterMetricFamily("christmas_event_bus_messages", "Event bus messages by stage", labels=["stage"])
+            for stage in ("published", "delivered", "acked", "failed", "claimed", "dead_lettered"):
+                events.add_metric([stage], getattr(event_bus, stage))
+            yield events
+
+        stream = c.get("market_stream")
+        if stream is not None:
+            yield GaugeMetricFamily("christmas_market_stream_connected", "Market stream connection state", value=1 if stream.connected else 0)
+            yield CounterMetricFamily("christmas_market_stream_reconnects", "Market stream reconnects", value=stream.reconnects)
+            yield CounterMetricFamily("christmas_market_stream_gaps", "Kline gaps detected", value=stream.gaps_detected)
+
+        cache = c.get("market_snapshot_cache")
+        if cache is not None:
+            stats = cache.stats()
+            yield CounterMetricFamily("christmas_market_cache_hits", "Market snapshot cache hits", value=stats["hits"])
+            yield CounterMetricFamily("christmas_market_cache_misses", "Market snapshot cache misses", value=stats["misses"])
+            yield CounterMetricFamily("christmas_market_cache_upstream_calls", "Upstream fetches made by the snapshot cache", value=stats["upstream_calls"])
+
+
+def register_collector(components: Callable[[], Dict[str, Any]]):
+    REGISTRY.register(BackendCollector(components))
+
+
+def render_latest() -> bytes:
+    return generate_latest(REGISTRY)
@@ -0,0 +1,281 @@
+"""
+Christmas Trading 주문 실행 파이프라인
+심볼 간 병렬 실행 + 심볼 내 FIFO 순서 보장
+
+주요 기능:
+1. 심볼별 대기열, 한 심볼은 동시에 하나의 워커만 처리
+2. 전체 워커 수 제한
+3. 바이낸스 요청 가중치 / 주문 수 기준 클라이언트 측 속도 제한 (토큰 버킷)
+4. 큐 깊이 / 실행 지연 메트릭
+5. 로컬 모의 거래소 벤치마크: python order_pipeline.py --orders 1000
+"""
+
+import time
+import uuid
+import random
+import asyncio
+import logging
+from collections import deque
+from typing import Dict, List, Any, Optional, Deque, Callable, Awaitable
+
+logger = logging.getLogger(__name__)
+
+ORDER_ACTION_TYPES = ("buy_order", "sell_order")
+# POST /api/v3/order 요청 가중치
+ORDER_REQUEST_WEIGHT = 1
+# 게이트웨이 엔드포인트별 요청 가중치 (ticker: 심볼 1~20개 기준, account: /api/v3/account)
+REQUEST_WEIGHTS = {
+    "ticker": 2,
+    "klines": 2,
+    "order": ORDER_REQUEST_WEIGHT,
+    "account": 20,
+}
+
+OrderExecutor = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+class TokenBucket:
+    """토큰 버킷 속도 제한기"""
+
+    def __init__(self, capacity: float, period: float):
+        self.capacity = capacity
+        self.refill_rate = capacity / period
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    async def acquire(self, tokens: float = 1.0):
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.refill_rate)
+
+    def consume(self, tokens: float = 1.0):
+        """대기 없이 차감 (이미 보낸 요청 - 부족분은 다음 acquire 가 기다림)"""
+        self._refill()
+        self.tokens -= tokens
+
+
+class BinanceRateLimiter:
+    """바이낸스 한도 (요청 가중치/분, 주문 수/10초) 동시 적용"""
+
+    def __init__(self, request_weight_per_minute: int = 1200, orders_per_10s: int = 50):
+        self.request_weight = TokenBucket(request_weight_per_minute, 60.0)
+        self.orders = TokenBucket(orders_per_10s, 10.0)
+
+    async def acquire_order(self):
+        await self.orders.acquire(1)
+        await self.request_weight.acquire(ORDER_REQUEST_WEIGHT)
+
+    def charge(self, endpoint: str):
+        """주문 외 거래소 요청(시세 / 캔들 / 계정)의 가중치를 같은 분당 예산에서 차감"""
+        if endpoint == "order":
+            # acquire_order 에서 이미 차감
+            return
+        self.request_weight.consume(REQUEST_WEIGHTS.get(endpoint, 1))
+
+
+class LatencyWindow:
+    """최근 N개 지연 시간 통계"""
+
+    def __init__(self, size: int = 1000):
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, value: float):
+        self.samples.append(value)
+
+    def summary(self) -> Dict[str, float]:
+        if not self.samples:
+            return {"count": 0}
+        ordered = sorted(self.samples)
+        return {
+            "count": len(ordered),
+            "p50": round(ordered[len(ordered) // 2], 4),
+            "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+            "max": round(ordered[-1], 4),
+        }
+
+
+class OrderPipeline:
+    """심볼 단위 직렬 / 심볼 간 병렬 주문 실행기"""
+
+    def __init__(self, executor: OrderExecutor, max_workers: int = 8,
+                 rate_limiter: Optional[BinanceRateLimiter] = None,
+                 on_complete: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.executor = executor
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self.on_complete = on_complete
+
+        self._queues: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._ready: asyncio.Queue = asyncio.Queue()
+        # 대기열에 있거나 워커가 처리 중인 심볼
+        self._scheduled: set = set()
+        self._workers: List[asyncio.Task] = []
+
+        self.in_flight = 0
+        self.executed = 0
+        self.failed = 0
+        self.wait_latency = LatencyWindow()
+        self.exec_latency = LatencyWindow()
+
+    def start(self):
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._worker()) for _ in range(self.max_workers)]
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def submit(self, action: Dict[str, Any]):
+        """액션 투입 (같은 심볼은 투입 순서대로 실행)"""
+        symbol = action.get('symbol') or "_"
+        action['_enqueued_at'] = time.monotonic()
+        self._queues.setdefault(symbol, deque()).append(action)
+        if symbol not in self._scheduled:
+            self._scheduled.add(symbol)
+            self._ready.put_nowait(symbol)
+
+    async def _worker(self):
+        while True:
+            symbol = await self._ready.get()
+            queue = self._queues.get(symbol)
+            if not queue:
+                self._scheduled.discard(symbol)
+                self._queues.pop(symbol, None)
+                continue
+
+            action = queue.popleft()
+            await self._execute(action)
+
+            # 같은 심볼의 남은 주문은 대기열 뒤로 (다른 심볼과 공정하게 순환)
+            if queue:
+                self._ready.put_nowait(symbol)
+            else:
+                self._scheduled.discard(symbol)
+                self._queues.pop(symbol, None)
+
+    async def _execute(self, action: Dict[str, Any]):
+        started = time.monotonic()
+        self.wait_latency.add(started - action.pop('_enqueued_at', started))
+        self.in_flight += 1
+        try:
+            if self.rate_limiter and action.get('type') in ORDER_ACTION_TYPES:
+                await self.rate_limiter.acquire_order()
+            await self.executor(action)
+            self.executed += 1
+        except Exception as e:
+            self.failed += 1
+            action['error'] = str(e)
+            logger.error(f"Order pipeline error {action.get('id')}: {e}")
+        finally:
+            self.in_flight -= 1
+            self.exec_latency.add(time.monotonic() - started)
+
+        if self.on_complete:
+            self.on_complete(action)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "workers": len(self._workers),
+            "queue_depth": self.queue_depth,
+            "symbols_queued": {s: len(q) for s, q in self._queues.items() if q},
+            "in_flight": self.in_flight,
+            "executed": self.executed,
+            "failed": self.failed,
+            "wait_latency": self.wait_latency.summary(),
+            "execution_latency": self.exec_latency.summary(),
+        }
+
+
+class MockExchange:
+    """벤치마크용 로컬 모의 거래소 (지연 시간만 흉내)"""
+
+    def __init__(self, latency: float = 0.05, jitter: float = 0.02):
+        self.latency = latency
+        self.jitter = jitter
+        self.orders: List[Dict[str, Any]] = []
+
+    async def create_order(self, **params) -> Dict[str, Any]:
+        await asyncio.sleep(max(0.0, self.latency + random.uniform(-self.jitter, self.jitter)))
+        order = {"orderId": uuid.uuid4().hex, "status": "FILLED", "transactTime": int(time.time() * 1000), **params}
+        self.orders.append(order)
+        return order
+
+
+async def benchmark(orders: int = 1000, symbols: int = 10, workers: int = 8,
+                    latency: float = 0.05, rate_limit: bool = False) -> Dict[str, Any]:
+    """모의 거래소 대상 초당 주문 처리량 측정"""
+    exchange = MockExchange(latency=latency)
+    done = asyncio.Event()
+    completed: List[Dict[str, Any]] = []
+
+    async def execute(action: Dict[str, Any]):
+        action['order_result'] = await exchange.create_order(
+            symbol=action['symbol'], side='BUY', type='MARKET', quantity=action['quantity']
+        )
+
+    def on_complete(action: Dict[str, Any]):
+        completed.append(action)
+        if len(completed) == orders:
+            done.set()
+
+    pipeline = OrderPipeline(
+        execute, max_workers=workers,
+        rate_limiter=BinanceRateLimiter() if rate_limit else None,
+        on_complete=on_complete
+    )
+    pipeline.start()
+
+    started = time.monotonic()
+    for i in range(orders):
+        pipeline.submit({"id": f"bench_{i}", "type": "buy_order", "symbol": f"SYM{i % symbols}", "quantity": 1, "seq": i})
+    await done.wait()
+    elapsed = time.monotonic() - started
+    await pipeline.stop()
+
+    # 심볼별 FIFO 검증
+    last_seq: Dict[str, int] = {}
+    fifo_ok = True
+    for action in completed:
+        if action['seq'] < last_seq.get(action['symbol'], -1):
+            fifo_ok = False
+        last_seq[action['symbol']] = action['seq']
+
+    return {
+        "orders": orders,
+        "elapsed": round(elapsed, 3),
+        "orders_per_second": round(orders / elapsed, 1),
+        "fifo_per_symbol": fifo_ok,
+        **pipeline.metrics(),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Order pipeline benchmark against a mock exchange")
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--symbols", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--rate-limit", action="store_true")
+    args = parser.parse_args()
+
+    result = asyncio.run(benchmark(args.orders, args.symbols, args.workers, args.latency, args.rate_limit))
+    print(json.dumps(result, indent=2))
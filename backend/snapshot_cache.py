@@ -0,0 +1,131 @@
+"""
+Christmas Trading 시장 스냅샷 캐시
+심볼별 최신 티커를 TTL 동안 공유하는 메모리 캐시
+
+주요 기능:
+1. 심볼 단위 인덱스 (선형 탐색 없음)
+2. TTL 만료 시 single-flight 갱신 (동시 요청은 하나의 업스트림 호출 공유)
+3. 심볼별 버전 기반 ETag 생성 (If-None-Match → 304)
+4. 업스트림이 돌려주지 않은 심볼은 negative_ttl 동안 알 수 없는 심볼로 기억 (반복 업스트림 호출 방지)
+"""
+
+import time
+import asyncio
+import hashlib
+import logging
+from typing import Dict, List, Any, Optional, Tuple, Callable, Awaitable
+
+logger = logging.getLogger(__name__)
+
+SnapshotFetcher = Callable[[List[str]], Awaitable[List[Dict[str, Any]]]]
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더 비교 (RFC 9110 약한 비교: 목록 / W/ 접두사 / "*" 허용)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class MarketSnapshotCache:
+    """심볼 인덱스 기반 시장 스냅샷 캐시"""
+
+    def __init__(self, fetcher: SnapshotFetcher, ttl: float = 2.0, negative_ttl: float = 60.0):
+        self.fetcher = fetcher
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        # 심볼 → (갱신 시각, 버전, 티커)
+        self._entries: Dict[str, Tuple[float, int, Dict[str, Any]]] = {}
+        # 알 수 없는 심볼 → 확인 시각
+        self._unknown: Dict[str, float] = {}
+        self._inflight: Dict[Tuple[str, ...], asyncio.Future] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.upstream_calls = 0
+
+    def _is_fresh(self, symbol: str, now: float) -> bool:
+        entry = self._entries.get(symbol)
+        if entry is not None:
+            return now - entry[0] <= self.ttl
+        checked_at = self._unknown.get(symbol)
+        return checked_at is not None and now - checked_at <= self.negative_ttl
+
+    def unknown(self, symbols: List[str]) -> List[str]:
+        """업스트림에 없는 것으로 확인된 심볼"""
+        return [s for s in symbols if s not in self._entries and s in self._unknown]
+
+    async def get(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """요청 심볼의 티커 반환 (만료된 심볼만 갱신)"""
+        now = time.monotonic()
+        stale = tuple(sorted(s for s in symbols if not self._is_fresh(s, now)))
+
+        if stale:
+            self.misses += 1
+            await self._refresh(stale)
+        else:
+            self.hits += 1
+
+        return [self._entries[s][2] for s in symbols if s in self._entries]
+
+    async def _refresh(self, symbols: Tuple[str, ...]):
+        future = self._inflight.get(symbols)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(symbols))
+            self._inflight[symbols] = future
+            future.add_done_callback(lambda _: self._inflight.pop(symbols, None))
+        # 대기 중인 요청이 취소되어도 공유 갱신은 계속 진행
+        await asyncio.shield(future)
+
+    async def _fetch(self, symbols: Tuple[str, ...]):
+        self.upstream_calls += 1
+        tickers = await self.fetcher(list(symbols))
+        self.put(tickers)
+
+        now = time.monotonic()
+        # 만료된 항목 정리 (임의 심볼 요청으로 무한히 커지지 않도록)
+        for symbol, checked_at in list(self._unknown.items()):
+            if now - checked_at > self.negative_ttl:
+                del self._unknown[symbol]
+        returned = {ticker.get('symbol') for ticker in tickers}
+        for symbol in symbols:
+            if symbol not in returned and symbol not in self._entries:
+                self._unknown[symbol] = now
+
+    def put(self, tickers: List[Dict[str, Any]]):
+        """티커 반영 (내용이 바뀐 심볼만 버전 증가)"""
+        now = time.monotonic()
+        for ticker in tickers:
+            symbol = ticker.get('symbol')
+            if not symbol:
+                continue
+            previous = self._entries.get(symbol)
+            version = previous[1] if previous else 0
+            if previous is None or previous[2] != ticker:
+                version += 1
+            self._entries[symbol] = (now, version, ticker)
+            self._unknown.pop(symbol, None)
+
+    def etag(self, symbols: List[str]) -> str:
+        """요청 심볼 조합과 버전으로 약한 ETag 생성"""
+        key = ",".join(f"{s}:{self._entries[s][1]}" for s in symbols if s in self._entries)
+        return f'W/"{hashlib.sha1(key.encode("utf-8")).hexdigest()}"'
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "symbols": len(self._entries),
+            "unknown_symbols": len(self._unknown),
+            "hits": self.hits,
+            "misses": self.misses,
+            "upstream_calls": self.upstream_calls,
+        }
@@ -5,10 +5,14 @@ Official MCP Protocol Implementation for AI Trading Assistant
 """
 
 import asyncio
+import hashlib
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional, Sequence
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 import aiohttp
 from datetime import datetime
 
@@ -25,10 +29,211 @@ from mcp.types import (
     Role,
 )
 
+try:
+    from prometheus_client import Counter, Histogram, start_http_server
+except ImportError:  # 메트릭 선택 사항
+    Counter = Histogram = None
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("christmas-gemini-mcp")
 
+# Prometheus 메트릭 포트 (설정 시에만 노출, stdio MCP 채널과 별도)
+GEMINI_METRICS_PORT = int(os.getenv("GEMINI_METRICS_PORT", "0"))
+
+# Gemini HTTP 클라이언트 (세션 1개 재사용 - keep-alive / 연결 풀 / DNS 캐시)
+GEMINI_API_BASE = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com")
+GEMINI_MAX_CONCURRENCY = int(os.getenv("GEMINI_MAX_CONCURRENCY", "4"))
+GEMINI_POOL_LIMIT = int(os.getenv("GEMINI_POOL_LIMIT", "10"))
+GEMINI_KEEPALIVE_SECONDS = float(os.getenv("GEMINI_KEEPALIVE_SECONDS", "60"))
+GEMINI_DNS_CACHE_SECONDS = int(os.getenv("GEMINI_DNS_CACHE_SECONDS", "300"))
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "60"))
+
+# streamGenerateContent 사용 (부분 응답을 MCP 진행 알림으로 전달), 도구 인자 stream 으로 호출별 변경
+GEMINI_STREAMING = os.getenv("GEMINI_STREAMING", "true").lower() == "true"
+
+GENERATION_CONFIG = {
+    "temperature": 0.7,
+    "topK": 40,
+    "topP": 0.95,
+    "maxOutputTokens": 2048
+}
+
+# 응답 캐시 (메모리 LRU + 선택적 SQLite, GEMINI_CACHE_DB 가 비어 있으면 메모리만)
+GEMINI_CACHE_ENABLED = os.getenv("GEMINI_CACHE_ENABLED", "true").lower() == "true"
+GEMINI_CACHE_MAX_ENTRIES = int(os.getenv("GEMINI_CACHE_MAX_ENTRIES", "512"))
+GEMINI_CACHE_DB = os.getenv("GEMINI_CACHE_DB", "")
+# 도구별 TTL(초), GEMINI_CACHE_TTLS="predict_stock_movement=120,generate_trading_code=0" 형식으로 변경 (0이면 캐시 안 함)
+CACHE_TTLS = {
+    "analyze_market_data": 60,
+    "predict_stock_movement": 300,
+    "batch_predict_stock_movement": 300,
+    "assess_investment_risk": 300,
+    "optimize_trading_strategy": 3600,
+    "generate_trading_code": 86400,
+}
+# 배치 예측: 프롬프트 1건당 최대 종목 수 / 지표 JSON 최대 글자 수
+GEMINI_BATCH_MAX_SYMBOLS = int(os.getenv("GEMINI_BATCH_MAX_SYMBOLS", "10"))
+GEMINI_BATCH_MAX_CHARS = int(os.getenv("GEMINI_BATCH_MAX_CHARS", "12000"))
+for _item in filter(None, os.getenv("GEMINI_CACHE_TTLS", "").split(",")):
+    _tool, _, _ttl = _item.partition("=")
+    CACHE_TTLS[_tool.strip()] = float(_ttl)
+
+GEMINI_REQUEST_SECONDS = Histogram(
+    "christmas_gemini_request_seconds",
+    "Gemini generateContent request latency",
+    ["model", "outcome"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+) if Histogram else None
+GEMINI_FIRST_CHUNK_SECONDS = Histogram(
+    "christmas_gemini_first_chunk_seconds",
+    "Time to the first streamed Gemini chunk",
+    ["model"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0)
+) if Histogram else None
+GEMINI_CACHE_LOOKUPS = Counter(
+    "christmas_gemini_cache_lookups",
+    "Gemini response cache lookups",
+    ["tool", "result"]
+) if Counter else None
+GEMINI_CALLS = Counter(
+    "christmas_gemini_calls",
+    "Gemini calls that went upstream or joined an identical in-flight request",
+    ["result"]
+) if Counter else None
+
+class GeminiAPIError(Exception):
+    """Gemini 호출 실패 (캐시하지 않음)"""
+
+class GeminiResponseCache:
+    """모델 + 프롬프트 + 생성 설정 해시 → 응답 텍스트 (메모리 LRU + 선택적 SQLite 계층)"""
+    
+    def __init__(self, max_entries: int = 512, db_path: str = ""):
+        self.max_entries = max_entries
+        # key → (만료 시각(epoch), 응답)
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self.db: Optional[sqlite3.Connection] = None
+        if db_path:
+            self.db = sqlite3.connect(db_path)
+            self.db.execute(
+                "CREATE TABLE IF NOT EXISTS gemini_responses ("
+                "key TEXT PRIMARY KEY, model TEXT, expires_at REAL, response TEXT)"
+            )
+            self.db.execute("DELETE FROM gemini_responses WHERE expires_at < ?", (time.time(),))
+            self.db.commit()
+        
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+    
+    @staticmethod
+    def key(model: str, prompt: str, config: Dict[str, Any]) -> str:
+        material = json.dumps([model, prompt, config], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+        
+        if self.db is not None:
+            row = self.db.execute(
+                "SELECT expires_at, response FROM gemini_responses WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is not None:
+                # 재시작 후 첫 조회 → 메모리 계층으로 승격
+                self._remember(key, row[0], row[1])
+                self.disk_hits += 1
+                return row[1]
+        
+        self.misses += 1
+        return None
+    
+    def put(self, key: str, model: str, response: str, ttl: float):
+        if ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+        self._remember(key, expires_at, response)
+        self.stores += 1
+        if self.db is not None:
+            self.db.execute(
+                "INSERT OR REPLACE INTO gemini_responses (key, model, expires_at, response) VALUES (?, ?, ?, ?)",
+                (key, model, expires_at, response)
+            )
+            self.db.commit()
+    
+    def discard(self, key: str):
+        """사용할 수 없는 응답 제거 (파싱 실패 등)"""
+        self._entries.pop(key, None)
+        if self.db is not None:
+            self.db.execute("DELETE FROM gemini_responses WHERE key = ?", (key,))
+            self.db.commit()
+    
+    def _remember(self, key: str, expires_at: float, response: str):
+        self._entries[key] = (expires_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+    
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+def chunk_symbols(entries: List[Dict[str, Any]], max_symbols: int, max_chars: int) -> List[List[Dict[str, Any]]]:
+    """종목 수 / 직렬화 크기 상한으로 묶음 분할 (상한을 넘는 단일 종목은 단독 묶음)"""
+    chunks: List[List[Dict[str, Any]]] = []
+    current: List[Dict[str, Any]] = []
+    size = 0
+    for entry in entries:
+        entry_size = len(json.dumps(entry, ensure_ascii=False))
+        if current and (len(current) >= max_symbols or size + entry_size > max_chars):
+            chunks.append(current)
+            current, size = [], 0
+        current.append(entry)
+        size += entry_size
+    if current:
+        chunks.append(current)
+    return chunks
+
+def parse_batch_predictions(text: str) -> Dict[str, Dict[str, Any]]:
+    """모델 출력(JSON, 코드 블록 허용)에서 종목별 예측 추출"""
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        raise ValueError("JSON 출력 없음")
+    start = min(starts)
+    end = text.rfind("}" if text[start] == "{" else "]")
+    data = json.loads(text[start:end + 1])
+    
+    if isinstance(data, dict) and isinstance(data.get("predictions"), list):
+        data = data["predictions"]
+    if isinstance(data, list):
+        return {str(p.get("symbol", "")).upper(): p for p in data if isinstance(p, dict)}
+    if isinstance(data, dict):
+        # {"BTCUSDT": {...}} 형태
+        return {str(symbol).upper(): p for symbol, p in data.items() if isinstance(p, dict)}
+    raise ValueError("예상하지 못한 JSON 구조")
+
 class ChristmasGeminiMCP:
     """Christmas Trading을 위한 Gemini MCP 서버 (공식 프로토콜 준수)"""
     
@@ -38,6 +243,19 @@ class ChristmasGeminiMCP:
         if not self.gemini_api_key:
             logger.warning("GEMINI_API_KEY not set. Some features may not work.")
         
+        # 첫 호출 시 생성 (이벤트 루프 안에서), 종료 시 close()
+        self.session: Optional[aiohttp.ClientSession] = None
+        # Gemini 동시 요청 상한 (초과 호출은 대기)
+        self.semaphore = asyncio.Semaphore(GEMINI_MAX_CONCURRENCY)
+        self.cache = GeminiResponseCache(GEMINI_CACHE_MAX_ENTRIES, GEMINI_CACHE_DB) if GEMINI_CACHE_ENABLED else None
+        # 프롬프트 지문 → 진행 중인 업스트림 요청 (동일 동시 호출은 결과 공유)
+        self.inflight: Dict[str, asyncio.Task] = {}
+        # 스트리밍 중인 요청의 수신 부분 응답 / 진행 알림 수신자 (나중에 합류한 호출자에게도 전달)
+        self.partials: Dict[str, List[str]] = {}
+        self.listeners: Dict[str, List[Callable[[str], Awaitable[None]]]] = {}
+        self.upstream_calls = 0
+        self.coalesced_calls = 0
+        
         # 도구 등록
         self.setup_tools()
         self.setup_prompts()
@@ -45,7 +263,6 @@ class ChristmasGeminiMCP:
     def setup_tools(self):
         """MCP 도구들 설정"""
         
-        @self.server.call_tool()
         async def analyze_market_data(arguments: dict) -> List[TextContent]:
             """시장 데이터 분석"""
             try:
@@ -70,7 +287,7 @@ class ChristmasGeminiMCP:
                 JSON 형태로 구조화된 분석 결과를 제공해주세요.
                 """
                 
-                result = await self.call_gemini_api(prompt)
+                result = await self.call_gemini_api(prompt, tool="analyze_market_data", stream=arguments.get('stream'))
                 
                 response = {
                     "analysis_result": result,
@@ -85,7 +302,6 @@ class ChristmasGeminiMCP:
                 logger.error(f"Market analysis error: {e}")
                 return [TextContent(type="text", text=f"오류 발생: {str(e)}")]
 
-        @self.server.call_tool()
         async def predict_stock_movement(arguments: dict) -> List[TextContent]:
             """주식 움직임 예측"""
             try:
@@ -113,7 +329,7 @@ class ChristmasGeminiMCP:
                 - 추천 액션
                 """
                 
-                result = await self.call_gemini_api(prompt)
+                result = await self.call_gemini_api(prompt, tool="predict_stock_movement", stream=arguments.get('stream'))
                 
                 response = {
                     "prediction": result,
@@ -129,7 +345,19 @@ class ChristmasGeminiMCP:
                 logger.error(f"Stock prediction error: {e}")
                 return [TextContent(type="text", text=f"오류 발생: {str(e)}")]
 
-        @self.server.call_tool()
+        async def batch_predict_stock_movement(arguments: dict) -> List[TextContent]:
+            """여러 종목 움직임 일괄 예측 (묶음당 Gemini 호출 1회)"""
+            try:
+                result = await self.predict_symbols_batch(
+                    arguments.get('symbols', []),
+                    arguments.get('indicators', {})
+                )
+                return [TextContent(type="text", text=json.dumps(result, indent=2, ensure_ascii=False))]
+                
+            except Exception as e:
+                logger.error(f"Batch prediction error: {e}")
+                return [TextContent(type="text", text=f"오류 발생: {str(e)}")]
+
         async def assess_investment_risk(arguments: dict) -> List[TextContent]:
             """투자 리스크 평가"""
             try:
@@ -154,7 +382,7 @@ class ChristmasGeminiMCP:
                 최종 리스크 등급과 개선 방안을 제시해주세요.
                 """
                 
-                result = await self.call_gemini_api(prompt)
+                result = await self.call_gemini_api(prompt, tool="assess_investment_risk", stream=arguments.get('stream'))
                 
                 response = {
                     "risk_assessment": result,
@@ -170,7 +398,6 @@ class ChristmasGeminiMCP:
                 logger.error(f"Risk assessment error: {e}")
                 return [TextContent(type="text", text=f"오류 발생: {str(e)}")]
 
-        @self.server.call_tool()
         async def optimize_trading_strategy(arguments: dict) -> List[TextContent]:
             """거래 전략 최적화"""
             try:
@@ -194,7 +421,7 @@ class ChristmasGeminiMCP:
                 최적화된 전략과 예상 성과를 제시해주세요.
                 """
                 
-                result = await self.call_gemini_api(prompt)
+                result = await self.call_gemini_api(prompt, tool="optimize_trading_strategy", stream=arguments.get('stream'))
                 
                 response = {
                     "optimized_strategy": result,
@@ -213,7 +440,6 @@ class ChristmasGeminiMCP:
                 logger.error(f"Strategy optimization error: {e}")
                 return [TextContent(type="text", text=f"오류 발생: {str(e)}")]
 
-        @self.server.call_tool()
         async def generate_trading_code(arguments: dict) -> List[TextContent]:
             """거래 코드 생성"""
             try:
@@ -238,7 +464,7 @@ class ChristmasGeminiMCP:
                 완전한 코드와 사용법을 제공해주세요.
                 """
                 
-                result = await self.call_gemini_api(prompt)
+                result = await self.call_gemini_api(prompt, tool="generate_trading_code", stream=arguments.get('stream'))
                 
                 response = {
                     "generated_code": result,
@@ -255,6 +481,128 @@ class ChristmasGeminiMCP:
                 logger.error(f"Code generation error: {e}")
                 return [TextContent(type="text", text=f"오류 발생: {str(e)}")]
 
+        # MCP 서버는 call_tool 핸들러를 하나만 유지하므로 도구 이름으로 분기
+        handlers = {
+            "analyze_market_data": analyze_market_data,
+            "predict_stock_movement": predict_stock_movement,
+            "batch_predict_stock_movement": batch_predict_stock_movement,
+            "assess_investment_risk": assess_investment_risk,
+            "optimize_trading_strategy": optimize_trading_strategy,
+            "generate_trading_code": generate_trading_code,
+        }
+
+        @self.server.list_tools()
+        async def list_tools() -> List[Tool]:
+            stream = {"type": "boolean", "description": "부분 응답을 진행 알림으로 전달"}
+            return [
+                Tool(
+                    name="analyze_market_data",
+                    description="시장 데이터 분석",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "market_data": {"type": "object", "description": "분석할 시장 데이터"},
+                            "analysis_type": {
+                                "type": "string",
+                                "enum": ["comprehensive", "technical", "fundamental"],
+                                "default": "comprehensive"
+                            },
+                            "stream": stream
+                        },
+                        "required": ["market_data"]
+                    }
+                ),
+                Tool(
+                    name="predict_stock_movement",
+                    description="주식 움직임 예측",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "symbol": {"type": "string", "description": "종목 심볼 (예: BTCUSDT)"},
+                            "indicators": {"type": "object", "description": "기술적 지표"},
+                            "stream": stream
+                        },
+                        "required": ["symbol"]
+                    }
+                ),
+                Tool(
+                    name="batch_predict_stock_movement",
+                    description="여러 종목 움직임 일괄 예측 (묶음당 Gemini 호출 1회)",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "symbols": {
+                                "type": "array",
+                                "description": "종목 심볼 목록 또는 {symbol, indicators} 객체 목록",
+                                "items": {
+                                    "anyOf": [
+                                        {"type": "string"},
+                                        {
+                                            "type": "object",
+                                            "properties": {
+                                                "symbol": {"type": "string"},
+                                                "indicators": {"type": "object"}
+                                            },
+                                            "required": ["symbol"]
+                                        }
+                                    ]
+                                },
+                                "minItems": 1
+                            },
+                            "indicators": {"type": "object", "description": "심볼별 기술적 지표 (symbol → 지표)"}
+                        },
+                        "required": ["symbols"]
+                    }
+                ),
+                Tool(
+                    name="assess_investment_risk",
+                    description="투자 리스크 평가",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "investment_plan": {"type": "object", "description": "투자 계획"},
+                            "market_conditions": {"type": "object", "description": "시장 상황"},
+                            "stream": stream
+                        },
+                        "required": ["investment_plan"]
+                    }
+                ),
+                Tool(
+                    name="optimize_trading_strategy",
+                    description="거래 전략 최적화",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "strategy": {"type": "object", "description": "현재 전략"},
+                            "performance": {"type": "object", "description": "성과 데이터"},
+                            "stream": stream
+                        },
+                        "required": ["strategy"]
+                    }
+                ),
+                Tool(
+                    name="generate_trading_code",
+                    description="거래 코드 생성",
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "requirements": {"type": "string", "description": "코드 요구사항"},
+                            "language": {"type": "string", "default": "TypeScript"},
+                            "framework": {"type": "string", "default": "React"},
+                            "stream": stream
+                        },
+                        "required": ["requirements"]
+                    }
+                ),
+            ]
+
+        @self.server.call_tool()
+        async def call_tool(name: str, arguments: dict) -> List[TextContent]:
+            handler = handlers.get(name)
+            if handler is None:
+                raise ValueError(f"Unknown tool: {name}")
+            return await handler(arguments or {})
+
     def setup_prompts(self):
         """MCP 프롬프트들 설정"""
         
@@ -332,43 +680,302 @@ class ChristmasGeminiMCP:
             else:
                 raise ValueError(f"Unknown prompt: {name}")
 
-    async def call_gemini_api(self, prompt: str, model: str = "gemini-1.5-flash") -> str:
-        """Gemini AI API 호출"""
+    def _get_session(self) -> aiohttp.ClientSession:
+        """공유 세션 (호출마다 DNS / TCP / TLS 연결을 새로 맺지 않음)"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=GEMINI_POOL_LIMIT,
+                limit_per_host=GEMINI_POOL_LIMIT,
+                keepalive_timeout=GEMINI_KEEPALIVE_SECONDS,
+                ttl_dns_cache=GEMINI_DNS_CACHE_SECONDS,
+                enable_cleanup_closed=True
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=GEMINI_TIMEOUT)
+            )
+        return self.session
+    
+    async def close(self):
+        """공유 세션 종료"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        for task in list(self.inflight.values()):
+            task.cancel()
+        if self.cache is not None:
+            self.cache.close()
+    
+    async def call_gemini_api(self, prompt: str, model: str = "gemini-1.5-flash",
+                              tool: Optional[str] = None, stream: Optional[bool] = None) -> str:
+        """Gemini AI API 호출 (실패 시 오류 문자열 반환)
+        
+        tool 이 주어지면 도구별 TTL로 응답 캐시, 같은 프롬프트의 동시 호출은 업스트림 요청 1건을 공유
+        stream 이면 streamGenerateContent 로 받아 부분 응답을 진행 알림으로 전달 (최종 결과는 동일하게 반환 / 캐시)
+        """
+        try:
+            return await self.generate(prompt, model, tool, stream)
+        except GeminiAPIError as e:
+            # 실패 응답은 캐시하지 않고 기존처럼 오류 문자열 반환
+            return str(e)
+    
+    async def generate(self, prompt: str, model: str = "gemini-1.5-flash",
+                       tool: Optional[str] = None, stream: Optional[bool] = None) -> str:
+        """call_gemini_api 와 같지만 실패 시 GeminiAPIError (배치 도구의 부분 실패 처리용)"""
         if not self.gemini_api_key:
-            return "Gemini API 키가 설정되지 않았습니다. GEMINI_API_KEY 환경변수를 설정해주세요."
-            
+            raise GeminiAPIError("Gemini API 키가 설정되지 않았습니다. GEMINI_API_KEY 환경변수를 설정해주세요.")
+        
+        key = GeminiResponseCache.key(model, prompt, GENERATION_CONFIG)
+        ttl = CACHE_TTLS.get(tool, 0) if tool and self.cache is not None else 0
+        if ttl > 0:
+            cached = self.cache.get(key)
+            if GEMINI_CACHE_LOOKUPS is not None:
+                GEMINI_CACHE_LOOKUPS.labels(tool, "miss" if cached is None else "hit").inc()
+            if cached is not None:
+                return cached
+        
+        stream = GEMINI_STREAMING if stream is None else bool(stream)
+        reporter = self._progress_reporter() if stream else None
+        
+        task = self.inflight.get(key)
+        if task is None:
+            self.partials[key] = []
+            self.listeners[key] = [reporter] if reporter else []
+            task = asyncio.create_task(self._fetch(key, prompt, model, ttl, stream))
+            self.inflight[key] = task
+            task.add_done_callback(lambda done: self._finish_flight(key, done))
+            self.upstream_calls += 1
+            result = "upstream"
+        else:
+            self.coalesced_calls += 1
+            result = "coalesced"
+            if reporter and key in self.listeners:
+                # 합류 시점까지 받은 부분 응답부터 전달
+                received = "".join(self.partials.get(key, []))
+                self.listeners[key].append(reporter)
+                if received:
+                    await self._notify(key, reporter, received)
+        if GEMINI_CALLS is not None:
+            GEMINI_CALLS.labels(result).inc()
+        
+        # 한 호출자가 취소되어도 공유 요청은 계속 진행
+        return await asyncio.shield(task)
+    
+    async def _fetch(self, key: str, prompt: str, model: str, ttl: float, stream: bool) -> str:
+        async with self.semaphore:
+            if stream:
+                text = await self._stream_generate_content(prompt, model, lambda chunk: self._publish_chunk(key, chunk))
+            else:
+                text = await self._post_generate_content(prompt, model)
+        if ttl > 0:
+            self.cache.put(key, model, text, ttl)
+        return text
+    
+    async def _publish_chunk(self, key: str, chunk: str):
+        self.partials.setdefault(key, []).append(chunk)
+        for reporter in list(self.listeners.get(key, [])):
+            await self._notify(key, reporter, chunk)
+    
+    async def _notify(self, key: str, reporter: Callable[[str], Awaitable[None]], text: str):
         try:
-            url = f"https://generativelanguage.googleapis.com/v1/models/{model}:generateContent"
-            headers = {
-                "Content-Type": "application/json",
-                "x-goog-api-key": self.gemini_api_key
-            }
-            
-            payload = {
-                "contents": [{
-                    "parts": [{"text": prompt}]
-                }],
-                "generationConfig": {
-                    "temperature": 0.7,
-                    "topK": 40,
-                    "topP": 0.95,
-                    "maxOutputTokens": 2048
-                }
-            }
+            await reporter(text)
+        except Exception as e:
+            # 연결이 끊긴 클라이언트는 이후 알림에서 제외 (요청 자체는 계속)
+            logger.debug(f"Progress notification failed: {e}")
+            if reporter in self.listeners.get(key, []):
+                self.listeners[key].remove(reporter)
+    
+    def _progress_reporter(self) -> Optional[Callable[[str], Awaitable[None]]]:
+        """현재 MCP 요청에 progressToken 이 있으면 부분 응답을 진행 알림으로 보내는 함수 반환"""
+        try:
+            ctx = self.server.request_context
+        except LookupError:
+            # MCP 요청 밖에서 호출 (벤치마크 등)
+            return None
+        token = ctx.meta.progressToken if ctx.meta else None
+        if token is None:
+            return None
+        
+        received = 0
+        
+        async def report(chunk: str):
+            nonlocal received
+            received += len(chunk)
+            try:
+                await ctx.session.send_progress_notification(token, received, message=chunk)
+            except TypeError:
+                # message 필드를 지원하지 않는 SDK - 수신 글자 수만 전달
+                await ctx.session.send_progress_notification(token, received)
+        
+        return report
+    
+    def _finish_flight(self, key: str, task: asyncio.Task):
+        if self.inflight.get(key) is task:
+            del self.inflight[key]
+            self.partials.pop(key, None)
+            self.listeners.pop(key, None)
+        if not task.cancelled():
+            # 기다리던 호출자가 모두 취소된 경우에도 예외 미확인 경고 방지
+            task.exception()
+    
+    def metrics(self) -> Dict[str, Any]:
+        total = self.upstream_calls + self.coalesced_calls
+        return {
+            "upstream_calls": self.upstream_calls,
+            "coalesced_calls": self.coalesced_calls,
+            "coalescing_ratio": round(self.coalesced_calls / total, 3) if total else 0.0,
+            "in_flight": len(self.inflight),
+            "cache": self.cache.metrics() if self.cache is not None else None,
+        }
+    
+    def _request(self, prompt: str) -> Tuple[Dict[str, str], Dict[str, Any]]:
+        headers = {
+            "Content-Type": "application/json",
+            "x-goog-api-key": self.gemini_api_key
+        }
+        payload = {
+            "contents": [{
+                "parts": [{"text": prompt}]
+            }],
+            "generationConfig": GENERATION_CONFIG
+        }
+        return headers, payload
+    
+    async def _post_generate_content(self, prompt: str, model: str) -> str:
+        started = time.monotonic()
+        outcome = "error"
+        try:
+            url = f"{GEMINI_API_BASE}/v1/models/{model}:generateContent"
+            headers, payload = self._request(prompt)
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(url, headers=headers, json=payload) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return result['candidates'][0]['content']['parts'][0]['text']
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"Gemini API 오류: {response.status} - {error_text}")
-                        return f"API 오류: {response.status}"
-                        
+            async with self._get_session().post(url, headers=headers, json=payload) as response:
+                outcome = str(response.status)
+                if response.status == 200:
+                    result = await response.json()
+                    return result['candidates'][0]['content']['parts'][0]['text']
+                else:
+                    error_text = await response.text()
+                    logger.error(f"Gemini API 오류: {response.status} - {error_text}")
+                    raise GeminiAPIError(f"API 오류: {response.status}")
+                    
+        except GeminiAPIError:
+            raise
         except Exception as e:
             logger.error(f"Gemini API 호출 실패: {str(e)}")
-            return f"API 호출 실패: {str(e)}"
+            raise GeminiAPIError(f"API 호출 실패: {str(e)}")
+        finally:
+            if GEMINI_REQUEST_SECONDS is not None:
+                GEMINI_REQUEST_SECONDS.labels(model, outcome).observe(time.monotonic() - started)
+    
+    async def _stream_generate_content(self, prompt: str, model: str,
+                                       on_chunk: Callable[[str], Awaitable[None]]) -> str:
+        """streamGenerateContent (SSE) - 청크마다 on_chunk 호출, 이어 붙인 전체 텍스트 반환"""
+        started = time.monotonic()
+        outcome = "error"
+        try:
+            url = f"{GEMINI_API_BASE}/v1/models/{model}:streamGenerateContent?alt=sse"
+            headers, payload = self._request(prompt)
+            
+            async with self._get_session().post(url, headers=headers, json=payload) as response:
+                outcome = str(response.status)
+                if response.status != 200:
+                    error_text = await response.text()
+                    logger.error(f"Gemini API 오류: {response.status} - {error_text}")
+                    raise GeminiAPIError(f"API 오류: {response.status}")
+                
+                chunks = []
+                async for raw_line in response.content:
+                    line = raw_line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    event = json.loads(line[5:])
+                    candidates = event.get('candidates') or [{}]
+                    text = "".join(part.get('text', '') for part in candidates[0].get('content', {}).get('parts', []))
+                    if not text:
+                        continue
+                    if not chunks and GEMINI_FIRST_CHUNK_SECONDS is not None:
+                        GEMINI_FIRST_CHUNK_SECONDS.labels(model).observe(time.monotonic() - started)
+                    chunks.append(text)
+                    await on_chunk(text)
+                return "".join(chunks)
+                
+        except GeminiAPIError:
+            raise
+        except Exception as e:
+            logger.error(f"Gemini API 스트리밍 실패: {str(e)}")
+            raise GeminiAPIError(f"API 호출 실패: {str(e)}")
+        finally:
+            if GEMINI_REQUEST_SECONDS is not None:
+                GEMINI_REQUEST_SECONDS.labels(model, outcome).observe(time.monotonic() - started)
+    
+    async def predict_symbols_batch(self, symbols: List[Any],
+                                    indicators: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """종목 목록을 크기 제한 묶음으로 나눠 동시 예측 (동시 요청 수는 공유 세마포어로 제한)
+        
+        symbols: ["BTCUSDT", ...] (지표는 indicators[symbol]) 또는 [{"symbol": ..., "indicators": {...}}, ...]
+        """
+        indicators = indicators or {}
+        entries: List[Dict[str, Any]] = []
+        seen = set()
+        for item in symbols:
+            symbol = str((item.get('symbol') if isinstance(item, dict) else item) or "").upper()
+            if not symbol or symbol in seen:
+                continue
+            seen.add(symbol)
+            entry_indicators = item.get('indicators') if isinstance(item, dict) else None
+            entries.append({"symbol": symbol, "indicators": entry_indicators or indicators.get(symbol, {})})
+        
+        chunks = chunk_symbols(entries, GEMINI_BATCH_MAX_SYMBOLS, GEMINI_BATCH_MAX_CHARS)
+        chunk_results = await asyncio.gather(*(self._predict_chunk(chunk) for chunk in chunks))
+        
+        results = [r for chunk_result in chunk_results for r in chunk_result]
+        succeeded = sum(1 for r in results if r['ok'])
+        return {
+            "results": results,
+            "symbols": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "gemini_calls": len(chunks),
+            "timestamp": datetime.now().isoformat(),
+            "validity_period": "1 hour"
+        }
+    
+    async def _predict_chunk(self, chunk: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        prompt = f"""
+                Christmas Trading AI를 위한 여러 종목의 움직임 예측을 수행해주세요.
+                
+                종목별 기술적 지표:
+                {json.dumps(chunk, indent=2, ensure_ascii=False)}
+                
+                각 종목마다 RSI, MACD, Stochastic RSI, 거래량 패턴, 지지/저항선을 고려해주세요.
+                
+                다른 설명 없이 아래 형식의 JSON만 출력해주세요 (입력한 모든 종목 포함):
+                {{"predictions": [{{"symbol": "종목", "direction": "UP|DOWN|SIDEWAYS", "confidence": 0-100,
+                "expected_move_percent": 숫자, "risk_level": "LOW|MEDIUM|HIGH", "action": "BUY|SELL|HOLD", "reason": "근거"}}]}}
+                """
+        
+        model = "gemini-1.5-flash"
+        try:
+            text = await self.generate(prompt, model, tool="batch_predict_stock_movement", stream=False)
+            try:
+                predictions = parse_batch_predictions(text)
+            except ValueError:
+                # 형식이 깨진 응답은 캐시에 남기지 않음 (다음 스캔에서 재요청)
+                if self.cache is not None:
+                    self.cache.discard(GeminiResponseCache.key(model, prompt, GENERATION_CONFIG))
+                raise
+        except (GeminiAPIError, ValueError) as e:
+            # 묶음 단위 실패 - 해당 종목만 실패로 표시, 나머지 묶음은 그대로 반환
+            return [{"symbol": entry['symbol'], "ok": False, "error": str(e)} for entry in chunk]
+        
+        results = []
+        for entry in chunk:
+            prediction = predictions.get(entry['symbol'])
+            if prediction is None:
+                results.append({"symbol": entry['symbol'], "ok": False, "error": "모델 출력에 종목 누락"})
+            else:
+                results.append({"symbol": entry['symbol'], "ok": True, "prediction": prediction})
+        return results
     
     def extract_recommendations(self, analysis_text: str) -> List[str]:
         """분석 결과에서 추천사항 추출"""
@@ -397,11 +1004,119 @@ async def main():
     # MCP 서버 인스턴스 생성
     mcp_server = ChristmasGeminiMCP()
     
+    if GEMINI_METRICS_PORT and Histogram is not None:
+        start_http_server(GEMINI_METRICS_PORT)
+        logger.info(f"📊 메트릭 엔드포인트: :{GEMINI_METRICS_PORT}/metrics")
+    
     # stdio를 통한 MCP 서버 실행
-    async with stdio_server() as (read_stream, write_stream):
-        await mcp_server.server_instance.run(
-            read_stream, write_stream, mcp_server.server_instance.create_initialization_options()
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await mcp_server.server_instance.run(
+                read_stream, write_stream, mcp_server.server_instance.create_initialization_options()
+            )
+    finally:
+        await mcp_server.close()
+
+async def benchmark(calls: int = 200, concurrency: int = 4, latency: float = 0.0) -> Dict[str, Any]:
+    """로컬 스텁 서버 대상 호출당 오버헤드 비교 (호출마다 새 세션 vs 공유 세션)"""
+    global GEMINI_API_BASE
+    from aiohttp import web
+    
+    async def generate_content(request: web.Request) -> web.StreamResponse:
+        await request.json()
+        if request.match_info["model"].endswith(":streamGenerateContent"):
+            # 생성 시간(latency)을 20개 청크로 나눠 SSE 전송
+            response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+            await response.prepare(request)
+            for i in range(20):
+                await asyncio.sleep(latency / 20)
+                chunk = {"candidates": [{"content": {"parts": [{"text": f"stub{i} "}]}}]}
+                await response.write(f"data: {json.dumps(chunk)}\r\n\r\n".encode("utf-8"))
+            await response.write_eof()
+            return response
+        if latency:
+            await asyncio.sleep(latency)
+        return web.json_response({"candidates": [{"content": {"parts": [{"text": "stub"}]}}]})
+    
+    app = web.Application()
+    app.router.add_post("/v1/models/{model}", generate_content)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    GEMINI_API_BASE = f"http://127.0.0.1:{port}"
+    
+    async def per_call_session(prompt: str) -> str:
+        # 변경 전 방식: 호출마다 세션 / 연결 생성
+        async with aiohttp.ClientSession() as session:
+            async with session.post(f"{GEMINI_API_BASE}/v1/models/stub:generateContent", json={"prompt": prompt}) as response:
+                return (await response.json())['candidates'][0]['content']['parts'][0]['text']
+    
+    mcp_server = ChristmasGeminiMCP()
+    mcp_server.gemini_api_key = mcp_server.gemini_api_key or "benchmark"
+    mcp_server.semaphore = asyncio.Semaphore(concurrency)
+    limiter = asyncio.Semaphore(concurrency)
+    
+    async def run(call) -> float:
+        async def one(i: int):
+            async with limiter:
+                await call(f"prompt {i}")
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(calls)))
+        return time.perf_counter() - started
+    
+    results = {}
+    try:
+        for label, call in (("per_call_session", per_call_session),
+                            ("shared_session", lambda prompt: mcp_server.call_gemini_api(prompt, "stub", stream=False))):
+            elapsed = await run(call)
+            results[label] = {
+                "elapsed": round(elapsed, 3),
+                "ms_per_call": round(elapsed / calls * 1000, 3),
+                "calls_per_second": round(calls / elapsed, 1),
+            }
+        
+        # 같은 프롬프트 동시 호출 → 업스트림 요청 1건으로 합쳐짐
+        upstream_before = mcp_server.upstream_calls
+        await asyncio.gather(*(mcp_server.call_gemini_api("identical prompt", "stub", stream=False) for _ in range(calls)))
+        results["identical_burst"] = {
+            "calls": calls,
+            "upstream_calls": mcp_server.upstream_calls - upstream_before,
+        }
+        
+        # 스트리밍: 첫 청크까지 시간 vs 전체 생성 시간
+        first_chunk_at = None
+        
+        async def on_chunk(chunk: str):
+            nonlocal first_chunk_at
+            if first_chunk_at is None:
+                first_chunk_at = time.perf_counter()
+        
+        started = time.perf_counter()
+        await mcp_server._stream_generate_content("streaming prompt", "stub", on_chunk)
+        results["streaming"] = {
+            "first_chunk_seconds": round((first_chunk_at or time.perf_counter()) - started, 3),
+            "total_seconds": round(time.perf_counter() - started, 3),
+        }
+        results["totals"] = mcp_server.metrics()
+    finally:
+        await mcp_server.close()
+        await runner.cleanup()
+    
+    return {"calls": calls, "concurrency": concurrency, **results}
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Christmas Trading Gemini MCP Server")
+    parser.add_argument("--benchmark", action="store_true", help="로컬 스텁 서버 대상 호출 오버헤드 측정")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.0, help="스텁 응답 생성 시간(초)")
+    args = parser.parse_args()
+    
+    if args.benchmark:
+        print(json.dumps(asyncio.run(benchmark(args.calls, args.concurrency, args.latency)), indent=2))
+    else:
+        asyncio.run(main())
\ No newline at end of file
@@ -12,13 +12,15 @@ JSON 파일 변화 감지 및 오케스트레이션 시스템
 """
 
 import os
-import json
+import gzip
+import hashlib
 import asyncio
 import logging
 import time
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Deque, Callable, Tuple
 from dataclasses import dataclass
 
 import httpx
@@ -28,6 +30,12 @@ from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 import redis.asyncio as aioredis
+from prometheus_client import Histogram, REGISTRY, start_http_server
+from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily
+
+from event_bus import EventBus
+from atomic_json import dumps, update_json, file_lock, atomic_write_bytes
+from codec import dumps_text, loads, CODEC_NAME
 
 # 환경 설정
 ENV = os.getenv("ENV", "development")
@@ -35,6 +43,30 @@ JSON_DATA_PATH = os.getenv("JSON_DATA_PATH", "/app/data")
 BACKEND_URL = os.getenv("BACKEND_URL", "http://christmas-backend:8080")
 WEBSOCKET_URL = os.getenv("WEBSOCKET_URL", "ws://christmas-backend:8080/ws")
 REDIS_URL = os.getenv("REDIS_URL", "redis://christmas-redis:6379")
+# 백엔드 HTTP 클라이언트 (keep-alive 커넥션 풀 공유)
+BACKEND_HTTP2 = os.getenv("BACKEND_HTTP2", "true").lower() == "true"
+BACKEND_MAX_CONNECTIONS = int(os.getenv("BACKEND_MAX_CONNECTIONS", "20"))
+BACKEND_MAX_KEEPALIVE = int(os.getenv("BACKEND_MAX_KEEPALIVE", "10"))
+BACKEND_TIMEOUT = float(os.getenv("BACKEND_TIMEOUT", "10.0"))
+BACKEND_ORDER_TIMEOUT = float(os.getenv("BACKEND_ORDER_TIMEOUT", "30.0"))
+SIGNAL_BATCH_SIZE = int(os.getenv("SIGNAL_BATCH_SIZE", "100"))
+# 서비스 간 이벤트 전달: file (JSON 파일 감시) / redis (Redis Streams 컨슈머 그룹)
+EVENT_TRANSPORT = os.getenv("EVENT_TRANSPORT", "file")
+EVENT_BUS_AUDIT = os.getenv("EVENT_BUS_AUDIT", "false").lower() == "true"
+EVENT_STREAM_MAXLEN = int(os.getenv("EVENT_STREAM_MAXLEN", "10000"))
+# Redis 로그 / 알림 배치 기록 (flush 주기 초, 대기 상한)
+REDIS_FLUSH_INTERVAL = float(os.getenv("REDIS_FLUSH_INTERVAL", "0.1"))
+REDIS_MAX_PENDING = int(os.getenv("REDIS_MAX_PENDING", "10000"))
+# 동시에 처리하는 파일 수 상한 (같은 파일은 항상 직렬 처리)
+FILE_WORKER_CONCURRENCY = int(os.getenv("FILE_WORKER_CONCURRENCY", "4"))
+# 백엔드와 공유하는 JSON 파일의 읽기-수정-쓰기 잠금 (<파일>.lock)
+JSON_FILE_LOCKING = os.getenv("JSON_FILE_LOCKING", "true").lower() == "true"
+# JSON 파일 보존 정책 (완료 레코드 보존 시간 / 라이브 파일 최대 레코드 수 / 아카이브 보존 일수, 0이면 무기한)
+JSON_RETENTION_HOURS = float(os.getenv("JSON_RETENTION_HOURS", "24"))
+JSON_RETENTION_MAX_RECORDS = int(os.getenv("JSON_RETENTION_MAX_RECORDS", "1000"))
+ARCHIVE_RETENTION_DAYS = int(os.getenv("ARCHIVE_RETENTION_DAYS", "0"))
+# Prometheus 메트릭 포트 (0이면 비활성)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "8090"))
 
 # 로깅 설정
 logging.basicConfig(
@@ -47,6 +79,27 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Prometheus 히스토그램 (카운터 / 게이지는 OrchestratorCollector가 스크레이프 시점에 수집)
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FILE_HANDLER_SECONDS = Histogram(
+    "christmas_orchestrator_file_handler_seconds",
+    "File change handler duration",
+    ["file"],
+    buckets=LATENCY_BUCKETS
+)
+FILE_EVENT_LATENCY_SECONDS = Histogram(
+    "christmas_orchestrator_file_event_latency_seconds",
+    "Delay from file write (mtime) to handler start",
+    ["file"],
+    buckets=LATENCY_BUCKETS
+)
+BACKEND_REQUEST_SECONDS = Histogram(
+    "christmas_orchestrator_backend_request_seconds",
+    "Orchestrator to backend HTTP request latency",
+    ["path", "outcome"],
+    buckets=LATENCY_BUCKETS
+)
+
 @dataclass
 class FileChangeEvent:
     """파일 변화 이벤트"""
@@ -54,38 +107,426 @@ class FileChangeEvent:
     event_type: str
     timestamp: datetime
     data: Optional[Dict[str, Any]] = None
+    # 최초 감지 시각 (time.time) 및 병합된 이벤트 수
+    observed_at: float = 0.0
+    coalesced: int = 0
 
-class JSONFileHandler(FileSystemEventHandler):
-    """JSON 파일 변화 감지 핸들러"""
+@dataclass
+class RetentionPolicy:
+    """파일별 보존 정책 (완료된 레코드만 아카이브 대상)"""
+    collection: str
+    is_done: Callable[[Dict[str, Any]], bool]
+    max_age_hours: float = JSON_RETENTION_HOURS
+    max_records: int = JSON_RETENTION_MAX_RECORDS
+
+RETENTION_POLICIES = {
+    "user_actions.json": RetentionPolicy("actions", lambda a: a.get('status') in ("processed", "rejected", "failed")),
+    "trading_signals.json": RetentionPolicy("signals", lambda s: bool(s.get('processed'))),
+    "ai_recommendations.json": RetentionPolicy("recommendations", lambda r: bool(r.get('processed'))),
+}
+
+def _record_time(record: Dict[str, Any]) -> Optional[datetime]:
+    """레코드 완료 / 생성 시각 (로컬 naive datetime)"""
+    for key in ("processed_at", "orchestrated_at", "timestamp"):
+        value = record.get(key)
+        if not value:
+            continue
+        try:
+            parsed = datetime.fromisoformat(str(value))
+        except ValueError:
+            continue
+        return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+    return None
+
+def select_expired(records: List[Dict[str, Any]], policy: RetentionPolicy,
+                   now: datetime) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """(유지, 아카이브) 분리 - 보존 시간 초과 완료 레코드 + 최대 개수 초과분(오래된 완료 레코드부터)"""
+    cutoff = now - timedelta(hours=policy.max_age_hours)
+    done = [i for i, record in enumerate(records) if policy.is_done(record)]
+    expired = set()
+    for i in done:
+        record_time = _record_time(records[i])
+        if record_time is not None and record_time < cutoff:
+            expired.add(i)
     
-    def __init__(self, orchestrator):
-        self.orchestrator = orchestrator
-        self.last_modified = {}
+    overflow = len(records) - len(expired) - policy.max_records
+    for i in done:
+        if overflow <= 0:
+            break
+        if i not in expired:
+            expired.add(i)
+            overflow -= 1
+    
+    keep = [r for i, r in enumerate(records) if i not in expired]
+    archive = [r for i, r in enumerate(records) if i in expired]
+    return keep, archive
+
+def append_archive(archive_root: Path, stem: str, records: List[Dict[str, Any]], now: datetime) -> int:
+    """날짜별 gzip JSONL 파티션에 추가 (archive/<stem>/<stem>-YYYY-MM-DD.jsonl.gz)"""
+    partitions: Dict[str, List[str]] = {}
+    for record in records:
+        day = (_record_time(record) or now).strftime("%Y-%m-%d")
+        partitions.setdefault(day, []).append(dumps_text(record))
+    
+    target_dir = archive_root / stem
+    target_dir.mkdir(parents=True, exist_ok=True)
+    for day, lines in partitions.items():
+        # gzip 멤버 단위 추가 - gzip.open으로 이어서 읽힘
+        with gzip.open(target_dir / f"{stem}-{day}.jsonl.gz", "ab") as f:
+            f.write(("\n".join(lines) + "\n").encode("utf-8"))
+    return len(records)
+
+def compact_json_file(path: Path, policy: RetentionPolicy, archive_root: Path,
+                      now: datetime) -> Dict[str, Any]:
+    """완료 레코드를 아카이브로 옮기고 라이브 파일을 원자적으로 교체 (잠금 안에서 임시 파일 → rename)"""
+    with file_lock(path, JSON_FILE_LOCKING):
+        return _compact_locked(path, policy, archive_root, now)
+
+def _compact_locked(path: Path, policy: RetentionPolicy, archive_root: Path,
+                    now: datetime) -> Dict[str, Any]:
+    started = time.perf_counter()
+    raw = path.read_bytes()
+    data = loads(raw)
+    result = {
+        "bytes": len(raw),
+        "parse_seconds": round(time.perf_counter() - started, 4),
+        "records": len(data.get(policy.collection, [])),
+        "archived": 0,
+    }
+    
+    keep, expired = select_expired(data.get(policy.collection, []), policy, now)
+    if not expired:
+        return result
+    
+    data[policy.collection] = keep
+    content = dumps(data)
+    # 아카이브를 먼저 기록 (중단 시 유실 대신 중복)
+    append_archive(archive_root, path.stem, expired, now)
+    atomic_write_bytes(path, content)
+    
+    result.update({
+        "archived": len(expired),
+        "records": len(keep),
+        "bytes": len(content),
+        "content": content,
+    })
+    return result
+
+def rotate_jsonl_archives(data_path: Path, archive_root: Path, now: datetime) -> int:
+    """백엔드가 추가하는 <stem>_archive.jsonl 을 날짜별 gzip 파티션으로 이동
+    
+    파티션은 레코드 자체 시각(_record_time) 기준, 시각이 없는 레코드만 now 날짜로 분류
+    """
+    rotated = 0
+    # 비정상 종료로 남은 회전 파일 먼저 처리 (새 회전 파일과 이름이 겹치지 않으므로 덮어쓰지 않음)
+    for leftover in sorted(data_path.glob("*_archive.jsonl*.rotating")):
+        rotated += _archive_rotating(leftover, archive_root, now)
+    
+    for jsonl_path in data_path.glob("*_archive.jsonl"):
+        rotating = jsonl_path.with_name(f"{jsonl_path.name}.{time.time_ns()}.rotating")
+        # 백엔드 추가와 같은 잠금 안에서 rename (진행 중인 추가가 끝난 뒤 이동, 다음 추가는 새 파일에 기록)
+        with file_lock(jsonl_path, JSON_FILE_LOCKING):
+            try:
+                os.replace(jsonl_path, rotating)
+            except FileNotFoundError:
+                continue
+        rotated += _archive_rotating(rotating, archive_root, now)
+    return rotated
+
+def _archive_rotating(rotating: Path, archive_root: Path, now: datetime) -> int:
+    """회전 파일 하나를 파티션에 추가 후 삭제"""
+    records = []
+    with open(rotating, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    records.append(loads(line))
+                except ValueError:
+                    logger.warning(f"⚠️ 손상된 아카이브 줄 건너뜀: {rotating.name}")
+    
+    stem = rotating.name.split("_archive.jsonl")[0]
+    archived = append_archive(archive_root, stem, records, now)
+    os.unlink(rotating)
+    return archived
+
+def prune_archives(archive_root: Path, retention_days: int, now: datetime) -> int:
+    """보존 기간이 지난 날짜 파티션 삭제"""
+    if retention_days <= 0 or not archive_root.exists():
+        return 0
+    cutoff = (now - timedelta(days=retention_days)).strftime("%Y-%m-%d")
+    pruned = 0
+    for partition in archive_root.glob("*/*.jsonl.gz"):
+        day = partition.name[-len("YYYY-MM-DD.jsonl.gz"):-len(".jsonl.gz")]
+        if day < cutoff:
+            partition.unlink()
+            pruned += 1
+    return pruned
+
+def _record_key(record: Dict[str, Any]):
+    """레코드 식별자 (id가 없는 신호는 심볼 + 생성 시각)"""
+    return record.get('id') or (record.get('symbol'), record.get('timestamp'))
+
+def merge_record_fields(collection: str, updates: Dict[Any, Dict[str, Any]]):
+    """최신 문서의 같은 레코드에 오케스트레이터가 바꾼 필드만 반영하는 update_json 변경 함수"""
+    def mutate(data: Dict[str, Any]) -> bool:
+        changed = False
+        for record in data.get(collection, []):
+            fields = updates.get(_record_key(record))
+            if fields:
+                record.update(fields)
+                changed = True
+        return changed
+    return mutate
+
+class FileEventQueue:
+    """파일 경로 기준 병합 이벤트 큐
+    
+    처리 대기 중인 경로에 이벤트가 다시 들어오면 새 항목을 만들지 않고 병합.
+    파일 내용은 처리 시점에 읽으므로 연속 쓰기도 한 번의 처리로 최신 내용을 봄.
+    """
+    
+    def __init__(self):
+        self._pending: Dict[str, FileChangeEvent] = {}
+        self._order: Deque[str] = deque()
+        self._available = asyncio.Event()
+        self.coalesced_total = 0
+    
+    def __len__(self) -> int:
+        return len(self._pending)
+    
+    def put(self, file_path: str, event_type: str, observed_at: float):
+        """이벤트 루프 스레드에서만 호출 (call_soon_threadsafe 경유)"""
+        pending = self._pending.get(file_path)
+        if pending is not None:
+            pending.coalesced += 1
+            self.coalesced_total += 1
+            return
         
-    def on_modified(self, event):
-        if event.is_directory:
+        self._pending[file_path] = FileChangeEvent(
+            file_path=file_path,
+            event_type=event_type,
+            timestamp=datetime.now(),
+            observed_at=observed_at
+        )
+        self._order.append(file_path)
+        self._available.set()
+    
+    async def get(self) -> FileChangeEvent:
+        while not self._order:
+            self._available.clear()
+            await self._available.wait()
+        return self._pending.pop(self._order.popleft())
+
+class LatencyStats:
+    """파일별 최근 지연 시간 (초)"""
+    
+    def __init__(self, size: int = 500):
+        self.size = size
+        self.samples: Dict[str, Deque[float]] = {}
+    
+    def add(self, key: str, value: float):
+        self.samples.setdefault(key, deque(maxlen=self.size)).append(value)
+    
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        result = {}
+        for key, samples in self.samples.items():
+            ordered = sorted(samples)
+            result[key] = {
+                "count": len(ordered),
+                "p50": round(ordered[len(ordered) // 2], 4),
+                "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+                "max": round(ordered[-1], 4)
+            }
+        return result
+
+class RedisBatchWriter:
+    """Redis 리스트 로그 배치 기록기
+    
+    lpush + ltrim을 이벤트마다 왕복하지 않고 모아 두었다가
+    짧은 주기로 MULTI 파이프라인 한 번에 기록 (키당 lpush 1회 + ltrim 1회)
+    """
+    
+    def __init__(self, flush_interval: float = 0.1, max_pending: int = 10000):
+        self.redis_client: Optional[aioredis.Redis] = None
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        
+        # (리스트 키, 직렬화된 값, 유지 개수)
+        self._pending: Deque[tuple] = deque()
+        self._task: Optional[asyncio.Task] = None
+        # 주기 flush 와 종료 flush 가 겹치지 않도록 직렬화
+        self._flush_lock = asyncio.Lock()
+        
+        self.written = 0
+        self.flushes = 0
+        self.dropped = 0
+        self.errors = 0
+    
+    def start(self, redis_client: aioredis.Redis):
+        self.redis_client = redis_client
+        self._task = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """남은 항목 기록 후 종료 (진행 중인 주기 flush 완료를 기다린 뒤 태스크 취소)"""
+        await self.flush()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        # 취소 직전 시작된 주기 flush 가 되돌려 놓은 항목
+        await self.flush()
+    
+    def push(self, key: str, value: Dict[str, Any], keep: int):
+        """대기열에 추가 (대기 상한 초과 시 가장 오래된 항목 버림)"""
+        if len(self._pending) >= self.max_pending:
+            self._pending.popleft()
+            self.dropped += 1
+        self._pending.append((key, dumps_text(value), keep))
+    
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+    
+    async def flush(self):
+        async with self._flush_lock:
+            await self._flush_locked()
+    
+    async def _flush_locked(self):
+        if not self._pending or not self.redis_client:
             return
-            
-        file_path = event.src_path
+        
+        batch = list(self._pending)
+        self._pending.clear()
+        
+        grouped: Dict[str, List[str]] = {}
+        keep: Dict[str, int] = {}
+        for key, value, limit in batch:
+            grouped.setdefault(key, []).append(value)
+            keep[key] = limit
+        
+        try:
+            async with self.redis_client.pipeline(transaction=True) as pipe:
+                for key, values in grouped.items():
+                    # 개별 lpush를 순서대로 한 것과 같은 결과 (마지막 값이 리스트 맨 앞)
+                    pipe.lpush(key, *values)
+                    pipe.ltrim(key, 0, keep[key] - 1)
+                await pipe.execute()
+            self.written += len(batch)
+            self.flushes += 1
+        except asyncio.CancelledError:
+            # 기록 도중 취소되면 대기열로 되돌린 뒤 전파 (stop 의 마지막 flush 에서 기록)
+            self._restore(batch)
+            raise
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"❌ Redis 배치 기록 오류: {e}")
+            # 다음 주기에 재시도 (상한 초과분은 버림)
+            self._restore(batch)
+    
+    def _restore(self, batch: List[tuple]):
+        """기록하지 못한 항목을 대기열 앞에 복원 (그 사이 추가된 항목 포함 상한 유지)"""
+        room = self.max_pending - len(self._pending)
+        retry = batch[-room:] if room > 0 else []
+        self.dropped += len(batch) - len(retry)
+        self._pending.extendleft(reversed(retry))
+    
+    def metrics(self) -> Dict[str, int]:
+        return {
+            "pending": len(self._pending),
+            "written": self.written,
+            "flushes": self.flushes,
+            "dropped": self.dropped,
+            "errors": self.errors
+        }
+
+class JSONFileHandler(FileSystemEventHandler):
+    """JSON 파일 변화 감지 핸들러
+    
+    watchdog 옵저버 스레드에서 호출되므로 이벤트 루프에는
+    call_soon_threadsafe로만 전달 (스레드에서 create_task 금지)
+    """
+    
+    def __init__(self, orchestrator, loop: asyncio.AbstractEventLoop):
+        self.orchestrator = orchestrator
+        self.loop = loop
+    
+    def _dispatch(self, file_path: str, event_type: str):
         if not file_path.endswith('.json'):
             return
-            
-        # 중복 이벤트 방지 (1초 이내 동일 파일)
-        current_time = time.time()
-        if file_path in self.last_modified:
-            if current_time - self.last_modified[file_path] < 1.0:
-                return
+        try:
+            self.loop.call_soon_threadsafe(
+                self.orchestrator.file_events.put, file_path, event_type, time.time()
+            )
+        except RuntimeError:
+            # 종료 중 (이벤트 루프 닫힘)
+            pass
+    
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._dispatch(event.src_path, "modified")
+    
+    def on_created(self, event):
+        if not event.is_directory:
+            self._dispatch(event.src_path, "created")
+    
+    def on_moved(self, event):
+        # 임시 파일 → 대상 파일 rename 방식 저장
+        if not event.is_directory:
+            self._dispatch(event.dest_path, "modified")
+
+class OrchestratorCollector:
+    """오케스트레이터 내부 카운터 / 큐 깊이를 스크레이프 시점에 수집"""
+    
+    def __init__(self, orchestrator):
+        self.orchestrator = orchestrator
+    
+    def collect(self):
+        o = self.orchestrator
         
-        self.last_modified[file_path] = current_time
+        yield GaugeMetricFamily("christmas_orchestrator_file_queue_depth", "File events waiting or marked dirty",
+                                value=len(o.file_events) + len(o.dirty_files))
+        yield GaugeMetricFamily("christmas_orchestrator_file_workers_active", "Per-file workers running",
+                                value=len(o.file_workers))
+        yield CounterMetricFamily("christmas_orchestrator_file_events_coalesced", "File events merged into a pending event",
+                                  value=o.file_events.coalesced_total)
+        yield CounterMetricFamily("christmas_orchestrator_file_reruns", "Handler reruns caused by writes during processing",
+                                  value=o.file_reruns)
         
-        # 이벤트 큐에 추가
-        change_event = FileChangeEvent(
-            file_path=file_path,
-            event_type="modified",
-            timestamp=datetime.now()
-        )
+        files = CounterMetricFamily("christmas_orchestrator_file_reads", "File change outcomes", labels=["outcome"])
+        for outcome in ("parsed", "unchanged_skipped", "self_writes_ignored"):
+            files.add_metric([outcome], o.file_stats[outcome])
+        yield files
+        writes = CounterMetricFamily("christmas_orchestrator_file_writes", "JSON writes by outcome", labels=["outcome"])
+        writes.add_metric(["written"], o.file_stats["writes"])
+        writes.add_metric(["skipped"], o.file_stats["writes_skipped"])
+        yield writes
+        
+        redis_writer = o.redis_writer.metrics()
+        yield GaugeMetricFamily("christmas_orchestrator_redis_pending", "Log entries waiting for the next Redis flush",
+                                value=redis_writer["pending"])
+        redis_entries = CounterMetricFamily("christmas_orchestrator_redis_entries", "Redis log entries", labels=["outcome"])
+        redis_entries.add_metric(["written"], redis_writer["written"])
+        redis_entries.add_metric(["dropped"], redis_writer["dropped"])
+        yield redis_entries
+        yield CounterMetricFamily("christmas_orchestrator_redis_flush_errors", "Failed Redis flushes (retried)",
+                                  value=redis_writer["errors"])
+        
+        archive = CounterMetricFamily("christmas_orchestrator_archived_records", "Records moved to gzip archives", labels=["source"])
+        archive.add_metric(["live_file"], o.cleanup_stats["archived_records"])
+        archive.add_metric(["backend_jsonl"], o.cleanup_stats["rotated_records"])
+        yield archive
+        live_bytes = GaugeMetricFamily("christmas_orchestrator_live_file_bytes", "Live JSON file size after the last cleanup", labels=["file"])
+        for filename, stats in list(o.cleanup_stats["live_files"].items()):
+            live_bytes.add_metric([filename], stats["bytes"])
+        yield live_bytes
         
-        asyncio.create_task(self.orchestrator.handle_file_change(change_event))
+        if o.event_bus:
+            events = CounterMetricFamily("christmas_orchestrator_event_bus_messages", "Event bus messages by stage", labels=["stage"])
+            for stage in ("published", "delivered", "acked", "failed", "claimed", "dead_lettered"):
+                events.add_metric([stage], getattr(o.event_bus, stage))
+            yield events
 
 class ChristmasOrchestrator:
     """크리스마스 트레이딩 오케스트레이션 시스템"""
@@ -95,14 +536,50 @@ class ChristmasOrchestrator:
         self.data_path.mkdir(exist_ok=True)
         
         self.redis_client: Optional[aioredis.Redis] = None
+        self.http: Optional[httpx.AsyncClient] = None
+        self.event_bus: Optional[EventBus] = None
+        # 이벤트 로그 / 가격 알림 Redis 배치 기록
+        self.redis_writer = RedisBatchWriter(REDIS_FLUSH_INTERVAL, REDIS_MAX_PENDING)
         self.websocket: Optional[websockets.WebSocketServerProtocol] = None
         self.scheduler = AsyncIOScheduler()
         
         self.observers = []
         self.running = False
         
-        # 처리 중인 파일 추적 (중복 처리 방지)
-        self.processing_files = set()
+        # 감시 스레드 → 이벤트 루프 브리지 (경로 기준 병합)
+        self.file_events = FileEventQueue()
+        self.file_event_task: Optional[asyncio.Task] = None
+        # 파일별 직렬 워커 + 전체 동시 처리 상한
+        self.file_workers: Dict[str, asyncio.Task] = {}
+        self.file_semaphore = asyncio.Semaphore(FILE_WORKER_CONCURRENCY)
+        # 처리 중 다시 변경된 파일 (경로 → 최신 이벤트), 현재 처리 후 재실행
+        self.dirty_files: Dict[str, FileChangeEvent] = {}
+        self.file_reruns = 0
+        # 파일 쓰기(mtime) → 처리 시작까지 지연 / 핸들러 실행 시간
+        self.file_latency = LatencyStats()
+        self.handler_duration = LatencyStats()
+        
+        # 내용 해시 기반 변경 감지 (경로 → 마지막으로 읽거나 쓴 내용의 해시)
+        self.file_hashes: Dict[str, str] = {}
+        # 오케스트레이터 자신이 쓴 내용의 해시 (자기 쓰기 이벤트 무시)
+        self.self_written: Dict[str, str] = {}
+        # 보존 / 컴팩션 통계
+        self.archive_path = self.data_path / "archive"
+        self.cleanup_stats: Dict[str, Any] = {
+            "runs": 0,
+            "archived_records": 0,
+            "rotated_records": 0,
+            "pruned_partitions": 0,
+            "last_run_seconds": 0.0,
+            "live_files": {}
+        }
+        self.file_stats = {
+            "parsed": 0,
+            "unchanged_skipped": 0,
+            "self_writes_ignored": 0,
+            "writes": 0,
+            "writes_skipped": 0
+        }
         
     async def start(self):
         """오케스트레이터 시작"""
@@ -110,16 +587,30 @@ class ChristmasOrchestrator:
         
         # Redis 연결
         await self._connect_redis()
+        if self.redis_client:
+            self.redis_writer.start(self.redis_client)
+        
+        # 백엔드 HTTP 클라이언트
+        self._create_http_client()
         
         # WebSocket 연결
         await self._connect_websocket()
         
-        # 파일 감시 시작
-        self._start_file_watching()
+        # 이벤트 버스 사용 시 JSON 파일은 감사 기록용 (감시하지 않음)
+        if EVENT_TRANSPORT == "redis":
+            await self._start_event_bus()
+        
+        if not self.event_bus:
+            # 파일 감시 시작
+            self._start_file_watching()
+            self.file_event_task = asyncio.create_task(self._file_event_loop())
         
         # 스케줄된 작업 시작
         self._start_scheduled_tasks()
         
+        # Prometheus 메트릭 엔드포인트
+        self._start_metrics_server()
+        
         self.running = True
         logger.info("🚀 Orchestrator 시작 완료!")
         
@@ -137,16 +628,30 @@ class ChristmasOrchestrator:
             observer.stop()
             observer.join()
         
+        if self.file_event_task:
+            self.file_event_task.cancel()
+        for worker in list(self.file_workers.values()):
+            worker.cancel()
+        
         # 스케줄러 정지
         self.scheduler.shutdown()
         
+        if self.event_bus:
+            await self.event_bus.stop()
+        
         # 연결 종료
         if self.websocket:
             await self.websocket.close()
         
+        # 대기 중인 로그 기록 후 연결 종료
+        await self.redis_writer.stop()
+        
         if self.redis_client:
             await self.redis_client.close()
         
+        if self.http:
+            await self.http.aclose()
+        
         logger.info("✅ Orchestrator 정지 완료")
     
     async def _connect_redis(self):
@@ -157,6 +662,93 @@ class ChristmasOrchestrator:
             logger.info("✅ Redis 연결 성공")
         except Exception as e:
             logger.error(f"❌ Redis 연결 실패: {e}")
+            self.redis_client = None
+    
+    async def _start_event_bus(self):
+        """Redis Streams 컨슈머 그룹 구독 시작"""
+        if not self.redis_client:
+            logger.warning("⚠️ Redis 미연결 - 파일 감시 방식 사용")
+            return
+        
+        try:
+            bus = EventBus(
+                self.redis_client,
+                source="orchestrator",
+                maxlen=EVENT_STREAM_MAXLEN,
+                audit_dir=str(self.data_path / "audit") if EVENT_BUS_AUDIT else None
+            )
+            bus.subscribe("signals", self._on_signals_event)
+            bus.subscribe("market_data", self._on_market_data_event)
+            bus.subscribe("user_actions", self._on_user_action_event)
+            bus.subscribe("ai_recommendations", self._on_ai_recommendations_event)
+            await bus.start()
+            self.event_bus = bus
+            logger.info("✅ Event bus 구독 시작 (Redis Streams)")
+        except Exception as e:
+            logger.error(f"❌ Event bus 시작 실패: {e}")
+    
+    async def _on_signals_event(self, event: Dict[str, Any], message_id: str):
+        await self._process_trading_signals(event['data'], persist=False)
+    
+    async def _on_market_data_event(self, event: Dict[str, Any], message_id: str):
+        await self._process_market_data(event['data'])
+    
+    async def _on_ai_recommendations_event(self, event: Dict[str, Any], message_id: str):
+        await self._process_ai_recommendations(event['data'], persist=False)
+    
+    async def _on_user_action_event(self, event: Dict[str, Any], message_id: str):
+        """새 액션 리스크 체크 후 결과(거부 등)를 같은 스트림으로 발행"""
+        if event['type'] != "created":
+            return
+        
+        action = event['data']
+        updates = await self._process_user_actions({"actions": [action]}, persist=False)
+        fields = updates.get(_record_key(action))
+        if fields:
+            # 변경한 필드만 발행 (전체 레코드를 다시 보내면 수신 측이 새 액션으로 오인할 수 있음)
+            await self.event_bus.publish("user_actions", "updated", {"id": action.get('id'), **fields})
+    
+    def _start_metrics_server(self):
+        """Prometheus 텍스트 형식 메트릭 HTTP 서버 (/metrics)"""
+        if not METRICS_PORT:
+            return
+        try:
+            REGISTRY.register(OrchestratorCollector(self))
+            start_http_server(METRICS_PORT)
+            logger.info(f"📊 메트릭 엔드포인트: :{METRICS_PORT}/metrics")
+        except Exception as e:
+            logger.error(f"❌ 메트릭 서버 시작 실패: {e}")
+    
+    async def _backend_request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """백엔드 요청 (지연 시간 히스토그램 기록)"""
+        started = time.monotonic()
+        outcome = "error"
+        try:
+            response = await self.http.request(method, path, **kwargs)
+            outcome = str(response.status_code)
+            return response
+        finally:
+            BACKEND_REQUEST_SECONDS.labels(path, outcome).observe(time.monotonic() - started)
+    
+    def _create_http_client(self):
+        """백엔드 공용 HTTP 클라이언트 생성 (HTTP/2는 백엔드가 지원할 때만 협상됨)"""
+        http2 = BACKEND_HTTP2
+        if http2:
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                logger.warning("⚠️ h2 패키지 없음 - HTTP/1.1 사용")
+                http2 = False
+        
+        self.http = httpx.AsyncClient(
+            base_url=BACKEND_URL,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=BACKEND_MAX_CONNECTIONS,
+                max_keepalive_connections=BACKEND_MAX_KEEPALIVE
+            ),
+            timeout=BACKEND_TIMEOUT
+        )
     
     async def _connect_websocket(self):
         """WebSocket 연결"""
@@ -178,10 +770,12 @@ class ChristmasOrchestrator:
                 self.data_path,
             ]
             
+            loop = asyncio.get_running_loop()
+            
             for watch_dir in watch_dirs:
                 if watch_dir.exists():
                     observer = Observer()
-                    handler = JSONFileHandler(self)
+                    handler = JSONFileHandler(self, loop)
                     observer.schedule(handler, str(watch_dir), recursive=True)
                     observer.start()
                     self.observers.append(observer)
@@ -224,19 +818,65 @@ class ChristmasOrchestrator:
         except Exception as e:
             logger.error(f"❌ 스케줄러 시작 실패: {e}")
     
+    async def _file_event_loop(self):
+        """병합된 파일 이벤트를 파일별 워커에 배분
+        
+        처리 중인 파일에 다시 이벤트가 오면 dirty로 표시만 하고,
+        워커가 현재 처리를 마친 뒤 최신 내용으로 한 번 더 실행
+        """
+        while True:
+            event = await self.file_events.get()
+            path = event.file_path
+            
+            if path in self.file_workers:
+                previous = self.dirty_files.get(path)
+                if previous is not None:
+                    event.coalesced += previous.coalesced + 1
+                    event.observed_at = previous.observed_at
+                self.dirty_files[path] = event
+                continue
+            
+            self.file_workers[path] = asyncio.create_task(self._file_worker(event))
+    
+    async def _file_worker(self, event: FileChangeEvent):
+        """파일 하나를 전담하는 직렬 워커 (dirty 표시가 남아 있는 동안 반복)"""
+        path = event.file_path
+        try:
+            while True:
+                async with self.file_semaphore:
+                    started = time.monotonic()
+                    await self.handle_file_change(event)
+                    elapsed = time.monotonic() - started
+                    self.handler_duration.add(Path(path).name, elapsed)
+                    FILE_HANDLER_SECONDS.labels(Path(path).name).observe(elapsed)
+                
+                event = self.dirty_files.pop(path, None)
+                if event is None:
+                    break
+                self.file_reruns += 1
+        finally:
+            self.file_workers.pop(path, None)
+    
+    def _record_file_latency(self, event: FileChangeEvent):
+        filename = Path(event.file_path).name
+        try:
+            written_at = os.stat(event.file_path).st_mtime
+        except OSError:
+            written_at = event.observed_at
+        latency = max(0.0, time.time() - written_at)
+        self.file_latency.add(filename, latency)
+        FILE_EVENT_LATENCY_SECONDS.labels(filename).observe(latency)
+    
     async def handle_file_change(self, event: FileChangeEvent):
         """파일 변화 처리"""
         try:
-            # 중복 처리 방지
-            if event.file_path in self.processing_files:
-                return
-            
-            self.processing_files.add(event.file_path)
+            # 같은 파일은 _file_worker가 직렬 처리
+            self._record_file_latency(event)
             
-            logger.info(f"📄 파일 변화 감지: {event.file_path}")
+            logger.info(f"📄 파일 변화 감지: {event.file_path} (병합 {event.coalesced}건)")
             
-            # JSON 파일 로드 및 검증
-            data = await self._load_json_file(event.file_path)
+            # 내용이 실제로 바뀐 경우에만 파싱 (자기 쓰기 / 동일 내용 재저장 무시)
+            data = await self._load_changed_json_file(event.file_path)
             if not data:
                 return
             
@@ -254,32 +894,52 @@ class ChristmasOrchestrator:
             elif filename == "ai_recommendations.json":
                 await self._process_ai_recommendations(data)
             
-            # Redis에 이벤트 기록
-            await self._log_event_to_redis(event)
+            # Redis에 이벤트 기록 (배치 기록기에 위임 - 대기하지 않음)
+            self._log_event_to_redis(event)
             
             # WebSocket으로 알림
             await self._notify_via_websocket(event)
             
         except Exception as e:
             logger.error(f"❌ 파일 변화 처리 오류: {e}")
-        finally:
-            # 처리 완료 후 제거
-            self.processing_files.discard(event.file_path)
     
-    async def _load_json_file(self, file_path: str) -> Optional[Dict[str, Any]]:
-        """JSON 파일 로드"""
+    @staticmethod
+    def _content_hash(content: bytes) -> str:
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+    
+    async def _load_changed_json_file(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """직전에 본 내용과 바이트가 다를 때만 JSON 로드"""
         try:
-            async with aiofiles.open(file_path, 'r', encoding='utf-8') as f:
+            async with aiofiles.open(file_path, 'rb') as f:
                 content = await f.read()
-                return json.loads(content)
         except Exception as e:
             logger.error(f"❌ JSON 파일 로드 실패 {file_path}: {e}")
             return None
+        
+        content_hash = self._content_hash(content)
+        if self.file_hashes.get(file_path) == content_hash:
+            if self.self_written.get(file_path) == content_hash:
+                self.file_stats["self_writes_ignored"] += 1
+            else:
+                self.file_stats["unchanged_skipped"] += 1
+            return None
+        
+        try:
+            data = loads(content)
+        except Exception as e:
+            logger.error(f"❌ JSON 파일 로드 실패 {file_path}: {e}")
+            return None
+        
+        self.file_hashes[file_path] = content_hash
+        self.file_stats["parsed"] += 1
+        return data
     
-    async def _process_trading_signals(self, data: Dict[str, Any]):
+    async def _process_trading_signals(self, data: Dict[str, Any], persist: bool = True):
         """트레이딩 신호 처리"""
         try:
             signals = data.get('signals', [])
+            updates = {}
+            outgoing = []
             
             for signal in signals:
                 if signal.get('processed'):
@@ -293,15 +953,20 @@ class ChristmasOrchestrator:
                 
                 # 신뢰도가 높은 신호만 처리
                 if confidence > 0.7:
-                    # 백엔드 API로 신호 전송
-                    await self._send_signal_to_backend(signal)
+                    outgoing.append(signal)
                 
                 # 처리 완료 표시
-                signal['processed'] = True
-                signal['processed_at'] = datetime.now().isoformat()
+                fields = {'processed': True, 'processed_at': datetime.now().isoformat()}
+                signal.update(fields)
+                updates[_record_key(signal)] = fields
+            
+            # 백엔드 API로 신호 일괄 전송
+            if outgoing:
+                await self._send_signals_to_backend(outgoing)
             
-            # 처리된 데이터 다시 저장
-            await self._save_json_file("trading_signals.json", data)
+            # 새로 처리한 신호가 있을 때만 최신 파일에 반영
+            if updates and persist:
+                await self._update_json_file("trading_signals.json", merge_record_fields("signals", updates))
             
         except Exception as e:
             logger.error(f"❌ 트레이딩 신호 처리 오류: {e}")
@@ -326,15 +991,16 @@ class ChristmasOrchestrator:
                     }
                     
                     # Redis에 알림 저장
-                    await self._store_alert(alert_data)
+                    self._store_alert(alert_data)
                     
                     logger.warning(f"⚠️ 급격한 가격 변동: {symbol} {price_change:+.2f}%")
             
         except Exception as e:
             logger.error(f"❌ 시장 데이터 처리 오류: {e}")
     
-    async def _process_user_actions(self, data: Dict[str, Any]):
-        """사용자 액션 처리"""
+    async def _process_user_actions(self, data: Dict[str, Any], persist: bool = True) -> Dict[Any, Dict[str, Any]]:
+        """사용자 액션 처리 (레코드 키 → 변경 필드 반환)"""
+        updates = {}
         try:
             actions = data.get('actions', [])
             
@@ -346,6 +1012,7 @@ class ChristmasOrchestrator:
                 action_id = action.get('id')
                 
                 logger.info(f"👤 사용자 액션 처리: {action_id} - {action_type}")
+                fields = {}
                 
                 # 액션 타입별 오케스트레이션
                 if action_type in ['buy_order', 'sell_order']:
@@ -355,25 +1022,32 @@ class ChristmasOrchestrator:
                     if risk_result['safe']:
                         # 주문 실행 명령
                         await self._execute_order_command(action)
+                        if 'execution_result' in action:
+                            fields['execution_result'] = action['execution_result']
                     else:
                         # 위험한 주문 - 거부
-                        action['status'] = 'rejected'
-                        action['rejection_reason'] = risk_result['reason']
+                        fields['status'] = 'rejected'
+                        fields['rejection_reason'] = risk_result['reason']
                 
                 # 오케스트레이션 완료 표시
-                action['orchestrated'] = True
-                action['orchestrated_at'] = datetime.now().isoformat()
+                fields['orchestrated'] = True
+                fields['orchestrated_at'] = datetime.now().isoformat()
+                action.update(fields)
+                updates[_record_key(action)] = fields
             
-            # 처리된 데이터 다시 저장
-            await self._save_json_file("user_actions.json", data)
+            # 새로 처리한 액션이 있을 때만 최신 파일에 반영 (그 사이 백엔드가 바꾼 상태는 유지)
+            if updates and persist:
+                await self._update_json_file("user_actions.json", merge_record_fields("actions", updates))
             
         except Exception as e:
             logger.error(f"❌ 사용자 액션 처리 오류: {e}")
+        return updates
     
-    async def _process_ai_recommendations(self, data: Dict[str, Any]):
+    async def _process_ai_recommendations(self, data: Dict[str, Any], persist: bool = True):
         """AI 추천 처리"""
         try:
             recommendations = data.get('recommendations', [])
+            updates = {}
             
             for rec in recommendations:
                 if rec.get('processed'):
@@ -391,39 +1065,68 @@ class ChristmasOrchestrator:
                     if rec.get('auto_execute', False):
                         await self._execute_ai_recommendation(rec)
                 
-                rec['processed'] = True
-                rec['processed_at'] = datetime.now().isoformat()
+                fields = {'processed': True, 'processed_at': datetime.now().isoformat()}
+                rec.update(fields)
+                updates[_record_key(rec)] = fields
             
-            # 처리된 데이터 다시 저장
-            await self._save_json_file("ai_recommendations.json", data)
+            # 새로 처리한 추천이 있을 때만 최신 파일에 반영
+            if updates and persist:
+                await self._update_json_file("ai_recommendations.json", merge_record_fields("recommendations", updates))
             
         except Exception as e:
             logger.error(f"❌ AI 추천 처리 오류: {e}")
     
-    async def _save_json_file(self, filename: str, data: Dict[str, Any]):
-        """JSON 파일 저장"""
+    async def _update_json_file(self, filename: str, mutate: Callable[[Dict[str, Any]], Optional[bool]],
+                                fence: bool = True):
+        """잠금 안에서 최신 파일을 다시 읽어 변경 적용 (백엔드의 동시 추가 / 갱신 유실 방지)
+        
+        mutate가 False를 반환하면 쓰지 않음 (반영할 레코드가 이미 사라진 경우 등)
+        """
         try:
             file_path = self.data_path / filename
-            async with aiofiles.open(file_path, 'w', encoding='utf-8') as f:
-                await f.write(json.dumps(data, indent=2, ensure_ascii=False, default=str))
+            content = await asyncio.to_thread(update_json, file_path, mutate, JSON_FILE_LOCKING)
+            if content is None:
+                self.file_stats["writes_skipped"] += 1
+                return
+            
+            # 기록 후 해시 등록 - 그 사이 먼저 도착한 감시 이벤트는 이미 처리된 레코드만 보게 됨
+            if fence:
+                content_hash = self._content_hash(content)
+                self.file_hashes[str(file_path)] = content_hash
+                self.self_written[str(file_path)] = content_hash
+            self.file_stats["writes"] += 1
         except Exception as e:
-            logger.error(f"❌ JSON 파일 저장 실패 {filename}: {e}")
+            logger.error(f"❌ JSON 파일 갱신 실패 {filename}: {e}")
     
-    async def _send_signal_to_backend(self, signal: Dict[str, Any]):
-        """백엔드로 신호 전송"""
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{BACKEND_URL}/api/trading-signal",
-                    json=signal,
-                    timeout=10.0
-                )
+    async def _send_signals_to_backend(self, signals: List[Dict[str, Any]]):
+        """백엔드로 신호 일괄 전송 (SIGNAL_BATCH_SIZE 단위 요청)"""
+        for start in range(0, len(signals), SIGNAL_BATCH_SIZE):
+            batch = signals[start:start + SIGNAL_BATCH_SIZE]
+            try:
+                response = await self._backend_request("POST", "/api/trading-signals/batch", json={"signals": batch})
                 
                 if response.status_code == 200:
-                    logger.info(f"✅ 신호 전송 성공: {signal.get('symbol')}")
+                    logger.info(f"✅ 신호 전송 성공: {len(batch)}건")
+                elif response.status_code == 404:
+                    # 일괄 엔드포인트가 없는 백엔드 → 개별 전송
+                    for signal in batch:
+                        await self._send_signal_to_backend(signal)
                 else:
                     logger.error(f"❌ 신호 전송 실패: {response.status_code}")
                     
+            except Exception as e:
+                logger.error(f"❌ 신호 전송 오류: {e}")
+    
+    async def _send_signal_to_backend(self, signal: Dict[str, Any]):
+        """백엔드로 신호 전송"""
+        try:
+            response = await self._backend_request("POST", "/api/trading-signal", json=signal)
+            
+            if response.status_code == 200:
+                logger.info(f"✅ 신호 전송 성공: {signal.get('symbol')}")
+            else:
+                logger.error(f"❌ 신호 전송 실패: {response.status_code}")
+                
         except Exception as e:
             logger.error(f"❌ 신호 전송 오류: {e}")
     
@@ -454,19 +1157,19 @@ class ChristmasOrchestrator:
         """주문 실행 명령"""
         try:
             # 백엔드로 주문 실행 요청
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{BACKEND_URL}/api/execute-order",
-                    json=action,
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    result = response.json()
-                    action['execution_result'] = result
-                    logger.info(f"✅ 주문 실행 성공: {action.get('id')}")
-                else:
-                    logger.error(f"❌ 주문 실행 실패: {response.status_code}")
+            response = await self._backend_request(
+                "POST",
+                "/api/execute-order",
+                json=action,
+                timeout=BACKEND_ORDER_TIMEOUT
+            )
+            
+            if response.status_code == 200:
+                result = response.json()
+                action['execution_result'] = result
+                logger.info(f"✅ 주문 실행 성공: {action.get('id')}")
+            else:
+                logger.error(f"❌ 주문 실행 실패: {response.status_code}")
                     
         except Exception as e:
             logger.error(f"❌ 주문 실행 오류: {e}")
@@ -495,52 +1198,35 @@ class ChristmasOrchestrator:
     async def _add_user_action(self, action: Dict[str, Any]):
         """사용자 액션 추가"""
         try:
-            user_actions = await self._load_json_file(str(self.data_path / "user_actions.json"))
-            if not user_actions:
-                user_actions = {"actions": [], "timestamp": datetime.now().isoformat()}
-            
             action['id'] = f"action_{datetime.now().timestamp()}"
-            user_actions['actions'].append(action)
-            user_actions['timestamp'] = datetime.now().isoformat()
             
-            await self._save_json_file("user_actions.json", user_actions)
+            if self.event_bus:
+                # 백엔드(실행)와 오케스트레이터(리스크 체크) 그룹이 각각 수신
+                await self.event_bus.publish("user_actions", "created", action)
+                return
+            
+            def append(user_actions: Dict[str, Any]):
+                user_actions.setdefault('actions', []).append(action)
+                user_actions['timestamp'] = datetime.now().isoformat()
+            
+            # 추가된 액션도 리스크 체크를 거치도록 감시 이벤트로 처리
+            await self._update_json_file("user_actions.json", append, fence=False)
             
         except Exception as e:
             logger.error(f"❌ 사용자 액션 추가 오류: {e}")
     
-    async def _store_alert(self, alert_data: Dict[str, Any]):
-        """알림 저장"""
-        try:
-            if self.redis_client:
-                await self.redis_client.lpush(
-                    "price_alerts",
-                    json.dumps(alert_data, default=str)
-                )
-                # 최대 100개 알림만 유지
-                await self.redis_client.ltrim("price_alerts", 0, 99)
-                
-        except Exception as e:
-            logger.error(f"❌ 알림 저장 오류: {e}")
+    def _store_alert(self, alert_data: Dict[str, Any]):
+        """알림 저장 (최대 100개 알림만 유지)"""
+        self.redis_writer.push("price_alerts", alert_data, keep=100)
     
-    async def _log_event_to_redis(self, event: FileChangeEvent):
-        """Redis에 이벤트 로그"""
-        try:
-            if self.redis_client:
-                event_data = {
-                    "file_path": event.file_path,
-                    "event_type": event.event_type,
-                    "timestamp": event.timestamp.isoformat()
-                }
-                
-                await self.redis_client.lpush(
-                    "orchestrator_events",
-                    json.dumps(event_data, default=str)
-                )
-                # 최대 1000개 이벤트 유지
-                await self.redis_client.ltrim("orchestrator_events", 0, 999)
-                
-        except Exception as e:
-            logger.error(f"❌ 이벤트 로그 오류: {e}")
+    def _log_event_to_redis(self, event: FileChangeEvent):
+        """Redis에 이벤트 로그 (최대 1000개 이벤트 유지)"""
+        event_data = {
+            "file_path": event.file_path,
+            "event_type": event.event_type,
+            "timestamp": event.timestamp.isoformat()
+        }
+        self.redis_writer.push("orchestrator_events", event_data, keep=1000)
     
     async def _notify_via_websocket(self, event: FileChangeEvent):
         """WebSocket으로 알림"""
@@ -553,7 +1239,7 @@ class ChristmasOrchestrator:
                     "timestamp": event.timestamp.isoformat()
                 }
                 
-                await self.websocket.send(json.dumps(notification, default=str))
+                await self.websocket.send(dumps_text(notification))
                 
         except Exception as e:
             logger.error(f"❌ WebSocket 알림 오류: {e}")
@@ -562,7 +1248,7 @@ class ChristmasOrchestrator:
         """WebSocket 메시지 수신"""
         try:
             async for message in self.websocket:
-                data = json.loads(message)
+                data = loads(message)
                 logger.info(f"📨 WebSocket 메시지 수신: {data.get('type')}")
                 
         except Exception as e:
@@ -578,10 +1264,9 @@ class ChristmasOrchestrator:
                 await self.redis_client.ping()
             
             # 백엔드 연결 확인
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{BACKEND_URL}/health", timeout=5.0)
-                if response.status_code != 200:
-                    logger.warning(f"⚠️ 백엔드 상태 이상: {response.status_code}")
+            response = await self._backend_request("GET", "/health", timeout=5.0)
+            if response.status_code != 200:
+                logger.warning(f"⚠️ 백엔드 상태 이상: {response.status_code}")
             
             logger.info("✅ Health check 완료")
             
@@ -589,16 +1274,44 @@ class ChristmasOrchestrator:
             logger.error(f"❌ Health check 오류: {e}")
     
     async def _cleanup_json_files(self):
-        """JSON 파일 정리"""
+        """JSON 파일 정리 (보존 정책 적용 → 날짜별 gzip 아카이브, 라이브 파일 원자적 교체)"""
         try:
             logger.info("🧹 JSON 파일 정리 중...")
+            started = time.monotonic()
+            now = datetime.now()
+            archived = 0
+            
+            for filename, policy in RETENTION_POLICIES.items():
+                path = self.data_path / filename
+                # 처리 중인 파일은 다음 주기에 정리
+                if not path.exists() or str(path) in self.file_workers:
+                    continue
+                
+                try:
+                    result = await asyncio.to_thread(compact_json_file, path, policy, self.archive_path, now)
+                except Exception as e:
+                    logger.error(f"❌ 파일 컴팩션 오류 {filename}: {e}")
+                    continue
+                
+                content = result.pop("content", None)
+                if content is not None:
+                    # 컴팩션 결과는 자기 쓰기 → 감시 이벤트 무시
+                    content_hash = self._content_hash(content)
+                    self.file_hashes[str(path)] = content_hash
+                    self.self_written[str(path)] = content_hash
+                archived += result["archived"]
+                self.cleanup_stats["live_files"][filename] = result
+            
+            rotated = await asyncio.to_thread(rotate_jsonl_archives, self.data_path, self.archive_path, now)
+            pruned = await asyncio.to_thread(prune_archives, self.archive_path, ARCHIVE_RETENTION_DAYS, now)
             
-            # 오래된 데이터 제거, 압축 등
-            for json_file in self.data_path.glob("*.json"):
-                # 파일별 정리 로직
-                pass
+            self.cleanup_stats["runs"] += 1
+            self.cleanup_stats["archived_records"] += archived
+            self.cleanup_stats["rotated_records"] += rotated
+            self.cleanup_stats["pruned_partitions"] += pruned
+            self.cleanup_stats["last_run_seconds"] = round(time.monotonic() - started, 4)
             
-            logger.info("✅ JSON 파일 정리 완료")
+            logger.info(f"✅ JSON 파일 정리 완료 (아카이브 {archived}건, 로테이션 {rotated}건, 삭제 파티션 {pruned}개)")
             
         except Exception as e:
             logger.error(f"❌ JSON 파일 정리 오류: {e}")
@@ -612,12 +1325,26 @@ class ChristmasOrchestrator:
                     "timestamp": datetime.now().isoformat(),
                     "orchestrator_status": "running" if self.running else "stopped",
                     "observers_count": len(self.observers),
-                    "processing_files_count": len(self.processing_files)
+                    # 파일별 워커 = 실제 처리 중인 파일 수
+                    "processing_files_count": len(self.file_workers),
+                    "file_events_pending": len(self.file_events),
+                    "file_queue_depth": len(self.file_events) + len(self.dirty_files),
+                    "file_workers_active": len(self.file_workers),
+                    "file_worker_limit": FILE_WORKER_CONCURRENCY,
+                    "file_reruns": self.file_reruns,
+                    "handler_duration": self.handler_duration.summary(),
+                    "file_events_coalesced": self.file_events.coalesced_total,
+                    "file_event_latency": self.file_latency.summary(),
+                    "file_stats": dict(self.file_stats),
+                    "event_bus": self.event_bus.metrics() if self.event_bus else None,
+                    "redis_writer": self.redis_writer.metrics(),
+                    "cleanup": self.cleanup_stats,
+                    "json_codec": CODEC_NAME
                 }
                 
                 await self.redis_client.set(
                     "orchestrator_metrics",
-                    json.dumps(metrics, default=str)
+                    dumps_text(metrics)
                 )
                 
         except Exception as e:
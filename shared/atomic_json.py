@@ -0,0 +1,166 @@
+"""
+Christmas Trading 원자적 JSON 파일 쓰기
+백엔드 / 오케스트레이터가 함께 쓰는 JSON 파일의 공통 쓰기 경로
+
+동작 방식:
+1. 같은 디렉터리의 임시 파일에 기록 → fsync → os.replace
+   (읽는 쪽은 이전 파일 또는 새 파일 전체만 보고, 잘린 파일은 보지 않음)
+2. 선택적 advisory 잠금 (<파일>.lock, fcntl.flock)
+   rename으로 대상 inode가 바뀌므로 잠금은 별도 파일에 건다
+3. update_json: 잠금 안에서 최신 내용을 다시 읽고 변경 적용 → 프로세스 간 갱신 유실 방지
+"""
+
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Callable, Union
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: 잠금 없이 원자적 교체만 수행
+    fcntl = None
+
+from codec import dumps as encode, loads, JSON_PRETTY
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, Path]
+# 변경 함수가 False를 반환하면 쓰지 않음
+Mutator = Callable[[Dict[str, Any]], Optional[bool]]
+
+
+def dumps(data: Any) -> bytes:
+    """파일 기록용 직렬화 (기본 compact, JSON_PRETTY=true 이면 들여쓰기)"""
+    return encode(data, pretty=JSON_PRETTY)
+
+
+def _fsync_dir(directory: Path):
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path: PathLike, content: bytes, durable: bool = True):
+    """임시 파일 → fsync → rename 으로 파일 교체"""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+            f.flush()
+            if durable:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    if durable:
+        # rename 자체도 디스크에 반영
+        _fsync_dir(path.parent)
+
+
+@contextmanager
+def file_lock(path: PathLike, enabled: bool = True):
+    """<파일>.lock 에 대한 배타적 advisory 잠금 (다른 프로세스 / 스레드와 직렬화)"""
+    if not enabled or fcntl is None:
+        yield
+        return
+    path = Path(path)
+    with open(path.with_name(path.name + ".lock"), "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def read_json(path: PathLike, default: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """JSON 로드 (파일이 없으면 default)"""
+    try:
+        with open(path, "rb") as f:
+            return loads(f.read())
+    except FileNotFoundError:
+        return {} if default is None else default
+
+
+def write_json(path: PathLike, data: Dict[str, Any], lock: bool = True,
+               durable: bool = True) -> bytes:
+    """문서 전체를 원자적으로 교체, 기록한 바이트 반환"""
+    content = dumps(data)
+    with file_lock(path, lock):
+        atomic_write_bytes(path, content, durable)
+    return content
+
+
+def update_json(path: PathLike, mutate: Mutator, lock: bool = True,
+                durable: bool = True, default: Optional[Dict[str, Any]] = None) -> Optional[bytes]:
+    """잠금 안에서 최신 문서를 읽어 변경 후 원자적으로 교체
+
+    mutate(data)가 False를 반환하면 쓰지 않고 None 반환, 그 외에는 기록한 바이트 반환
+    """
+    with file_lock(path, lock):
+        data = read_json(path, default)
+        if mutate(data) is False:
+            return None
+        content = dumps(data)
+        atomic_write_bytes(path, content, durable)
+        return content
+
+
+def benchmark(path: str, writers: int = 4, updates: int = 500, lock: bool = True) -> Dict[str, Any]:
+    """프로세스 여러 개가 같은 파일에 동시에 레코드를 추가할 때 유실 / 손상 여부 측정"""
+    import time
+    import multiprocessing
+
+    write_json(path, {"records": []}, lock=False)
+    started = time.monotonic()
+    processes = [
+        multiprocessing.Process(target=_benchmark_writer, args=(path, w, updates, lock))
+        for w in range(writers)
+    ]
+    for p in processes:
+        p.start()
+    for p in processes:
+        p.join()
+    elapsed = time.monotonic() - started
+
+    records = read_json(path).get("records", [])
+    return {
+        "expected": writers * updates,
+        "written": len(records),
+        "lost": writers * updates - len(records),
+        "elapsed": round(elapsed, 3),
+        "updates_per_second": round(writers * updates / elapsed, 1),
+    }
+
+
+def _benchmark_writer(path: str, writer: int, updates: int, lock: bool):
+    for i in range(updates):
+        update_json(path, lambda data: data.setdefault("records", []).append({"writer": writer, "seq": i}), lock=lock)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Concurrent atomic JSON update benchmark")
+    parser.add_argument("--path", default="atomic_json_benchmark.json")
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--updates", type=int, default=500)
+    parser.add_argument("--no-lock", action="store_true")
+    args = parser.parse_args()
+
+    print(json.dumps(benchmark(args.path, args.writers, args.updates, not args.no_lock), indent=2))
@@ -0,0 +1,170 @@
+"""
+Christmas Trading JSON 코덱
+백엔드 / 오케스트레이터 공통 직렬화 계층
+
+1. orjson → msgspec → 표준 json 순으로 설치된 구현 사용 (JSON_CODEC 으로 고정 가능)
+2. 기본은 compact 출력 (파일 / WebSocket / Redis / 이벤트 버스 핫 경로)
+3. pretty 출력은 디버그 덤프에서만 (JSON_PRETTY=true 이면 JSON 파일도 들여쓰기)
+4. datetime 은 ISO 8601, numpy 스칼라는 숫자, 그 외 미지원 타입은 str() (표준 json default=str 대응)
+
+처리량 비교 (실제 데이터 파일):
+    python codec.py --data-path /app/data
+"""
+
+import os
+import json
+import logging
+from typing import Any, Callable, Dict, Union
+
+logger = logging.getLogger(__name__)
+
+JSON_CODEC = os.getenv("JSON_CODEC", "auto").lower()
+JSON_PRETTY = os.getenv("JSON_PRETTY", "false").lower() == "true"
+
+
+def _default(obj: Any) -> Any:
+    # numpy 스칼라는 파이썬 숫자로, 나머지는 표준 json default=str 과 동일하게 문자열로
+    item = getattr(obj, "item", None)
+    if callable(item):
+        try:
+            return item()
+        except (TypeError, ValueError):
+            pass
+    return str(obj)
+
+
+def _std_dumps(obj: Any, pretty: bool = False) -> bytes:
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=str).encode("utf-8")
+    return json.dumps(obj, ensure_ascii=False, default=str, separators=(",", ":")).encode("utf-8")
+
+
+def _std_loads(data: Union[bytes, str]) -> Any:
+    return json.loads(data)
+
+
+def _orjson_codec():
+    import orjson
+
+    compact = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    pretty_opt = compact | orjson.OPT_INDENT_2
+
+    def dumps(obj: Any, pretty: bool = False) -> bytes:
+        try:
+            return orjson.dumps(obj, default=_default, option=pretty_opt if pretty else compact)
+        except TypeError:
+            # 64비트 범위를 넘는 정수 등 orjson 미지원 값
+            return _std_dumps(obj, pretty)
+
+    return dumps, orjson.loads
+
+
+def _msgspec_codec():
+    import msgspec
+
+    encoder = msgspec.json.Encoder(enc_hook=_default)
+    decoder = msgspec.json.Decoder()
+
+    def loads(data: Union[bytes, bytearray, str]) -> Any:
+        try:
+            return decoder.decode(data)
+        except msgspec.DecodeError as e:
+            # 표준 json / orjson 과 같이 ValueError 계열로 전달
+            raise ValueError(str(e)) from e
+
+    def dumps(obj: Any, pretty: bool = False) -> bytes:
+        try:
+            content = encoder.encode(obj)
+        except (TypeError, msgspec.EncodeError):
+            return _std_dumps(obj, pretty)
+        return msgspec.json.format(content, indent=2) if pretty else content
+
+    return dumps, loads
+
+
+CODECS: Dict[str, Callable[[], Any]] = {
+    "orjson": _orjson_codec,
+    "msgspec": _msgspec_codec,
+    "json": lambda: (_std_dumps, _std_loads),
+}
+
+
+def _select(name: str):
+    candidates = list(CODECS) if name == "auto" else [name, "json"]
+    for candidate in candidates:
+        try:
+            return (candidate, *CODECS[candidate]())
+        except (ImportError, KeyError):
+            if name != "auto":
+                logger.warning(f"JSON codec '{candidate}' unavailable, falling back")
+    return ("json", _std_dumps, _std_loads)
+
+
+CODEC_NAME, _dumps, _loads = _select(JSON_CODEC)
+
+
+def dumps(obj: Any, pretty: bool = False) -> bytes:
+    """UTF-8 JSON 바이트 (기본 compact)"""
+    return _dumps(obj, pretty)
+
+
+def dumps_text(obj: Any, pretty: bool = False) -> str:
+    """WebSocket 텍스트 프레임 / Redis 문자열 값용"""
+    return _dumps(obj, pretty).decode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    """JSON 파싱 (잘못된 입력은 ValueError)"""
+    return _loads(data)
+
+
+def benchmark(data_path: str, rounds: int = 200) -> Dict[str, Any]:
+    """실제 market_data.json / user_actions.json 으로 구현별 직렬화 / 역직렬화 처리량 비교"""
+    import time
+    from pathlib import Path
+
+    results: Dict[str, Any] = {"selected": CODEC_NAME}
+    for filename in ("market_data.json", "user_actions.json"):
+        path = Path(data_path) / filename
+        if not path.exists():
+            results[filename] = "missing"
+            continue
+        payload = json.loads(path.read_bytes())
+
+        variants = {"json (indent=2)": (lambda obj: _std_dumps(obj, True), _std_loads)}
+        for name, factory in CODECS.items():
+            try:
+                codec_dumps, codec_loads = factory()
+            except ImportError:
+                continue
+            variants[f"{name} (compact)"] = (codec_dumps, codec_loads)
+
+        file_results = {}
+        for label, (codec_dumps, codec_loads) in variants.items():
+            encoded = codec_dumps(payload)
+            started = time.perf_counter()
+            for _ in range(rounds):
+                codec_dumps(payload)
+            encode_seconds = time.perf_counter() - started
+            started = time.perf_counter()
+            for _ in range(rounds):
+                codec_loads(encoded)
+            decode_seconds = time.perf_counter() - started
+            file_results[label] = {
+                "bytes": len(encoded),
+                "dumps_per_second": round(rounds / encode_seconds, 1),
+                "loads_per_second": round(rounds / decode_seconds, 1),
+            }
+        results[filename] = file_results
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="JSON codec throughput on real data files")
+    parser.add_argument("--data-path", default=os.getenv("JSON_DATA_PATH", "/app/data"))
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    print(json.dumps(benchmark(args.data_path, args.rounds), indent=2))
@@ -0,0 +1,350 @@
+"""
+Christmas Trading 이벤트 버스
+백엔드 ↔ 오케스트레이터 간 Redis Streams 기반 메시지 전달
+
+주요 기능:
+1. 스트림별 컨슈머 그룹 (서비스 단위 at-least-once 전달)
+2. 처리 성공 시 XACK, 실패 시 대기(pending) 유지 → 재시도
+3. 재시작 시 자신의 미확인 메시지부터 재처리, 장시간 멈춘 컨슈머 메시지 회수
+4. 최대 재시도 초과 메시지는 dead-letter 스트림으로 이동
+5. XRANGE 기반 이벤트 재생(replay)
+6. 선택적 JSONL 감사(audit) 파일 기록
+
+처리량 측정 (로컬 redis-server):
+    python event_bus.py --redis redis://localhost:6379 --events 100000
+"""
+
+import json
+import time
+import socket
+import asyncio
+import logging
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable, Awaitable, Tuple
+
+from codec import dumps_text, loads
+
+logger = logging.getLogger(__name__)
+
+# 논리 스트림 이름 → Redis 키
+STREAMS = {
+    "signals": "christmas:signals",
+    "market_data": "christmas:market_data",
+    "user_actions": "christmas:user_actions",
+    "ai_recommendations": "christmas:ai_recommendations",
+}
+
+EventHandler = Callable[[Dict[str, Any], str], Awaitable[None]]
+
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _pending_entries(response: Any) -> List[Dict[str, Any]]:
+    """XPENDING 상세 응답 정규화 (클라이언트 파서 결과 dict / 원시 [id, consumer, idle, delivered] 모두 허용)"""
+    entries = []
+    for entry in response or []:
+        if isinstance(entry, dict):
+            entries.append({
+                "message_id": _text(entry["message_id"]),
+                "idle": int(entry["time_since_delivered"]),
+                "times_delivered": int(entry["times_delivered"]),
+            })
+        else:
+            entries.append({
+                "message_id": _text(entry[0]),
+                "idle": int(entry[2]),
+                "times_delivered": int(entry[3]),
+            })
+    return entries
+
+
+class EventBus:
+    """Redis Streams 발행 / 컨슈머 그룹 구독"""
+
+    def __init__(self, redis, source: str, group: Optional[str] = None,
+                 consumer: Optional[str] = None, maxlen: int = 10000,
+                 batch_size: int = 100, block_ms: int = 1000,
+                 claim_idle_ms: int = 30000, max_deliveries: int = 5,
+                 audit_dir: Optional[str] = None):
+        self.redis = redis
+        self.source = source
+        self.group = group or source
+        self.consumer = consumer or f"{source}-{socket.gethostname()}"
+        self.maxlen = maxlen
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.claim_idle_ms = claim_idle_ms
+        self.max_deliveries = max_deliveries
+        self.audit_dir = Path(audit_dir) if audit_dir else None
+
+        self._handlers: Dict[str, EventHandler] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._running = False
+
+        self.published = 0
+        self.delivered = 0
+        self.acked = 0
+        self.failed = 0
+        self.claimed = 0
+        self.dead_lettered = 0
+
+    @staticmethod
+    def key(stream: str) -> str:
+        return STREAMS.get(stream, stream)
+
+    # ===== 발행 =====
+
+    def _envelope(self, event_type: str, data: Any) -> Dict[str, str]:
+        return {
+            "type": event_type,
+            "source": self.source,
+            "ts": str(time.time()),
+            "data": dumps_text(data),
+        }
+
+    async def publish(self, stream: str, event_type: str, data: Any) -> str:
+        """이벤트 1건 발행 (스트림 길이는 maxlen 근사치로 제한)"""
+        fields = self._envelope(event_type, data)
+        message_id = await self.redis.xadd(self.key(stream), fields, maxlen=self.maxlen, approximate=True)
+        self.published += 1
+        self._audit(stream, [(_text(message_id), fields)])
+        return _text(message_id)
+
+    async def publish_many(self, stream: str, event_type: str, items: List[Any]) -> List[str]:
+        """이벤트 여러 건을 파이프라인 1회로 발행"""
+        if not items:
+            return []
+        envelopes = [self._envelope(event_type, item) for item in items]
+        pipe = self.redis.pipeline(transaction=False)
+        for fields in envelopes:
+            pipe.xadd(self.key(stream), fields, maxlen=self.maxlen, approximate=True)
+        message_ids = [_text(m) for m in await pipe.execute()]
+        self.published += len(message_ids)
+        self._audit(stream, list(zip(message_ids, envelopes)))
+        return message_ids
+
+    def _audit(self, stream: str, records: List[Tuple[str, Dict[str, str]]]):
+        if self.audit_dir is None:
+            return
+        try:
+            self.audit_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.audit_dir / f"{stream}.jsonl", "a", encoding="utf-8") as f:
+                for message_id, fields in records:
+                    f.write(dumps_text({"id": message_id, **fields}) + "\n")
+        except Exception as e:
+            logger.error(f"Event audit write error ({stream}): {e}")
+
+    # ===== 구독 =====
+
+    def subscribe(self, stream: str, handler: EventHandler):
+        """handler(event, message_id) - 예외 없이 끝나면 ACK"""
+        self._handlers[self.key(stream)] = handler
+
+    async def _ensure_group(self, key: str):
+        try:
+            # 그룹이 처음 생기면 스트림에 남아 있는 이벤트부터 처리
+            await self.redis.xgroup_create(key, self.group, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    async def start(self):
+        for key in self._handlers:
+            await self._ensure_group(key)
+        self._running = True
+        self._task = asyncio.create_task(self._run())
+        logger.info(f"Event bus consumer started ({self.group}/{self.consumer}: {', '.join(self._handlers)})")
+
+    async def stop(self):
+        self._running = False
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        # 재시작 전 전달받고 ACK하지 못한 메시지부터 처리
+        for key in self._handlers:
+            await self._recover_pending(key)
+        last_claim = time.monotonic()
+
+        while self._running:
+            try:
+                await self._consume({key: ">" for key in self._handlers}, block=self.block_ms)
+
+                if time.monotonic() - last_claim >= self.claim_idle_ms / 1000:
+                    last_claim = time.monotonic()
+                    for key in self._handlers:
+                        await self._claim_stale(key)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Event bus consume error: {e}")
+                await asyncio.sleep(1)
+
+    async def _recover_pending(self, key: str):
+        last_id = "0"
+        while True:
+            response = await self.redis.xreadgroup(
+                self.group, self.consumer, {key: last_id}, count=self.batch_size
+            )
+            messages = response[0][1] if response else []
+            if not messages:
+                return
+            await self._dispatch(key, messages)
+            last_id = _text(messages[-1][0])
+
+    async def _consume(self, streams: Dict[str, str], block: Optional[int]):
+        response = await self.redis.xreadgroup(
+            self.group, self.consumer, streams, count=self.batch_size, block=block
+        )
+        for key, messages in response or []:
+            await self._dispatch(_text(key), messages)
+
+    async def _dispatch(self, key: str, messages: List[Tuple[Any, Dict[Any, Any]]]):
+        handler = self._handlers[key]
+        done = []
+        for message_id, fields in messages:
+            message_id = _text(message_id)
+            if not fields:
+                # 트리밍으로 본문이 사라진 대기 메시지
+                done.append(message_id)
+                continue
+
+            fields = {_text(k): _text(v) for k, v in fields.items()}
+            event = {
+                "type": fields.get("type"),
+                "source": fields.get("source"),
+                "ts": float(fields.get("ts") or 0),
+                "data": loads(fields.get("data") or "null"),
+            }
+            self.delivered += 1
+            try:
+                await handler(event, message_id)
+                done.append(message_id)
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Event handler error {key} {message_id}: {e}")
+
+        if done:
+            self.acked += await self.redis.xack(key, self.group, *done)
+
+    async def _claim_stale(self, key: str):
+        """오래 ACK되지 않은 메시지 회수 (재시도 초과 시 dead-letter)"""
+        # aioredis 2.0.1 의 xpending_range 에는 idle 인자가 없으므로 명령을 직접 전송
+        response = await self.redis.execute_command(
+            "XPENDING", key, self.group, "IDLE", self.claim_idle_ms, "-", "+", self.batch_size,
+            parse_detail=True
+        )
+        pending = [e for e in _pending_entries(response) if e["idle"] >= self.claim_idle_ms]
+        if not pending:
+            return
+
+        retry_ids, dead_ids = [], []
+        for entry in pending:
+            message_id = entry["message_id"]
+            if entry["times_delivered"] >= self.max_deliveries:
+                dead_ids.append(message_id)
+            else:
+                retry_ids.append(message_id)
+
+        if dead_ids:
+            for message_id, fields in await self.redis.xclaim(key, self.group, self.consumer, self.claim_idle_ms, dead_ids):
+                if fields:
+                    await self.redis.xadd(f"{key}:dead", fields, maxlen=self.maxlen, approximate=True)
+            self.dead_lettered += await self.redis.xack(key, self.group, *dead_ids)
+            logger.warning(f"Event bus dead-lettered {len(dead_ids)} messages from {key}")
+
+        if retry_ids:
+            messages = await self.redis.xclaim(key, self.group, self.consumer, self.claim_idle_ms, retry_ids)
+            self.claimed += len(messages)
+            await self._dispatch(key, messages)
+
+    # ===== 재생 / 메트릭 =====
+
+    async def replay(self, stream: str, start: str = "-", end: str = "+",
+                     count: Optional[int] = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """스트림에 남은 이벤트 조회 (그룹 오프셋과 무관)"""
+        messages = await self.redis.xrange(self.key(stream), min=start, max=end, count=count)
+        result = []
+        for message_id, fields in messages:
+            fields = {_text(k): _text(v) for k, v in fields.items()}
+            fields["data"] = loads(fields.get("data") or "null")
+            result.append((_text(message_id), fields))
+        return result
+
+    async def lag(self) -> Dict[str, int]:
+        """구독 스트림별 미확인(pending) 메시지 수"""
+        result = {}
+        for key in self._handlers:
+            summary = await self.redis.xpending(key, self.group)
+            result[key] = summary["pending"] if isinstance(summary, dict) else summary[0]
+        return result
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "group": self.group,
+            "consumer": self.consumer,
+            "streams": list(self._handlers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "acked": self.acked,
+            "failed": self.failed,
+            "claimed": self.claimed,
+            "dead_lettered": self.dead_lettered,
+        }
+
+
+async def benchmark(redis_url: str, events: int = 100000, batch_size: int = 500) -> Dict[str, Any]:
+    """로컬 redis-server 대상 발행 / 소비 처리량 측정"""
+    import redis.asyncio as aioredis
+
+    client = aioredis.from_url(redis_url, decode_responses=True)
+    stream = f"benchmark:{int(time.time())}"
+    bus = EventBus(client, source="benchmark", maxlen=events, batch_size=batch_size, block_ms=100)
+
+    received = 0
+    done = asyncio.Event()
+
+    async def handler(event: Dict[str, Any], message_id: str):
+        nonlocal received
+        received += 1
+        if received == events:
+            done.set()
+
+    bus.subscribe(stream, handler)
+    await bus.start()
+
+    started = time.monotonic()
+    for offset in range(0, events, batch_size):
+        chunk = [{"seq": i, "symbol": "BTCUSDT", "price": 42000.0 + i} for i in range(offset, min(events, offset + batch_size))]
+        await bus.publish_many(stream, "tick", chunk)
+    published_at = time.monotonic()
+    await done.wait()
+    finished_at = time.monotonic()
+
+    await bus.stop()
+    await client.delete(stream)
+    await client.close()
+
+    return {
+        "events": events,
+        "publish_per_second": round(events / (published_at - started), 1),
+        "end_to_end_per_second": round(events / (finished_at - started), 1),
+        **bus.metrics(),
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Redis Streams event bus benchmark")
+    parser.add_argument("--redis", default="redis://localhost:6379")
+    parser.add_argument("--events", type=int, default=100000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(benchmark(args.redis, args.events, args.batch_size)), indent=2))
@@ -0,0 +1,17 @@
+-- 🎄 Christmas Trading - Market Ticks Table Creation
+-- 백엔드 배치 저장 경로(persistence.py)에서 COPY로 적재하는 실시간 틱 이력
+
+-- 1. market_ticks 테이블 생성
+CREATE TABLE IF NOT EXISTS market_ticks (
+  id BIGSERIAL PRIMARY KEY,
+  symbol TEXT NOT NULL,
+  price NUMERIC(20,8) NOT NULL,
+  price_change_percent NUMERIC(10,4),
+  volume NUMERIC(30,8),
+  quote_volume NUMERIC(30,8),
+  event_time TIMESTAMP WITH TIME ZONE NOT NULL,
+  received_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- 2. 인덱스 생성 (심볼별 시계열 조회)
+CREATE INDEX IF NOT EXISTS market_ticks_symbol_time_idx ON market_ticks(symbol, event_time DESC);